@@ -0,0 +1,131 @@
+"""
+Cold start of every Lambda handler: each one is imported in a fresh interpreter
+(as a new execution environment would) and its use case built, timing the
+import, the init (HANDLER_INIT=eager does it during the import) and reporting
+which packages the import time goes to (`python -X importtime`, by top-level
+package).
+
+Handlers run on the in-memory DynamoDB engine (STAGE=local) so no network call
+is timed. With --budget-ms the run fails (exit status 1) when the median
+import + init time of any handler goes over the budget, to catch regressions:
+
+    python -m benchmarks.cold_start --runs 5 --output cold_start.json
+    python -m benchmarks.cold_start --budget-ms 400
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import statistics
+import subprocess
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.common import ROOT, write_results
+
+HANDLERS = (
+    "modules.auth.login",
+    "modules.auth.me",
+    "modules.exams.get_exams",
+    "modules.exams.list_exam_summaries",
+    "modules.exams.get_file_download_url",
+    "modules.exams.get_file_upload_url",
+    "modules.exams.complete_file_upload",
+    "modules.exams.get_file_preview",
+)
+
+
+def child(module: str) -> None:
+    """Import one handler and build its use case, printing the timings as JSON"""
+    started = time.perf_counter()
+    handler = importlib.import_module(module)
+    imported = time.perf_counter()
+    handler.get_use_case()
+    initialized = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "init_ms": (initialized - imported) * 1000,
+        "modules": len(sys.modules),
+    }))
+
+
+def spawn(module: str, init: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {**os.environ, "STAGE": "local", "HANDLER_INIT": init}
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "benchmarks.cold_start",
+               "--child", module]
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile(stderr: str, top: int) -> Dict[str, float]:
+    """Self import time (ms) per top-level package, largest first"""
+    by_package = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us) / 1000
+    ranked = sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    return {package: round(ms, 2) for package, ms in ranked}
+
+
+def measure_handler(module: str, init: str, runs: int, top: int) -> Dict[str, object]:
+    timings: List[dict] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = spawn(module, init)
+        timings.append({**json.loads(result.stdout.splitlines()[-1]), "process_ms": (time.perf_counter() - started) * 1000})
+
+    median = lambda name: round(statistics.median(timing[name] for timing in timings), 2)
+    return {
+        "import_ms": median("import_ms"),
+        "init_ms": median("init_ms"),
+        "total_ms": round(statistics.median(timing["import_ms"] + timing["init_ms"] for timing in timings), 2),
+        "process_ms": median("process_ms"),
+        "modules": timings[-1]["modules"],
+        "profile": import_profile(spawn(module, init, importtime=True).stderr, top),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--handlers", nargs="+", choices=HANDLERS, default=list(HANDLERS))
+    parser.add_argument("--init", choices=["eager", "lazy"], default="eager", help="HANDLER_INIT of the handlers")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per handler (the median is kept)")
+    parser.add_argument("--top", type=int, default=8, help="packages listed in each import profile")
+    parser.add_argument("--budget-ms", type=float, help="fail when a handler's import + init median exceeds this")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    results = {module: measure_handler(module, args.init, args.runs, args.top) for module in args.handlers}
+
+    width = max(len(module) for module in results)
+    print(f"{'handler':<{width}}  {'import ms':>10}  {'init ms':>8}  {'total ms':>9}  {'process ms':>10}  {'modules':>7}")
+    for module, stats in results.items():
+        print(f"{module:<{width}}  {stats['import_ms']:>10.1f}  {stats['init_ms']:>8.1f}  {stats['total_ms']:>9.1f}  "
+              f"{stats['process_ms']:>10.1f}  {stats['modules']:>7}")
+        print("    " + ", ".join(f"{package} {ms:.1f}" for package, ms in stats["profile"].items()))
+
+    write_results(args.output, "cold_start", {
+        "init": args.init,
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "handlers": results,
+    })
+
+    if args.budget_ms is not None:
+        over = {module: stats["total_ms"] for module, stats in results.items() if stats["total_ms"] > args.budget_ms}
+        for module, total in over.items():
+            print(f"{module}: {total:.1f} ms is over the {args.budget_ms:.0f} ms cold start budget", file=sys.stderr)
+        if over:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
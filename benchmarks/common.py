@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+# Benchmarks never talk to a real account
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("DYNAMO_TABLE", "benchmark")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as microsecond percentiles and throughput"""
+    elapsed = elapsed if elapsed is not None else sum(samples)
+    return {
+        "count": len(samples),
+        "ops_per_sec": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "mean_us": round(statistics.fmean(samples) * 1e6, 2) if samples else 0.0,
+        "p50_us": round(percentile(samples, 50) * 1e6, 2),
+        "p95_us": round(percentile(samples, 95) * 1e6, 2),
+        "p99_us": round(percentile(samples, 99) * 1e6, 2),
+    }
+
+
+def measure(fn: Callable[[], Any], iterations: int = 1000, warmup: int = 50) -> Dict[str, float]:
+    """Call `fn` repeatedly and summarize its latency"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def print_table(results: Dict[str, Dict[str, float]]) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'ops/s':>12}  {'p50 us':>10}  {'p95 us':>10}  {'p99 us':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}}  {stats['ops_per_sec']:>12.1f}  {stats['p50_us']:>10.1f}  "
+            f"{stats['p95_us']:>10.1f}  {stats['p99_us']:>10.1f}"
+        )
+
+
+def write_results(path: Optional[str], name: str, results: Dict[str, Any]) -> None:
+    """Write results as JSON so runs can be compared"""
+    if not path:
+        return
+    payload = {"benchmark": name, "timestamp": time.time(), "python": sys.version.split()[0], "results": results}
+    Path(path).write_text(json.dumps(payload, indent=2))
+    print(f"Results written to {path}")
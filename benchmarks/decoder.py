@@ -0,0 +1,48 @@
+"""
+Decoding of raw DynamoDB exam items: TypeDeserializer + EcgExam.from_dynamo
+vs. the decoders compiled from the entity schemas.
+
+    python -m benchmarks.decoder --reports 20 --points 200 --output decoder.json
+"""
+import argparse
+
+from benchmarks.common import measure, print_table, write_results
+from benchmarks.fixtures import make_exam
+
+from core.entities import EcgExam
+from core.database.database import Database
+from core.database.decoder import decode_exam
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=20, help="reports in the exam history")
+    parser.add_argument("--points", type=int, default=200, help="points per segmentation polygon")
+    parser.add_argument("--approves", type=int, default=2, help="approvals per report")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    exam = make_exam(args.reports, args.points, args.approves)
+    header = Database.serialize(exam.to_dynamo())
+    partition = [Database.serialize(item) for item in exam.to_dynamo_items()]
+
+    results = {
+        "header_from_dynamo": measure(lambda: EcgExam.from_dynamo(Database.deserialize(header)), args.iterations, 5),
+        "header_compiled": measure(lambda: decode_exam(header), args.iterations, 5),
+        "full_from_dynamo": measure(
+            lambda: EcgExam.from_dynamo([Database.deserialize(item) for item in partition]), args.iterations, 5,
+        ),
+        "full_compiled": measure(lambda: decode_exam(partition), args.iterations, 5),
+    }
+
+    print_table(results)
+    print()
+    for name in ("header", "full"):
+        speedup = results[f"{name}_from_dynamo"]["mean_us"] / results[f"{name}_compiled"]["mean_us"]
+        print(f"{name:<8} compiled decoder {speedup:.1f}x faster")
+    write_results(args.output, "decoder", {"items": len(partition), "timings": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare the legacy Lambda-event round-trip with direct use case dispatch.
+
+    python -m benchmarks.dispatch --iterations 5000 --output dispatch.json
+"""
+import os
+import json
+import asyncio
+import argparse
+from typing import Optional
+
+# Dispatch overhead is what is measured here: keep password hashing out of it (see benchmarks.password_hashing)
+os.environ.setdefault("PASSWORD_ALGORITHM", "pbkdf2_sha256")
+os.environ.setdefault("PASSWORD_PBKDF2_ITERATIONS", "1")
+
+from benchmarks.common import measure, print_table, write_results
+
+from starlette.requests import Request
+
+from core.entities import User
+from core.schemas.login import LoginRequest, LoginResponse, MeResponse
+from core.helpers.transform import fastapi_request_to_lambda_event
+from core.database.repositories.user.repo_interface import IUserRepo
+from modules.auth import login, me
+
+
+class InMemoryUserRepo(IUserRepo):
+    def __init__(self, *users: User):
+        self.users = {user.email: user for user in users}
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        return self.users.get(email)
+
+    def create_user(self, user: User) -> bool:
+        self.users[user.email] = user
+        return True
+
+    def update_user(self, user: User) -> bool:
+        if user.email not in self.users:
+            return False
+        self.users[user.email] = user
+        return True
+
+
+async def empty_receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def build_request(method: str, path: str, authorization: str = "") -> Request:
+    headers = [(b"content-type", b"application/x-www-form-urlencoded")]
+    if authorization:
+        headers.append((b"authorization", f"Bearer {authorization}".encode()))
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": headers,
+        "query_string": b"",
+        "path_params": {},
+    }, receive=empty_receive)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    user = User(name="Benchmark", email="bench@nsee.imt", password="1234")
+    repo = InMemoryUserRepo(user)
+    login_use_case = login.UseCase(user_repo=repo)
+    me_use_case = me.UseCase(user_repo=repo)
+    login.get_use_case = lambda: login_use_case
+    me.get_use_case = lambda: me_use_case
+
+    loop = asyncio.new_event_loop()
+    form = LoginRequest(username=user.email, password=user.password)
+    token = login_use_case(form).access_token
+
+    def login_via_event():
+        body_json = json.dumps({"username": form.username, "password": form.password})
+        event = loop.run_until_complete(fastapi_request_to_lambda_event(build_request("POST", "/auth/login"), body_override=body_json))
+        response = login.lambda_handler(event, None)
+        return LoginResponse(**json.loads(response["body"]))
+
+    def login_direct():
+        return login_use_case(LoginRequest(username=form.username, password=form.password))
+
+    def me_via_event():
+        event = loop.run_until_complete(fastapi_request_to_lambda_event(build_request("GET", "/auth/me"), token=token))
+        response = me.lambda_handler(event, None)
+        return MeResponse(**json.loads(response["body"]))
+
+    def me_direct():
+        return me_use_case(token)
+
+    results = {
+        "login_lambda_event": measure(login_via_event, args.iterations),
+        "login_direct": measure(login_direct, args.iterations),
+        "me_lambda_event": measure(me_via_event, args.iterations),
+        "me_direct": measure(me_direct, args.iterations),
+    }
+    print_table(results)
+    write_results(args.output, "dispatch", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Entity (de)serialization on synthetic exams of growing report history:
+EcgExam.to_dynamo_items / from_dynamo, Database.serialize / deserialize and
+decimal_to_number.
+
+    python -m benchmarks.entities --reports 0 5 20 50 --output entities.json
+"""
+import argparse
+
+from benchmarks.common import measure, print_table, write_results
+from benchmarks.fixtures import make_exam
+
+from core.entities import EcgExam
+from core.database.database import Database
+from core.helpers.transform import decimal_to_number
+
+
+def cases(reports: int, points: int, approves: int, iterations: int):
+    """Timings of every step of a write and a read of one exam"""
+    exam = make_exam(reports, points, approves)
+    items = exam.to_dynamo_items()
+    wire = [Database.serialize(item) for item in items]
+    native = [Database.deserialize(item) for item in wire]
+
+    return {
+        "to_dynamo": measure(exam.to_dynamo_items, iterations, 5),
+        "serialize": measure(lambda: [Database.serialize(item) for item in items], iterations, 5),
+        "deserialize": measure(lambda: [Database.deserialize(item) for item in wire], iterations, 5),
+        "decimal_to_number": measure(lambda: [decimal_to_number(item) for item in native], iterations, 5),
+        "from_dynamo": measure(lambda: EcgExam.from_dynamo(native), iterations, 5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, nargs="+", default=[0, 5, 20, 50], help="report counts to measure")
+    parser.add_argument("--points", type=int, default=200, help="points per segmentation polygon")
+    parser.add_argument("--approves", type=int, default=2, help="approvals per report")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results = {}
+    for reports in args.reports:
+        for name, stats in cases(reports, args.points, args.approves, args.iterations).items():
+            results[f"{name}[reports={reports}]"] = stats
+
+    print_table(results)
+    write_results(args.output, "entities", {
+        "points": args.points,
+        "approves": args.approves,
+        "timings": results,
+    })
+
+
+if __name__ == "__main__":
+    main()
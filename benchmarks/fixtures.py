@@ -0,0 +1,50 @@
+import random
+from datetime import datetime, timedelta
+
+from pytz import UTC
+
+from core.entities import (
+    User, EcgExam, EcgReport, EcgReportStatus, EcgReportSegmentation, Gender, ReportType, ReportSegmentationType
+)
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_exam(reports: int, points: int, approves: int, exam_id: str = "benchmark", day: int = 0) -> EcgExam:
+    """Synthetic exam with `reports` reports of one `points`-point polygon and `approves` approvals each"""
+    rng = random.Random(42)
+    doctor = User(name="Benchmark", email="benchmark@example.com", password="")
+    made_at = START + timedelta(days=day)
+
+    def report(i: int) -> EcgReport:
+        polygon = [round(rng.uniform(0, 3000), 1) for _ in range(points * 2)]
+        return EcgReport(
+            report=ReportType.NORMAL,
+            created_by=doctor,
+            created_at=made_at + timedelta(minutes=i),
+            report_segmentation=EcgReportSegmentation(
+                category=ReportSegmentationType.NORMAL,
+                segmentation=[polygon],
+                bbox=[0, 0, 3000, 3000],
+                area=1.0,
+                created_at=made_at,
+            ),
+            approves=[
+                EcgReportStatus(created_by=doctor, status=True, created_at=made_at + timedelta(minutes=i, seconds=k))
+                for k in range(approves)
+            ],
+        )
+
+    return EcgExam(
+        id=exam_id,
+        file_path=f"exams/{exam_id}.png",
+        made_at=made_at,
+        gender=Gender.male,
+        birth_date="1990-01-01",
+        amplitude="10",
+        speed="25",
+        approved=reports > 0,
+        approved_at=made_at if reports > 0 else None,
+        principal_report=report(0) if reports > 0 else None,
+        reports=[report(i) for i in range(reports)],
+    )
@@ -0,0 +1,84 @@
+"""
+Worklist page cost: ExamRepo.get_all_exams (whole headers, from the ALL
+indexes) vs. ExamRepo.list_exam_summaries (the summary indexes), per page size:
+DynamoDB read capacity consumed per page, JSON bytes of the page as the API
+returns it, and latency.
+
+Runs on the in-memory engine (STAGE=local), which bills reads on the size of
+the items as projected by the index, like DynamoDB does.
+
+    python -m benchmarks.listing --exams 500 --reports 3 --limit 20 100 --output listing.json
+"""
+import os
+import argparse
+from typing import Callable, Dict
+
+os.environ.setdefault("STAGE", "local")
+
+from benchmarks.common import measure, print_table, write_results
+from benchmarks.fixtures import make_exam
+
+from core.database.database import Database
+from core.helpers.serialization import dumps
+from core.infra.metrics import CURRENT_REQUEST, RequestMetrics
+from core.schemas.exams import GetExamsResponse, ListExamSummariesResponse
+from core.database.repositories.exams.repo import ExamRepo
+from modules.exams.get_exams import EXAM_EXCLUDE
+
+
+def page_cost(call: Callable[[], bytes]) -> Dict[str, float]:
+    """Capacity units consumed and response bytes of one call"""
+    request = RequestMetrics("benchmark")
+    token = CURRENT_REQUEST.set(request)
+    try:
+        body = call()
+    finally:
+        CURRENT_REQUEST.reset(token)
+    return {"capacity_units": sum(request.capacity.values()), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exams", type=int, default=500)
+    parser.add_argument("--reports", type=int, default=3, help="reports of each approved exam")
+    parser.add_argument("--points", type=int, default=200, help="points per segmentation polygon")
+    parser.add_argument("--limit", type=int, nargs="+", default=[20, 100], help="page sizes")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    repo = ExamRepo(Database())
+    for i in range(args.exams):
+        repo.create_exam(make_exam(args.reports if i % 2 else 0, args.points, 1, exam_id=f"list-{i}", day=i % 30))
+
+    def full_page(limit: int) -> bytes:
+        exams, cursor = repo.get_all_exams(limit=limit)
+        return dumps(GetExamsResponse(
+            exams=[exam.model_dump(mode="json", exclude=EXAM_EXCLUDE) for exam in exams], missing=[],
+        ).model_dump())
+
+    def summary_page(limit: int) -> bytes:
+        summaries, cursor = repo.list_exam_summaries(limit=limit)
+        return dumps(ListExamSummariesResponse(exams=summaries, cursor=cursor).model_dump(mode="json"))
+
+    timings, costs = {}, {}
+    for limit in args.limit:
+        for name, page in (("get_all_exams", full_page), ("list_exam_summaries", summary_page)):
+            case = f"{name}[limit={limit}]"
+            timings[case] = measure(lambda: page(limit), args.iterations, 5)
+            costs[case] = page_cost(lambda: page(limit))
+
+    print_table(timings)
+    for case, cost in costs.items():
+        print(f"{case}: {cost['capacity_units']:g} RCU, {cost['bytes']} bytes per page")
+    write_results(args.output, "listing", {
+        "exams": args.exams,
+        "reports": args.reports,
+        "points": args.points,
+        "costs": costs,
+        "timings": timings,
+    })
+
+
+if __name__ == "__main__":
+    main()
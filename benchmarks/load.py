@@ -0,0 +1,294 @@
+"""
+Load test of the API against a local DynamoDB stand-in: throughput and
+p50/p95/p99 latency of /auth/login, /auth/me, /exams/batch and /exams/summaries
+over HTTP, and of the exam repository operations called directly, at each
+concurrency level.
+
+The API runs under uvicorn in its own process with STAGE=test, so it talks to
+DynamoDB on localhost:8000: DynamoDB Local from docker-compose by default, or
+moto's server started here with --backend moto (needs moto[server]). With
+--backend memory everything runs in this process on the in-memory engine (no
+network hop to the table, but the load threads share the GIL with the server).
+Login latency includes password hashing at the configured PASSWORD_* cost.
+
+    docker compose up -d dynamodb-local
+    python -m benchmarks.load --concurrency 1 8 32 --requests 500 --output load.json
+    python -m benchmarks.load --backend memory --output load-memory.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import argparse
+import itertools
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlencode, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("STAGE", "test")
+
+from benchmarks.common import SRC, summarize, print_table, write_results
+from benchmarks.fixtures import make_exam
+
+from core.entities import User
+from core.infra.aws import AWS
+from core.config.env import ENV
+from core.database.database import Database
+from core.database.schema import table_definition
+from core.helpers.password import hash_password
+from core.database.repositories.user.repo import UserRepo
+from core.database.repositories.exams.repo import ExamRepo
+
+BACKEND_PORT = 8000
+PASSWORD = "benchmark"
+HTTP_SCENARIOS = ("login", "me", "exams_batch", "exam_summaries")
+REPO_SCENARIOS = ("get_exam_by_id", "get_exam_by_id_full", "get_exams_by_ids", "get_all_exams",
+                  "list_exam_summaries", "count_exams", "create_exam")
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on {host}:{port} after {timeout:.0f}s")
+
+
+def start_backend(backend: str) -> Optional[Callable[[], None]]:
+    """Start the DynamoDB stand-in if it is ours to start; returns how to stop it"""
+    if backend == "memory":
+        # No client exists yet, so every one created from now on is served by the in-process engine
+        ENV.DYNAMO_ENGINE = "memory"
+        return None
+    if backend == "moto":
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(ip_address="127.0.0.1", port=BACKEND_PORT, verbose=False)
+        server.start()
+        wait_for_port("127.0.0.1", BACKEND_PORT)
+        return server.stop
+    wait_for_port("localhost", BACKEND_PORT)
+    return None
+
+
+def seed(users: int, exams: int, reports: int) -> List[str]:
+    """Create the table, the benchmark users and exams (existing ones are kept) and return the exam ids"""
+    client = AWS.get_dynamodb_client()
+    if ENV.DYNAMO_TABLE not in client.list_tables()["TableNames"]:
+        client.create_table(**table_definition(ENV.DYNAMO_TABLE))
+        client.get_waiter("table_exists").wait(TableName=ENV.DYNAMO_TABLE)
+
+    db = Database()
+    user_repo, exam_repo = UserRepo(db), ExamRepo(db)
+    stored = hash_password(PASSWORD)
+    for i in range(users):
+        if not user_repo.get_user_by_email(f"bench{i}@example.com"):
+            user_repo.create_user(User(name=f"Benchmark {i}", email=f"bench{i}@example.com", password=stored))
+
+    exam_ids = [f"bench-{i}" for i in range(exams)]
+    existing = {exam.id for exam in exam_repo.get_exams_by_ids(exam_ids, projection=["file_path"]) if exam}
+    for i, exam_id in enumerate(exam_ids):
+        if exam_id not in existing:
+            exam_repo.create_exam(make_exam(reports if i % 2 else 0, 50, 1, exam_id=exam_id, day=i % 30))
+    return exam_ids
+
+
+def start_server(port: int, workers: int, in_process: bool) -> Callable[[], None]:
+    """Start the API under uvicorn; returns how to stop it"""
+    if in_process:
+        import uvicorn
+        from main import app
+
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        wait_for_port("127.0.0.1", port)
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+
+        return stop
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--app-dir", str(SRC),
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    wait_for_port("127.0.0.1", port)
+
+    def stop():
+        process.terminate()
+        process.wait()
+
+    return stop
+
+
+class HttpClient:
+    """One keep-alive connection per load thread"""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[str] = None, headers: Optional[dict] = None) -> int:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            return 0
+
+
+def run_load(call: Callable[[int], bool], concurrency: int, requests: int) -> Dict[str, float]:
+    """Issue `requests` calls from `concurrency` threads; `call(i)` returns whether the i-th call succeeded"""
+    counter, lock = itertools.count(), threading.Lock()
+    samples: List[float] = []
+    errors = 0
+
+    def worker():
+        nonlocal errors
+        local_samples, local_errors = [], 0
+        while True:
+            with lock:
+                i = next(counter)
+            if i >= requests:
+                break
+            start = time.perf_counter()
+            ok = call(i)
+            local_samples.append(time.perf_counter() - start)
+            local_errors += not ok
+        with lock:
+            samples.extend(local_samples)
+            errors += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return {**summarize(samples, time.perf_counter() - started), "errors": errors}
+
+
+def http_scenarios(client: HttpClient, users: int, exam_ids: List[str], batch_size: int) -> Dict[str, Callable]:
+    def login_body(i: int) -> str:
+        return urlencode({"username": f"bench{i % users}@example.com", "password": PASSWORD})
+
+    form = {"Content-Type": "application/x-www-form-urlencoded"}
+    tokens = []
+    for i in range(users):
+        connection = http.client.HTTPConnection(client.host, client.port, timeout=30)
+        connection.request("POST", "/auth/login", body=login_body(i), headers=form)
+        tokens.append(json.loads(connection.getresponse().read())["access_token"])
+        connection.close()
+
+    def authorization(i: int) -> dict:
+        return {"Authorization": f"Bearer {tokens[i % users]}"}
+
+    def batch_body(i: int) -> str:
+        return json.dumps({"ids": random.Random(i).sample(exam_ids, min(batch_size, len(exam_ids)))})
+
+    return {
+        "login": lambda i: client.request("POST", "/auth/login", login_body(i), form) == 200,
+        "me": lambda i: client.request("GET", "/auth/me", headers=authorization(i)) == 200,
+        "exams_batch": lambda i: client.request(
+            "POST", "/exams/batch", batch_body(i), {**authorization(i), "Content-Type": "application/json"},
+        ) == 200,
+        "exam_summaries": lambda i: client.request(
+            "GET", f"/exams/summaries?limit=20&approved={'true' if i % 2 else 'false'}", headers=authorization(i),
+        ) == 200,
+    }
+
+
+def repo_scenarios(exam_ids: List[str], batch_size: int) -> Dict[str, Callable]:
+    repo = ExamRepo(Database())
+    run_id, created = int(time.time()), itertools.count()
+
+    return {
+        "get_exam_by_id": lambda i: repo.get_exam_by_id(exam_ids[i % len(exam_ids)]) is not None,
+        "get_exam_by_id_full": lambda i: repo.get_exam_by_id(exam_ids[i % len(exam_ids)], full=True) is not None,
+        "get_exams_by_ids": lambda i: bool(repo.get_exams_by_ids(random.Random(i).sample(
+            exam_ids, min(batch_size, len(exam_ids))))),
+        "get_all_exams": lambda i: bool(repo.get_all_exams(limit=20, approved=bool(i % 2))[0]),
+        "list_exam_summaries": lambda i: bool(repo.list_exam_summaries(limit=20, approved=bool(i % 2))[0]),
+        "count_exams": lambda i: repo.count_exams() > 0,
+        "create_exam": lambda i: repo.create_exam(make_exam(0, 0, 0, exam_id=f"bench-new-{run_id}-{next(created)}")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["dynamodb-local", "moto", "memory"], default="dynamodb-local")
+    parser.add_argument("--url", help="benchmark an API already running (against the same backend) instead")
+    parser.add_argument("--port", type=int, default=9877, help="port of the uvicorn server started here")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario and concurrency level")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--exams", type=int, default=200)
+    parser.add_argument("--reports", type=int, default=3, help="reports of each approved exam")
+    parser.add_argument("--batch-size", type=int, default=25, help="ids per /exams/batch request")
+    parser.add_argument("--scenarios", nargs="+", choices=HTTP_SCENARIOS + REPO_SCENARIOS,
+                        default=list(HTTP_SCENARIOS + REPO_SCENARIOS))
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    stop_backend = start_backend(args.backend)
+    stop_server = None
+    try:
+        exam_ids = seed(args.users, args.exams, args.reports)
+        if not args.url:
+            stop_server = start_server(args.port, args.server_workers, in_process=args.backend == "memory")
+        url = args.url or f"http://127.0.0.1:{args.port}"
+
+        calls = {
+            **http_scenarios(HttpClient(url), args.users, exam_ids, args.batch_size),
+            **repo_scenarios(exam_ids, args.batch_size),
+        }
+        results = {name: {} for name in args.scenarios}
+        for concurrency in args.concurrency:
+            for name in args.scenarios:
+                results[name][concurrency] = run_load(calls[name], concurrency, args.requests)
+    finally:
+        if stop_server:
+            stop_server()
+        if stop_backend:
+            stop_backend()
+
+    print_table({
+        f"{name} x{concurrency}": stats
+        for name, levels in results.items() for concurrency, stats in levels.items()
+    })
+    write_results(args.output, "load", {
+        "backend": "external" if args.url else args.backend,
+        "server_workers": args.server_workers,
+        "requests": args.requests,
+        "users": args.users,
+        "exams": args.exams,
+        "batch_size": args.batch_size,
+        "scenarios": results,
+    })
+
+
+if __name__ == "__main__":
+    main()
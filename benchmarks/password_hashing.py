@@ -0,0 +1,59 @@
+"""
+Password verification cost: logins/s on one core and on the whole password pool
+for each scrypt/PBKDF2 cost setting.
+
+    python -m benchmarks.password_hashing --iterations 20 --output password.json
+"""
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import measure, print_table, write_results
+
+from core.helpers.password import hash_password, verify_password
+
+SETTINGS = {
+    "scrypt_n2^14": {"algorithm": "scrypt", "n": 2 ** 14, "r": 8, "p": 1},
+    "scrypt_n2^15": {"algorithm": "scrypt", "n": 2 ** 15, "r": 8, "p": 1},
+    "scrypt_n2^16": {"algorithm": "scrypt", "n": 2 ** 16, "r": 8, "p": 1},
+    "pbkdf2_210k": {"algorithm": "pbkdf2_sha256", "iterations": 210_000},
+    "pbkdf2_600k": {"algorithm": "pbkdf2_sha256", "iterations": 600_000},
+}
+
+
+def parallel_throughput(stored: str, workers: int, iterations: int) -> float:
+    """Verifications per second with `workers` threads (hashlib releases the GIL while hashing)"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = time.perf_counter()
+        list(pool.map(lambda _: verify_password("benchmark", stored), range(iterations * workers)))
+        return iterations * workers / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20, help="verifications per setting (and per worker)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="threads of the parallel run")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results, parallel = {}, {}
+    for name, setting in SETTINGS.items():
+        stored = hash_password("benchmark", **setting)
+        results[name] = measure(lambda: verify_password("benchmark", stored), args.iterations, warmup=2)
+        parallel[name] = round(parallel_throughput(stored, args.workers, args.iterations), 2)
+
+    print_table(results)
+    print()
+    print(f"{'setting':<16} {'logins/s/core':>14} {f'logins/s x{args.workers}':>16}")
+    for name in SETTINGS:
+        print(f"{name:<16} {results[name]['ops_per_sec']:>14.1f} {parallel[name]:>16.1f}")
+    write_results(args.output, "password_hashing", {
+        "workers": args.workers,
+        "single_core": results,
+        "parallel_logins_per_sec": parallel,
+    })
+
+
+if __name__ == "__main__":
+    main()
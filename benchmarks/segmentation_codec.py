@@ -0,0 +1,81 @@
+"""
+Size and (de)serialisation time of segmentation polygons as DynamoDB number lists
+vs. the packed float32/int16 encodings.
+
+    python -m benchmarks.segmentation_codec --points 2000 --polygons 12 --output codec.json
+"""
+import json
+import base64
+import random
+import argparse
+from datetime import datetime
+
+from benchmarks.common import measure, print_table, write_results
+
+from pytz import UTC
+
+from core.database.database import Database
+from core.entities import EcgReportSegmentation, ReportSegmentationType
+from core.helpers.transform import number_to_decimal
+
+
+def wire_size(item: dict) -> int:
+    """Approximate size of the item on the wire (DynamoDB JSON, binary as base64)"""
+    def default(value):
+        return base64.b64encode(bytes(value)).decode("ascii")
+
+    return len(json.dumps(Database.serialize(item), default=default))
+
+
+def make_segmentation(polygons: int, points: int) -> EcgReportSegmentation:
+    rng = random.Random(42)
+    segmentation = []
+    for _ in range(polygons):
+        x, y, polygon = rng.uniform(0, 3000), rng.uniform(0, 2000), []
+        for _ in range(points):
+            x += rng.uniform(-3, 3)
+            y += rng.uniform(-3, 3)
+            polygon += [round(x, 1), round(y, 1)]
+        segmentation.append(polygon)
+    return EcgReportSegmentation(
+        category=ReportSegmentationType.NORMAL,
+        segmentation=segmentation,
+        bbox=[0, 0, 3000, 2000],
+        area=1.0,
+        created_at=datetime.now(UTC),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polygons", type=int, default=12, help="polygons per segmentation (e.g. one per lead)")
+    parser.add_argument("--points", type=int, default=1000, help="points per polygon")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    segmentation = make_segmentation(args.polygons, args.points)
+    results, sizes = {}, {}
+    for encoding in ("list", "float32", "int16"):
+        item = number_to_decimal(segmentation.to_dynamo(encoding=encoding))
+        wire = Database.serialize(item)
+        sizes[encoding] = wire_size(item)
+
+        results[f"{encoding}_encode"] = measure(
+            lambda: Database.serialize(number_to_decimal(segmentation.to_dynamo(encoding=encoding))),
+            args.iterations, warmup=5,
+        )
+        results[f"{encoding}_decode"] = measure(
+            lambda: EcgReportSegmentation.from_dynamo(Database.deserialize(wire)),
+            args.iterations, warmup=5,
+        )
+
+    print_table(results)
+    print()
+    for encoding, size in sizes.items():
+        print(f"{encoding:<8} {size:>10} bytes  ({size / sizes['list']:.1%} of list)")
+    write_results(args.output, "segmentation_codec", {"timings": results, "wire_bytes": sizes})
+
+
+if __name__ == "__main__":
+    main()
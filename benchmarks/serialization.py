@@ -0,0 +1,73 @@
+"""
+JSON encoding of /exams/batch responses of growing size: the stdlib json.dumps
+the Lambda responses used, both core.helpers.serialization backends, pydantic's
+encoder (what FastAPI uses for routes with a response_model) and the gzip pass
+applied above COMPRESSION_MIN_BYTES.
+
+    python -m benchmarks.serialization --exams 1 25 100 --output serialization.json
+"""
+import json
+import zlib
+import argparse
+
+from benchmarks.common import measure, print_table, write_results
+from benchmarks.fixtures import make_exam
+
+from pydantic import TypeAdapter
+
+from core.config.env import ENV
+from core.schemas.exams import GetExamsResponse
+from core.helpers import serialization
+from modules.exams.get_exams import EXAM_EXCLUDE
+
+
+def cases(exams: int, reports: int, points: int, iterations: int):
+    response = GetExamsResponse(
+        exams=[make_exam(reports, points, 1, exam_id=f"e{i}").model_dump(mode="json", exclude=EXAM_EXCLUDE)
+               for i in range(exams)],
+        missing=[],
+    )
+    body = response.model_dump()
+    adapter = TypeAdapter(GetExamsResponse)
+    encoded = serialization.dumps(body)
+
+    timings = {
+        "json.dumps": measure(lambda: json.dumps(body), iterations, 5),
+        "stdlib": measure(lambda: serialization._stdlib_dumps(body), iterations, 5),
+        "pydantic": measure(lambda: adapter.dump_json(response), iterations, 5),
+        "gzip": measure(lambda: zlib.compress(encoded, ENV.COMPRESSION_LEVEL), iterations, 5),
+    }
+    if serialization.orjson is not None:
+        timings["orjson"] = measure(lambda: serialization._orjson_dumps(body), iterations, 5)
+    return timings, len(encoded), len(zlib.compress(encoded, ENV.COMPRESSION_LEVEL))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exams", type=int, nargs="+", default=[1, 25, 100], help="exams per response")
+    parser.add_argument("--reports", type=int, default=3, help="reports of each exam")
+    parser.add_argument("--points", type=int, default=200, help="points per segmentation polygon")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results, sizes = {}, {}
+    for exams in args.exams:
+        timings, size, compressed = cases(exams, args.reports, args.points, args.iterations)
+        sizes[exams] = {"bytes": size, "gzip_bytes": compressed}
+        for name, stats in timings.items():
+            results[f"{name}[exams={exams}]"] = stats
+
+    print_table(results)
+    for exams, size in sizes.items():
+        print(f"exams={exams}: {size['bytes']} bytes, {size['gzip_bytes']} gzipped")
+    write_results(args.output, "serialization", {
+        "reports": args.reports,
+        "points": args.points,
+        "sizes": sizes,
+        "timings": results,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import os
+import sys
 import time
 import boto3
 from typing import List
 from populate_user import User
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core.database.schema import table_definition
+from core.database.parallel_scan import ParallelScan
+from core.helpers.password import hash_password
+
 load_dotenv()
 
 bucket_name = os.getenv("BUCKET_NAME")
@@ -21,15 +28,7 @@ dynamodb = boto3.resource(
 
 print("Criando tabela exemplo...")
 try:
-    table = dynamodb.create_table(
-        TableName=dynamodb_table_name,
-        KeySchema=[{'AttributeName': 'PK', 'KeyType': 'HASH'}, {'AttributeName': 'SK', 'KeyType': 'RANGE'}],
-        AttributeDefinitions=[
-            {'AttributeName': 'PK', 'AttributeType': 'S'},
-            {'AttributeName': 'SK', 'AttributeType': 'N'}
-        ],
-        ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
-    )
+    table = dynamodb.create_table(**table_definition(dynamodb_table_name))
     table.wait_until_exists()
     print(f"Tabela '{dynamodb_table_name}' criada com sucesso.")
 except Exception as e:
@@ -60,13 +59,16 @@ test_users: List[User] = [
 # Clear table
 def clear_table(table):
     print(f"Clearing table '{table.name}'...")
-    try:
-        response = table.scan()
-        items = response.get('Items', [])
+
+    def delete_page(items):
         with table.batch_writer() as batch:
             for item in items:
                 batch.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
-        print(f"Table '{table.name}' cleared successfully.")
+
+    try:
+        # Every page of every segment, not only the first 1 MB a single scan() returns
+        progress = ParallelScan(table, segments=4, progress=print, ProjectionExpression="PK, SK").run(delete_page)
+        print(f"Table '{table.name}' cleared successfully ({progress.items} items deleted).")
     except Exception as e:
         print(f"Error clearing table: {e}")
 
@@ -75,7 +77,8 @@ clear_table(table)
 
 for user in test_users:
     try:
-        user_dynamo = user.to_dynamo()
+        # Stored like the login stores it: never as plaintext
+        user_dynamo = user.model_copy(update={"password": hash_password(user.password)}).to_dynamo()
         print(user_dynamo)
         table.put_item(Item=user_dynamo)
         print(f"Usuário '{user.email}' criado com sucesso.")
@@ -0,0 +1,116 @@
+"""
+Bring an existing table up to the exam summary read model.
+
+Creates the summary indexes the table lacks (one UpdateTable per index, as
+DynamoDB requires, waiting for each to become ACTIVE) and copies the principal
+report's diagnosis to `principal_diagnosis` on the headers written before it
+existed, so list_exam_summaries shows it. Safe to run more than once, and
+while the API is serving: headers already carrying the attribute are skipped,
+and --max-read-units caps the read capacity the scan takes from the API.
+
+    cd src && python -m commands.backfill_exam_summaries --segments 8 [--max-read-units 100] [--dry-run]
+"""
+import time
+import argparse
+import threading
+from typing import List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from core.config.env import ENV
+from core.database.database import Database
+from core.database.schema import index_definition
+from core.database.parallel_scan import ParallelScan
+from core.database.keys import EXAM_PREFIX, EXAM_HEADER_SK, EXAM_SUMMARIES_BY_STATUS_INDEX, EXAM_SUMMARIES_BY_DATE_INDEX
+
+SUMMARY_INDEXES = ((EXAM_SUMMARIES_BY_STATUS_INDEX, "GSI1"), (EXAM_SUMMARIES_BY_DATE_INDEX, "GSI2"))
+
+
+def missing_indexes(client) -> List[Tuple[str, str]]:
+    table = client.describe_table(TableName=ENV.DYNAMO_TABLE)["Table"]
+    existing = {index["IndexName"] for index in table.get("GlobalSecondaryIndexes", [])}
+    return [(name, key) for name, key in SUMMARY_INDEXES if name not in existing]
+
+
+def create_index(client, name: str, key: str) -> None:
+    """Add one summary index and wait until DynamoDB has backfilled it"""
+    definition = index_definition(name, key, summary=True)
+    table = client.describe_table(TableName=ENV.DYNAMO_TABLE)["Table"]
+    if table.get("BillingModeSummary", {}).get("BillingMode") == "PAY_PER_REQUEST":
+        definition.pop("ProvisionedThroughput")
+    client.update_table(
+        TableName=ENV.DYNAMO_TABLE,
+        AttributeDefinitions=[
+            {"AttributeName": f"{key}PK", "AttributeType": "S"},
+            {"AttributeName": f"{key}SK", "AttributeType": "N"},
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": definition}],
+    )
+    while True:
+        indexes = client.describe_table(TableName=ENV.DYNAMO_TABLE)["Table"].get("GlobalSecondaryIndexes", [])
+        status = next((index["IndexStatus"] for index in indexes if index["IndexName"] == name), "CREATING")
+        if status == "ACTIVE":
+            return
+        time.sleep(10)
+
+
+def backfill(table, segments: int, max_read_units: Optional[float], dry_run: bool) -> int:
+    """Set principal_diagnosis on the headers that lack it; returns how many were (or would be) updated"""
+    updated, lock = 0, threading.Lock()
+
+    def update(page: List[dict]) -> None:
+        nonlocal updated
+        count = 0
+        for item in page:
+            if not dry_run:
+                try:
+                    table.update_item(
+                        Key={"PK": item["PK"], "SK": item["SK"]},
+                        UpdateExpression="SET principal_diagnosis = principal_report.report",
+                        ConditionExpression="attribute_exists(PK) AND attribute_not_exists(principal_diagnosis)",
+                    )
+                except ClientError as e:
+                    # Approved or deleted since the scan read it: nothing left to fix
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+                    continue
+            count += 1
+        with lock:
+            updated += count
+
+    ParallelScan(
+        table,
+        segments,
+        max_read_units=max_read_units,
+        progress=lambda progress: print(f"  {progress}"),
+        FilterExpression=(
+            Attr("PK").begins_with(EXAM_PREFIX) & Attr("SK").eq(EXAM_HEADER_SK)
+            & Attr("principal_report.report").exists() & Attr("principal_diagnosis").not_exists()
+        ),
+        ProjectionExpression="PK, SK, principal_report.report",
+    ).run(update)
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments")
+    parser.add_argument("--max-read-units", type=float, help="read capacity units per second the scan may use")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args()
+
+    db = Database()
+    for name, key in missing_indexes(db.client):
+        print(f"Index {name} missing{'' if args.dry_run else ', creating it'}")
+        if not args.dry_run:
+            started = time.perf_counter()
+            create_index(db.client, name, key)
+            print(f"Index {name} active after {time.perf_counter() - started:.0f}s")
+
+    updated = backfill(db.table, args.segments, args.max_read_units, args.dry_run)
+    print(f"{updated} exam headers {'would be updated' if args.dry_run else 'updated'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Bulk import historical ECG exams from a manifest.
+
+The manifest is a CSV (with header) or NDJSON file with one exam per row:
+
+    id, file, made_at, gender, birth_date, amplitude, speed
+
+`file` is the local ECG file (relative paths are resolved from the manifest's
+directory), `made_at` an ISO date/time (UTC when naive) and `gender` either the
+enum name or value. Exams are imported in batches: their files are uploaded to
+BUCKET_NAME concurrently (multipart above the threshold), the exam items are
+written with BatchWriteItem, the counters get one aggregated ADD per touched
+item and the imported ids are appended to the checkpoint file, so an
+interrupted import picks up where it stopped. Exams that already exist are
+skipped. The checkpoint also records what each batch adds to the counters
+before the batch is written, and every counter update once it is applied, so a
+resumed import adds the counts an interrupted batch still owes.
+
+    cd src && python -m commands.bulk_import_exams manifest.csv --workers 16 --batch-size 200
+"""
+import os
+import csv
+import json
+import time
+import uuid
+import argparse
+import mimetypes
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from pytz import UTC
+from boto3.s3.transfer import TransferConfig
+
+from core.infra.aws import AWS
+from core.config.env import ENV
+from core.database.database import Database
+from core.entities import EcgExam, Gender
+from core.database.batch import batch_get_items
+from core.database.keys import exam_pk, EXAM_HEADER_SK, EXAM_COUNTER_PK, EXAM_COUNTER_SK, EXAM_DAY_COUNTER_PK
+from core.database.repositories.exams.counters import counter_update, day_bucket
+
+MB = 1024 * 1024
+
+
+def read_manifest(path: str) -> Iterator[dict]:
+    """Rows of a CSV or NDJSON manifest"""
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def parse_row(row: dict, base_dir: str, prefix: str) -> Tuple[EcgExam, str]:
+    """Exam of a manifest row and the local path of its file"""
+    made_at = datetime.fromisoformat(row["made_at"])
+    if made_at.tzinfo is None:
+        made_at = made_at.replace(tzinfo=UTC)
+    gender = row["gender"]
+    local_path = os.path.join(base_dir, row["file"])
+
+    exam = EcgExam(
+        id=row["id"],
+        file_path=f"{prefix}{row['id']}{os.path.splitext(local_path)[1]}",
+        made_at=made_at,
+        gender=Gender[gender] if gender in Gender.__members__ else Gender(gender),
+        birth_date=row["birth_date"],
+        amplitude=str(row["amplitude"]),
+        speed=str(row["speed"]),
+        principal_report=None,
+    )
+    return exam, local_path
+
+
+# Checkpoint lines are imported exam ids, plus JSON records tracking the counters of each batch:
+#   {"batch": <id>, "exams": {<exam id>: [<day bucket>, "approved"|"pending"]}}   before its items are written
+#   {"batch": <id>, "counted": <n>}                                               after its n-th counter update
+#   {"batch": <id>, "finished": true}                                             with the ids, once all are added
+
+
+def load_checkpoint(path: str) -> Tuple[Set[str], Dict[str, Dict[str, Any]]]:
+    """Ids already imported, and the batches whose counters may not have been added (with the updates done)"""
+    done, batches = set(), {}
+    if not os.path.exists(path):
+        return done, batches
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line.startswith("{"):
+                if line:
+                    done.add(line)
+                continue
+            record = json.loads(line)
+            if "exams" in record:
+                batches[record["batch"]] = {"exams": record["exams"], "counted": set()}
+            elif "counted" in record:
+                batches[record["batch"]]["counted"].add(record["counted"])
+            elif record.get("finished"):
+                batches.pop(record["batch"], None)
+    return done, batches
+
+
+def save_checkpoint(path: str, lines: List[str]) -> None:
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def counter_updates_of(exams: Dict[str, List[Any]]) -> List[dict]:
+    """One aggregated `UpdateItem` per counter the exams ({id: [day bucket, state]}) add to, in a stable order"""
+    if not exams:
+        return []
+    totals, days = Counter(), {}
+    for day, state in exams.values():
+        for counter in (totals, days.setdefault(day, Counter())):
+            counter["total"] += 1
+            counter[state] += 1
+
+    updates = [counter_update({"PK": EXAM_COUNTER_PK, "SK": EXAM_COUNTER_SK}, **totals)]
+    updates += [counter_update({"PK": EXAM_DAY_COUNTER_PK, "SK": day}, **days[day]) for day in sorted(days)]
+    return updates
+
+
+class Importer:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.checkpoint = args.checkpoint or f"{args.manifest}.checkpoint"
+        self.db = Database()
+        self.s3 = AWS.get_s3_client()
+        self.transfer = TransferConfig(
+            multipart_threshold=args.multipart_threshold_mb * MB,
+            multipart_chunksize=args.chunk_mb * MB,
+            max_concurrency=args.part_concurrency,
+        )
+        self.uploads = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="upload")
+        self.started = time.perf_counter()
+        self.stats = Counter()
+
+    def existing(self, exam_ids: List[str]) -> Set[str]:
+        """Partition keys of the exams already in the table"""
+        keys = [self.db.serialize({"PK": exam_pk(exam_id), "SK": EXAM_HEADER_SK}) for exam_id in exam_ids]
+        items = batch_get_items(self.db.wire_client, ENV.DYNAMO_TABLE, keys, projection=["PK"])
+        return {item["PK"]["S"] for item in items}
+
+    def upload(self, exam: EcgExam, local_path: str) -> Optional[int]:
+        """Upload the exam file, returning its size (None when it failed)"""
+        content_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+        try:
+            self.s3.upload_file(
+                local_path,
+                ENV.BUCKET_NAME,
+                exam.file_path,
+                ExtraArgs={"ContentType": content_type},
+                Config=self.transfer,
+            )
+            return os.path.getsize(local_path)
+        except Exception as e:
+            print(f"Error uploading {local_path} of exam {exam.id}: {e}")
+            return None
+
+    def add_counters(self, batch_id: str, exams: Dict[str, List[Any]], counted: Set[int] = frozenset()) -> None:
+        """Counter updates of a batch not applied yet, each recorded in the checkpoint once applied"""
+        for position, update in enumerate(counter_updates_of(exams)):
+            if position in counted:
+                continue
+            self.db.client.update_item(**update)
+            save_checkpoint(self.checkpoint, [json.dumps({"batch": batch_id, "counted": position})])
+
+    def write(self, exams: List[EcgExam]) -> str:
+        """Exam items through BatchWriteItem, then one aggregated ADD per touched counter; returns the batch id"""
+        # Recorded first: a rerun would take these exams for pre-existing ones and never count them
+        batch_id = uuid.uuid4().hex
+        contributions = {
+            exam.id: [day_bucket(exam.made_at), "approved" if exam.approved else "pending"] for exam in exams
+        }
+        save_checkpoint(self.checkpoint, [json.dumps({"batch": batch_id, "exams": contributions})])
+
+        with self.db.table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+            for exam in exams:
+                for item in exam.to_dynamo_items():
+                    batch.put_item(Item=item)
+                    self.stats["items"] += 1
+
+        self.add_counters(batch_id, contributions)
+        return batch_id
+
+    def resume(self, batches: Dict[str, Dict[str, Any]]) -> None:
+        """Add the counts still owed by batches interrupted before all their counters were updated"""
+        for batch_id, batch in batches.items():
+            if batch["counted"]:
+                # Counters only start once every item is written, so the recorded counts are all owed
+                exams = batch["exams"]
+            else:
+                # Died while writing the items: count the exams that made it, the others are imported again
+                existing = self.existing(list(batch["exams"]))
+                exams = {exam_id: value for exam_id, value in batch["exams"].items() if exam_pk(exam_id) in existing}
+                finished = json.dumps({"batch": batch_id, "finished": True})
+                batch_id = uuid.uuid4().hex
+                save_checkpoint(self.checkpoint, [json.dumps({"batch": batch_id, "exams": exams}), finished])
+
+            print(f"Resuming: adding the counters of {len(exams)} exams of an interrupted batch")
+            self.add_counters(batch_id, exams, batch["counted"])
+            save_checkpoint(self.checkpoint, [*exams, json.dumps({"batch": batch_id, "finished": True})])
+
+    def import_batch(self, batch: List[Tuple[EcgExam, str]]) -> List[str]:
+        """Import one batch, returning its checkpoint lines (ids done, imported or already there, and its record)"""
+        existing = self.existing([exam.id for exam, _ in batch])
+        pending = [(exam, path) for exam, path in batch if exam_pk(exam.id) not in existing]
+        self.stats["skipped"] += len(batch) - len(pending)
+
+        sizes = list(self.uploads.map(lambda row: self.upload(*row), pending))
+        uploaded = [exam for (exam, _), size in zip(pending, sizes) if size is not None]
+        self.stats["files"] += len(uploaded)
+        self.stats["bytes"] += sum(size for size in sizes if size is not None)
+        self.stats["failed"] += len(pending) - len(uploaded)
+
+        done = [exam.id for exam, _ in batch if exam_pk(exam.id) in existing] + [exam.id for exam in uploaded]
+        if not uploaded:
+            return done
+        return [*done, json.dumps({"batch": self.write(uploaded), "finished": True})]
+
+    def report(self) -> None:
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"{self.stats['files']} files ({self.stats['bytes'] / MB:.1f} MB), {self.stats['items']} items, "
+            f"{self.stats['skipped']} skipped, {self.stats['failed']} failed in {elapsed:.1f}s | "
+            f"{self.stats['files'] / elapsed:.1f} files/s, {self.stats['bytes'] / MB / elapsed:.2f} MB/s, "
+            f"{self.stats['items'] / elapsed:.1f} items/s"
+        )
+
+    def run(self) -> None:
+        args = self.args
+        done, batches = load_checkpoint(self.checkpoint)
+        if done:
+            print(f"Resuming: {len(done)} exams already imported according to {self.checkpoint}")
+        self.resume(batches)
+        done, _ = load_checkpoint(self.checkpoint)
+
+        base_dir = os.path.dirname(os.path.abspath(args.manifest))
+        batch: Dict[str, Tuple[EcgExam, str]] = {}
+        for line, row in enumerate(read_manifest(args.manifest), start=1):
+            try:
+                exam, local_path = parse_row(row, base_dir, args.prefix)
+            except Exception as e:
+                print(f"Error parsing manifest row {line}: {e}")
+                self.stats["failed"] += 1
+                continue
+            if exam.id in done:
+                continue
+
+            batch[exam.id] = (exam, local_path)
+            if len(batch) >= args.batch_size:
+                save_checkpoint(self.checkpoint, self.import_batch(list(batch.values())))
+                batch.clear()
+                self.report()
+
+        if batch:
+            save_checkpoint(self.checkpoint, self.import_batch(list(batch.values())))
+        self.uploads.shutdown()
+        self.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="CSV or NDJSON (.ndjson/.jsonl) manifest")
+    parser.add_argument("--checkpoint", help="ids already imported (default: <manifest>.checkpoint)")
+    parser.add_argument("--prefix", default="exams/", help="key prefix of the uploaded files")
+    parser.add_argument("--batch-size", type=int, default=200, help="exams per batch (and checkpoint)")
+    parser.add_argument("--workers", type=int, default=16, help="files uploaded at once")
+    parser.add_argument("--part-concurrency", type=int, default=4, help="parts of one file uploaded at once")
+    parser.add_argument("--multipart-threshold-mb", type=int, default=8)
+    parser.add_argument("--chunk-mb", type=int, default=8, help="multipart part size")
+    args = parser.parse_args()
+
+    connections = args.workers * args.part_concurrency
+    if connections > ENV.AWS_MAX_POOL_CONNECTIONS:
+        print(f"Warning: up to {connections} concurrent requests but AWS_MAX_POOL_CONNECTIONS is "
+              f"{ENV.AWS_MAX_POOL_CONNECTIONS}; raise it to avoid waiting on the connection pool")
+
+    Importer(args).run()
+
+
+if __name__ == "__main__":
+    main()
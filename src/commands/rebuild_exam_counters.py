@@ -0,0 +1,92 @@
+"""
+Recompute the exam counters from the exam headers, e.g. after they drifted.
+
+The table is scanned in parallel segments (optionally capped at a read capacity
+rate); the resulting totals and day buckets replace the stored counters. Run it
+while no exams are being written, otherwise increments made during the scan are
+lost.
+
+    cd src && python -m commands.rebuild_exam_counters --segments 8 [--max-read-units 100] [--dry-run]
+"""
+import argparse
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from pytz import UTC
+from boto3.dynamodb.conditions import Attr, Key
+
+from core.database.database import Database
+from core.database.parallel_scan import ParallelScan
+from core.database.repositories.exams.counters import day_bucket, COUNTER_FIELDS
+from core.database.keys import EXAM_PREFIX, EXAM_HEADER_SK, EXAM_COUNTER_PK, EXAM_COUNTER_SK, EXAM_DAY_COUNTER_PK
+
+
+def scan_headers(table, segments: int, max_read_units: Optional[float]) -> Tuple[Counter, Dict[int, Counter]]:
+    """Aggregate every exam header of the table"""
+    totals, days = Counter(), {}
+    scan = ParallelScan(
+        table,
+        segments,
+        max_read_units=max_read_units,
+        progress=lambda progress: print(f"  {progress}"),
+        FilterExpression=Attr("PK").begins_with(EXAM_PREFIX) & Attr("SK").eq(EXAM_HEADER_SK),
+        ProjectionExpression="made_at, approved",
+    )
+    for item in scan:
+        state = "approved" if item.get("approved") else "pending"
+        day = day_bucket(datetime.fromtimestamp(float(item["made_at"]), tz=UTC))
+        for counter in (totals, days.setdefault(day, Counter())):
+            counter["total"] += 1
+            counter[state] += 1
+    return totals, days
+
+
+def stored_counters(table) -> Tuple[Counter, Dict[int, Counter]]:
+    item = table.get_item(Key={"PK": EXAM_COUNTER_PK, "SK": EXAM_COUNTER_SK}).get("Item", {})
+    totals = Counter({field: int(item.get(field, 0)) for field in COUNTER_FIELDS})
+
+    days = {}
+    query = {"KeyConditionExpression": Key("PK").eq(EXAM_DAY_COUNTER_PK)}
+    while True:
+        response = table.query(**query)
+        for item in response.get("Items", []):
+            days[int(item["SK"])] = Counter({field: int(item.get(field, 0)) for field in COUNTER_FIELDS})
+        if "LastEvaluatedKey" not in response:
+            return totals, days
+        query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments")
+    parser.add_argument("--max-read-units", type=float, help="read capacity units per second the scan may use")
+    parser.add_argument("--dry-run", action="store_true", help="only report the drift")
+    args = parser.parse_args()
+
+    table = Database().table
+    totals, days = scan_headers(table, args.segments, args.max_read_units)
+    print(f"Scanned {totals['total']} exams")
+
+    current_totals, current_days = stored_counters(table)
+    drifted = [day for day in sorted(set(days) | set(current_days)) if days.get(day) != current_days.get(day)]
+    print(f"Totals: stored {dict(current_totals)} / recomputed {dict(totals)}")
+    print(f"Day buckets drifted: {len(drifted)}")
+    for day in drifted:
+        print(f"  {day}: stored {dict(current_days.get(day, {}))} / recomputed {dict(days.get(day, {}))}")
+
+    if args.dry_run:
+        return
+
+    with table.batch_writer() as batch:
+        batch.put_item(Item={"PK": EXAM_COUNTER_PK, "SK": EXAM_COUNTER_SK, **{f: totals[f] for f in COUNTER_FIELDS}})
+        for day in drifted:
+            if day in days:
+                batch.put_item(Item={"PK": EXAM_DAY_COUNTER_PK, "SK": day, **{f: days[day][f] for f in COUNTER_FIELDS}})
+            else:
+                batch.delete_item(Key={"PK": EXAM_DAY_COUNTER_PK, "SK": day})
+    print("Counters rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
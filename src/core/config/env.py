@@ -1,21 +1,114 @@
 import os
-from typing import Literal
+from typing import Literal, Optional
 
-from dotenv import load_dotenv
+# Lambda gets its configuration from the function environment: skip looking for a .env file there
+if "AWS_LAMBDA_FUNCTION_NAME" not in os.environ and os.environ.get("LOAD_DOTENV", "true").lower() == "true":
+    from dotenv import load_dotenv
 
-load_dotenv()
+    load_dotenv()
 
 
 class Environment:
-    STAGE: Literal['test', 'dev', 'uat', 'prod'] = os.environ.get("STAGE", "dev")
+    STAGE: Literal['local', 'test', 'dev', 'uat', 'prod'] = os.environ.get("STAGE", "dev")
 
     # AWS
     BUCKET_NAME: str = os.environ.get("BUCKET_NAME")
     DYNAMO_TABLE: str = os.environ.get("DYNAMO_TABLE")
+    # "aws" (DynamoDB or DYNAMO_ENDPOINT) or "memory" (in-process engine, the default of STAGE=local)
+    DYNAMO_ENGINE: Literal['aws', 'memory'] = os.environ.get("DYNAMO_ENGINE", "memory" if STAGE == "local" else "aws")
+    DYNAMO_ENDPOINT: str = os.environ.get("DYNAMO_ENDPOINT", "http://localhost:8000" if STAGE == "test" else None)
+    S3_PUBLIC_ENDPOINT: str = os.environ.get("S3_PUBLIC_ENDPOINT")  # host presigned URLs are signed for
+
+    # AWS connection pool
+    AWS_MAX_POOL_CONNECTIONS: int = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))
+    AWS_TCP_KEEPALIVE: bool = os.environ.get("AWS_TCP_KEEPALIVE", "true").lower() == "true"
+    AWS_MAX_RETRIES: int = int(os.environ.get("AWS_MAX_RETRIES", "3"))
+    AWS_RETRY_MODE: Literal['legacy', 'standard', 'adaptive'] = os.environ.get("AWS_RETRY_MODE", "standard")
+    AWS_CONNECT_TIMEOUT: float = float(os.environ.get("AWS_CONNECT_TIMEOUT", "2"))
+    AWS_READ_TIMEOUT: float = float(os.environ.get("AWS_READ_TIMEOUT", "5"))
+
+    # Segmentation polygons storage: "list" (DynamoDB number lists), "float32" or "int16" (packed binary)
+    SEGMENTATION_ENCODING: Literal['list', 'float32', 'int16'] = os.environ.get("SEGMENTATION_ENCODING", "list")
+    SEGMENTATION_SCALE: float = float(os.environ.get("SEGMENTATION_SCALE", "10"))
+    SEGMENTATION_DELTA: bool = os.environ.get("SEGMENTATION_DELTA", "true").lower() == "true"
+
+    # Optimistic concurrency
+    DYNAMO_CONFLICT_RETRIES: int = int(os.environ.get("DYNAMO_CONFLICT_RETRIES", "3"))
+    DYNAMO_CONFLICT_BACKOFF: float = float(os.environ.get("DYNAMO_CONFLICT_BACKOFF", "0.02"))
+
+    # Presigned file URLs
+    PRESIGNED_URL_TTL: int = int(os.environ.get("PRESIGNED_URL_TTL", "300"))
+    PRESIGNED_URL_CACHE_SIZE: int = int(os.environ.get("PRESIGNED_URL_CACHE_SIZE", "4096"))
+    # Download URLs are cached per process (worker or Lambda container) and deleting an exam only clears the cache
+    # of the process handling the delete: others may hand out a cached URL this long after the delete (at most TTL/2)
+    PRESIGNED_URL_REUSE_SECONDS: int = int(os.environ.get("PRESIGNED_URL_REUSE_SECONDS", "30"))
+    MULTIPART_THRESHOLD_MB: int = int(os.environ.get("MULTIPART_THRESHOLD_MB", "16"))
+    MULTIPART_PART_SIZE_MB: int = int(os.environ.get("MULTIPART_PART_SIZE_MB", "8"))
+
+    # Exam file proxy
+    FILE_STREAM_CHUNK_KB: int = int(os.environ.get("FILE_STREAM_CHUNK_KB", "256"))
+    FILE_STREAM_BUFFER_CHUNKS: int = int(os.environ.get("FILE_STREAM_BUFFER_CHUNKS", "4"))
+
+    # Exam file previews
+    PREVIEW_WORKERS: int = int(os.environ.get("PREVIEW_WORKERS", "2"))
+    PREVIEW_QUALITY: int = int(os.environ.get("PREVIEW_QUALITY", "85"))
+    PREVIEW_TILE_SIZE: int = int(os.environ.get("PREVIEW_TILE_SIZE", "0"))  # 0 disables tiles
+    # "process" renders in a process pool; Lambda has no /dev/shm for multiprocessing, so it renders "inline"
+    PREVIEW_POOL: Literal['process', 'inline'] = os.environ.get(
+        "PREVIEW_POOL", "inline" if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else "process"
+    )
+    PREVIEW_MAX_SOURCE_MB: int = int(os.environ.get("PREVIEW_MAX_SOURCE_MB", "100"))
+
+    # BatchGetItem
+    DYNAMO_BATCH_CONCURRENCY: int = int(os.environ.get("DYNAMO_BATCH_CONCURRENCY", "8"))
+    DYNAMO_BATCH_RETRIES: int = int(os.environ.get("DYNAMO_BATCH_RETRIES", "5"))
+    DYNAMO_BATCH_BACKOFF: float = float(os.environ.get("DYNAMO_BATCH_BACKOFF", "0.05"))
+
+    # Password hashing ("scrypt" or "pbkdf2_sha256") and its bounded pool
+    PASSWORD_ALGORITHM: Literal['scrypt', 'pbkdf2_sha256'] = os.environ.get("PASSWORD_ALGORITHM", "scrypt")
+    PASSWORD_SCRYPT_N: int = int(os.environ.get("PASSWORD_SCRYPT_N", str(2 ** 14)))
+    PASSWORD_SCRYPT_R: int = int(os.environ.get("PASSWORD_SCRYPT_R", "8"))
+    PASSWORD_SCRYPT_P: int = int(os.environ.get("PASSWORD_SCRYPT_P", "1"))
+    PASSWORD_PBKDF2_ITERATIONS: int = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+    PASSWORD_POOL_SIZE: int = int(os.environ.get("PASSWORD_POOL_SIZE", str(os.cpu_count() or 1)))
+    PASSWORD_QUEUE_DEPTH: int = int(os.environ.get("PASSWORD_QUEUE_DEPTH", str(2 * (os.cpu_count() or 1))))
+
+    # Blocking I/O executor
+    IO_POOL_SIZE: int = int(os.environ.get("IO_POOL_SIZE", "32"))
+    IO_QUEUE_DEPTH: int = int(os.environ.get("IO_QUEUE_DEPTH", "256"))
+
+    # User lookups cache: "memory" (per process), "redis" (shared, needs REDIS_URL) or "none"
+    USER_CACHE_BACKEND: Literal['memory', 'redis', 'none'] = os.environ.get("USER_CACHE_BACKEND", "memory")
+    USER_CACHE_TTL: float = float(os.environ.get("USER_CACHE_TTL", "60"))
+    USER_CACHE_NEGATIVE_TTL: float = float(os.environ.get("USER_CACHE_NEGATIVE_TTL", "10"))
+    USER_CACHE_SIZE: int = int(os.environ.get("USER_CACHE_SIZE", "10000"))
+    REDIS_URL: str = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 
     # JWT
     JWT_SECRET: str = os.environ.get("JWT_SECRET")
     JWT_ALGORITHM: str = os.environ.get("JWT_ALGORITHM")
+    JWT_PUBLIC_KEY: str = os.environ.get("JWT_PUBLIC_KEY")  # verifying key of asymmetric algorithms
+    JWT_VERIFY_CACHE_SIZE: int = int(os.environ.get("JWT_VERIFY_CACHE_SIZE", "4096"))
+
+    # Cold start: "eager" builds each handler's use case (clients, repositories, keys) while the module is imported,
+    # inside Lambda's init phase; "lazy" defers it to the first invocation
+    HANDLER_INIT: Literal['eager', 'lazy'] = os.environ.get(
+        "HANDLER_INIT", "eager" if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else "lazy"
+    )
+
+    # JSON responses: "auto" (orjson when installed), "orjson" or "stdlib"
+    JSON_SERIALIZER: Literal['auto', 'orjson', 'stdlib'] = os.environ.get("JSON_SERIALIZER", "auto")
+    # gzip response bodies of at least this many bytes when the client accepts it (0 disables)
+    COMPRESSION_MIN_BYTES: int = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_LEVEL: int = int(os.environ.get("COMPRESSION_LEVEL", "6"))
+
+    # Observability: level of the structured request logs written by the Lambda handlers
+    LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO").upper()
+    # Bearer token Prometheus scrapes /metrics with (the endpoint refuses every request when unset)
+    METRICS_TOKEN: Optional[str] = os.environ.get("METRICS_TOKEN") or None
+
+    # Pagination: HMAC key of the listing cursors (JWT_SECRET when unset; listings refuse to run without either)
+    CURSOR_SECRET: Optional[str] = os.environ.get("CURSOR_SECRET") or os.environ.get("JWT_SECRET") or None
 
 
 ENV = Environment()
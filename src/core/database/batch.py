@@ -0,0 +1,63 @@
+import time
+import random
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from core.config.env import ENV
+
+BATCH_GET_LIMIT = 100  # keys per BatchGetItem request
+
+# Chunks of one batch are fetched side by side; the pool is shared by the whole process
+# and only ever runs leaf calls, so a batch waiting on its chunks never starves them.
+_pool = ThreadPoolExecutor(max_workers=ENV.DYNAMO_BATCH_CONCURRENCY, thread_name_prefix="dynamo-batch")
+
+
+def _chunks(keys: List[dict], size: int) -> Iterable[List[dict]]:
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+def _get_chunk(client, table_name: str, keys: List[dict], projection: Optional[dict]) -> List[dict]:
+    """Fetch one chunk, retrying the keys DynamoDB left unprocessed (throttling, 16 MB limit)"""
+    items, request = [], {"Keys": keys, "ConsistentRead": False, **(projection or {})}
+    for attempt in range(ENV.DYNAMO_BATCH_RETRIES + 1):
+        response = client.batch_get_item(RequestItems={table_name: request})
+        items += response.get("Responses", {}).get(table_name, [])
+        unprocessed = response.get("UnprocessedKeys", {}).get(table_name)
+        if not unprocessed:
+            return items
+        request = unprocessed
+        time.sleep(random.uniform(0, ENV.DYNAMO_BATCH_BACKOFF * (2 ** attempt)))
+    raise RuntimeError(f"{len(request['Keys'])} keys still unprocessed after {ENV.DYNAMO_BATCH_RETRIES} retries")
+
+
+def projection_arguments(attributes: List[str]) -> Dict[str, object]:
+    """ProjectionExpression with every attribute aliased, so reserved words are safe"""
+    names = {f"#p{i}": attribute for i, attribute in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def batch_get_items(
+        client,
+        table_name: str,
+        keys: List[dict],
+        projection: Optional[List[str]] = None,
+) -> List[dict]:
+    """
+    Raw items of every key (in wire format), in no particular order.
+
+    Keys are split into BatchGetItem chunks fetched concurrently; keys that do
+    not exist are simply absent from the result.
+    """
+    arguments = projection_arguments(projection) if projection else None
+    chunks = list(_chunks(keys, BATCH_GET_LIMIT))
+    if len(chunks) <= 1:
+        return _get_chunk(client, table_name, chunks[0], arguments) if chunks else []
+
+    # each chunk runs in a copy of the caller's context, so its capacity is attributed to the caller's request
+    futures = [
+        _pool.submit(contextvars.copy_context().run, _get_chunk, client, table_name, chunk, arguments)
+        for chunk in chunks
+    ]
+    return [item for future in futures for item in future.result()]
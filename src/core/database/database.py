@@ -3,20 +3,25 @@ from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
 from core.infra.aws import AWS
 from core.config.env import ENV
 
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
 
 class Database:
     def __init__(self):
         self.dynamodb = AWS.get_dynamodb_resource()
         self.table = self.dynamodb.Table(ENV.DYNAMO_TABLE)
+        # Accepts and returns plain Python values, like the table
+        self.client = self.dynamodb.meta.client
+        # Accepts and returns raw attribute values, for the compiled decoders
+        self.wire_client = AWS.get_dynamodb_client()
 
     @staticmethod
     def serialize(item: dict) -> dict:
         """Serialize the item for DynamoDB"""
-        serializer = TypeSerializer()
-        return {k: serializer.serialize(v) for k, v in item.items()}
+        return {k: _serializer.serialize(v) for k, v in item.items()}
 
     @staticmethod
     def deserialize(item: dict) -> dict:
         """Deserialize the item from DynamoDB"""
-        deserializer = TypeDeserializer()
-        return {k: deserializer.deserialize(v) for k, v in item.items()}
+        return {k: _deserializer.deserialize(v) for k, v in item.items()}
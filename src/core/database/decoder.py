@@ -0,0 +1,219 @@
+from enum import Enum
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union, get_args, get_origin
+
+from pytz import UTC
+from pydantic import BaseModel
+
+from core.helpers.polygon_codec import decode_polygons
+from core.database.keys import exam_id_from_pk, REPORT_ENTITY, APPROVAL_ENTITY
+from core.entities import User, EcgReportStatus, EcgReportSegmentation, EcgReport, EcgExam, EcgExamSummary
+
+# Single-pass decoding of raw DynamoDB items ({"S": ...}, {"N": ...}, {"M": ...}) into entities.
+#
+# A decoder is compiled once per entity from its pydantic field annotations: every field
+# gets a converter that reads the wire value directly (no TypeDeserializer, no Decimal,
+# no recursive decimal_to_number), and the entity is built with model_construct since
+# the data was validated when it was written.
+
+Converter = Callable[[dict], Any]
+
+
+def _number(value: dict) -> Union[int, float]:
+    number = value["N"]
+    return float(number) if "." in number or "e" in number or "E" in number else int(number)
+
+
+def _float(value: dict) -> float:
+    return float(value["N"])
+
+
+def _timestamp(value: dict) -> datetime:
+    return datetime.fromtimestamp(float(value["N"]), tz=UTC)
+
+
+def _string(value: dict) -> str:
+    return value["S"]
+
+
+def _bool(value: dict) -> bool:
+    return value["BOOL"]
+
+
+def _float_list(value: dict) -> List[float]:
+    return [float(number["N"]) for number in value["L"]]
+
+
+def _polygons(value: dict) -> List[List[float]]:
+    return [[float(number["N"]) for number in polygon["L"]] for polygon in value["L"]]
+
+
+def _enum(enum: type) -> Converter:
+    members = dict(enum._value2member_map_)
+
+    def convert(value: dict) -> Enum:
+        raw = value["S"]
+        return members[raw] if raw in members else enum(raw)
+
+    return convert
+
+
+def _list(converter: Converter) -> Converter:
+    def convert(value: dict) -> list:
+        return [converter(item) for item in value["L"]]
+
+    return convert
+
+
+def _nullable(converter: Converter) -> Converter:
+    def convert(value: dict) -> Any:
+        return None if "NULL" in value else converter(value)
+
+    return convert
+
+
+def _converter_for(annotation: Any) -> Converter:
+    """Derive the wire converter of a field from its type annotation"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        inner = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nullable(_converter_for(inner[0]))
+    if origin is list:
+        (inner,) = get_args(annotation)
+        if inner is float:
+            return _float_list
+        if get_origin(inner) is list and get_args(inner) == (float,):
+            return _polygons
+        return _list(_converter_for(inner))
+    if origin is Literal:
+        return _number
+    if annotation is datetime:
+        return _timestamp
+    if annotation is bool:
+        return _bool
+    if annotation is float:
+        return _float
+    if annotation is int:
+        return _number
+    if annotation is str:
+        return _string
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _enum(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _map(compile_decoder(annotation))
+    raise TypeError(f"No wire converter for {annotation!r}")
+
+
+def _map(decoder: "EntityDecoder") -> Converter:
+    def convert(value: dict) -> BaseModel:
+        return decoder(value["M"])
+
+    return convert
+
+
+class EntityDecoder:
+    """Decoder of one entity, compiled from its schema plus attribute overrides"""
+
+    def __init__(
+            self,
+            model: type,
+            overrides: Optional[Dict[str, Tuple[Union[str, Tuple[str, ...]], Converter]]] = None,
+            defaults: Optional[Dict[str, Any]] = None,
+    ):
+        overrides = overrides or {}
+        self.model = model
+        self.defaults = defaults or {}
+        self.fields: List[Tuple[str, Tuple[str, ...], Converter]] = []
+        for name, field in model.model_fields.items():
+            attributes, converter = overrides.get(name, (name, None))
+            if converter is None:
+                converter = _converter_for(field.annotation)
+            attributes = (attributes,) if isinstance(attributes, str) else attributes
+            self.fields.append((name, attributes, converter))
+
+    def __call__(self, item: Dict[str, dict]) -> BaseModel:
+        values = dict(self.defaults)
+        for name, attributes, converter in self.fields:
+            for attribute in attributes:
+                raw = item.get(attribute)
+                if raw is not None:
+                    values[name] = converter(raw)
+                    break
+        return self.model.model_construct(**values)
+
+
+_decoders: Dict[type, EntityDecoder] = {}
+
+
+def compile_decoder(model: type) -> EntityDecoder:
+    if model not in _decoders:
+        _decoders[model] = EntityDecoder(model)
+    return _decoders[model]
+
+
+def _user_reference(value: dict) -> User:
+    # Older items only stored the author's e-mail
+    if "S" in value:
+        return User.model_construct(name=value["S"], email=value["S"], password="")
+    return _USER_REFERENCE(value["M"])
+
+
+def _segmentation(value: dict) -> List[List[float]]:
+    return decode_polygons(value["B"]) if "B" in value else _polygons(value)
+
+
+_USER_REFERENCE = EntityDecoder(User, defaults={"password": ""})
+
+_decoders[User] = EntityDecoder(User, overrides={"created_at": ("SK", _timestamp)})
+_decoders[EcgReportStatus] = EntityDecoder(EcgReportStatus, overrides={"created_by": ("created_by", _user_reference)})
+_decoders[EcgReportSegmentation] = EntityDecoder(
+    EcgReportSegmentation,
+    overrides={"segmentation": (("segmentation_packed", "segmentation"), _segmentation)},
+)
+_decoders[EcgReport] = EntityDecoder(EcgReport, overrides={"created_by": ("created_by", _user_reference)})
+_decoders[EcgExam] = EntityDecoder(
+    EcgExam,
+    overrides={"id": ("PK", lambda value: exam_id_from_pk(value["S"]))},
+    defaults={"version": 0, "principal_report": None},
+)
+# Headers written before principal_diagnosis existed lack it until commands.backfill_exam_summaries runs
+_decoders[EcgExamSummary] = EntityDecoder(
+    EcgExamSummary,
+    overrides={"id": ("PK", lambda value: exam_id_from_pk(value["S"]))},
+    defaults={"principal_diagnosis": None, "approved_at": None},
+)
+
+decode_user = _decoders[User]
+decode_report = _decoders[EcgReport]
+decode_exam_header = _decoders[EcgExam]
+decode_exam_summary = _decoders[EcgExamSummary]
+
+
+def decode_exam(items: Union[dict, List[dict]]) -> EcgExam:
+    """Build an exam from its raw header, or from every raw item of its partition"""
+    if isinstance(items, dict):
+        return decode_exam_header(items)
+
+    header, reports, approves = None, {}, {}
+    for item in items:
+        entity = item.get("entity", {}).get("S")
+        if entity == REPORT_ENTITY:
+            reports[item["SK"]["N"]] = item
+        elif entity == APPROVAL_ENTITY:
+            approves.setdefault(item["report_sk"]["N"], []).append(item)
+        else:
+            header = item
+
+    if header is None:
+        raise ValueError("Exam header item not found")
+
+    exam = decode_exam_header(header)
+    approval_decoder = _decoders[EcgReportStatus]
+    history = []
+    for sk in sorted(reports, key=float):
+        report = decode_report(reports[sk])
+        if sk in approves:
+            report.approves = report.approves + [approval_decoder(approve) for approve in approves[sk]]
+        history.append(report)
+    exam.reports = list(exam.reports) + history
+    return exam
@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional
+
+# Single-table key design
+#
+#   item            PK                  SK       GSI1PK (ExamsByStatus)   GSI1SK    GSI2PK (ExamsByDate)   GSI2SK
+#   user            USER#<email>        <ts>
+#   exam header     EXAM#<id>           0        EXAM#APPROVED|PENDING    made_at   EXAM                   made_at
+#   exam report     EXAM#<id>           <report created_at us>1
+#   report approval EXAM#<id>           <approval created_at us>2   (report_sk = <report sort key>)
+#   exam counters   COUNTER#EXAM        0
+#   day counters    COUNTER#EXAM#DAY    <yyyymmdd>
+#
+# The sort key is numeric, so reports and approvals are ordered by creation time after the header.
+# Their sort key is the creation time in microseconds followed by one entity digit (see sibling_sk):
+# a report and an approval created in the same microsecond still get different keys, and every
+# sibling write of ExamRepo is conditional, so a collision fails instead of overwriting another item.
+#
+# ExamSummariesByStatus and ExamSummariesByDate share the keys of ExamsByStatus and ExamsByDate but
+# only project EXAM_SUMMARY_ATTRIBUTES, so worklists read (and pay for) a few hundred bytes per exam
+# instead of the whole header with its principal report and segmentation.
+
+USER_PREFIX = "USER#"
+EXAM_PREFIX = "EXAM#"
+
+EXAM_ENTITY = "EXAM"
+REPORT_ENTITY = "REPORT"
+APPROVAL_ENTITY = "APPROVAL"
+EXAM_HEADER_SK = 0
+_SIBLING_SK_DIGITS = {REPORT_ENTITY: 1, APPROVAL_ENTITY: 2}
+
+EXAM_COUNTER_PK = "COUNTER#EXAM"
+EXAM_COUNTER_SK = 0
+EXAM_DAY_COUNTER_PK = "COUNTER#EXAM#DAY"
+
+EXAMS_BY_STATUS_INDEX = "ExamsByStatus"
+EXAMS_BY_DATE_INDEX = "ExamsByDate"
+EXAM_SUMMARIES_BY_STATUS_INDEX = "ExamSummariesByStatus"
+EXAM_SUMMARIES_BY_DATE_INDEX = "ExamSummariesByDate"
+
+# Header attributes projected into the summary indexes (besides the keys)
+EXAM_SUMMARY_ATTRIBUTES = ("made_at", "gender", "birth_date", "approved", "approved_at", "principal_diagnosis")
+
+
+def user_pk(email: str) -> str:
+    return f"{USER_PREFIX}{email}"
+
+
+def exam_pk(exam_id: str) -> str:
+    return f"{EXAM_PREFIX}{exam_id}"
+
+
+def exam_id_from_pk(pk: str) -> str:
+    return pk[len(EXAM_PREFIX):]
+
+
+def sibling_sk(entity: str, created_at: datetime) -> int:
+    """Sort key of a report or approval item of an exam partition"""
+    return round(created_at.timestamp() * 1_000_000) * 10 + _SIBLING_SK_DIGITS[entity]
+
+
+def exam_status_pk(approved: bool) -> str:
+    return f"{EXAM_PREFIX}{'APPROVED' if approved else 'PENDING'}"
+
+
+def exam_index(approved: Optional[bool], summary: bool = False) -> tuple:
+    """Index name and partition (name, value) serving a listing filtered by approval state"""
+    if approved is None:
+        return EXAM_SUMMARIES_BY_DATE_INDEX if summary else EXAMS_BY_DATE_INDEX, ("GSI2PK", EXAM_ENTITY), "GSI2SK"
+    return (
+        EXAM_SUMMARIES_BY_STATUS_INDEX if summary else EXAMS_BY_STATUS_INDEX,
+        ("GSI1PK", exam_status_pk(approved)),
+        "GSI1SK",
+    )
@@ -0,0 +1,500 @@
+import copy
+import math
+import uuid
+import zlib
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from botocore.awsrequest import AWSResponse
+from botocore.parsers import create_parser
+
+from core.config.env import ENV
+from core.database.schema import table_definition
+from core.database.memory.table import MemoryTable, SortedIndex, Entry
+from core.database.memory.expressions import (
+    MISSING,
+    Context,
+    ExpressionError,
+    apply_update,
+    evaluate_condition,
+    parse_condition,
+    parse_projection,
+    parse_update,
+    project,
+    sortable,
+)
+
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+TRANSACTION_LIMIT = 100
+
+_request_parser = create_parser("json")
+
+
+class EngineError(Exception):
+    """DynamoDB error returned to the client as a 400 response"""
+
+    def __init__(self, code: str, message: str, **extra: Any):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.extra = extra
+
+
+def _validation(message: str) -> EngineError:
+    return EngineError("ValidationException", message)
+
+
+def _conditional_check_failed() -> EngineError:
+    return EngineError("ConditionalCheckFailedException", "The conditional request failed")
+
+
+def _value_size(value: dict) -> int:
+    (kind, raw), = value.items()
+    if kind == "S":
+        return len(raw.encode())
+    if kind == "N":
+        return len(raw) // 2 + 1
+    if kind == "B":
+        return len(raw)
+    if kind in ("BOOL", "NULL"):
+        return 1
+    if kind == "M":
+        return 3 + sum(len(name.encode()) + _value_size(member) + 1 for name, member in raw.items())
+    if kind == "L":
+        return 3 + sum(_value_size(member) + 1 for member in raw)
+    return sum(_value_size({kind[0]: member}) for member in raw)
+
+
+def item_size(item: Optional[dict]) -> int:
+    """Approximate stored size of an item, as DynamoDB bills it"""
+    if not item:
+        return 0
+    return sum(len(name.encode()) + _value_size(value) for name, value in item.items())
+
+
+def _read_units(size: int, consistent: bool) -> float:
+    return max(math.ceil(size / 4096), 1) * (1.0 if consistent else 0.5)
+
+
+def _write_units(*items: Optional[dict]) -> float:
+    return float(max(math.ceil(max(item_size(item) for item in items) / 1024), 1))
+
+
+class MemoryDynamoDB:
+    """
+    In-process DynamoDB: the subset of the API the repositories and commands use,
+    served from memory behind a botocore hook, so boto3 clients, resources and
+    tables work unchanged without any network hop.
+
+    Items are kept in wire format, every table and secondary index keeps each
+    partition sorted by range key (queries are a binary search plus the page
+    read), and a single lock makes every operation (transactions included) atomic.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.tables: Dict[str, MemoryTable] = {}
+
+    # plumbing
+
+    def attach(self, client) -> None:
+        """Serve every call of a boto3 DynamoDB client (resource.meta.client included) from this engine"""
+        client.meta.events.register("before-call.dynamodb", self._before_call)
+
+    def _before_call(self, model, params, **kwargs) -> Tuple[AWSResponse, dict]:
+        request = _request_parser.parse(
+            {"body": params.get("body") or b"{}", "headers": {}, "status_code": 200}, model.input_shape,
+        ) if model.input_shape else {}
+        request.pop("ResponseMetadata", None)
+        try:
+            parsed, status = self.handle(model.name, request), 200
+        except EngineError as e:
+            parsed, status = {"Error": {"Code": e.code, "Message": e.message}, **e.extra}, 400
+        parsed["ResponseMetadata"] = {
+            "RequestId": uuid.uuid4().hex,
+            "HTTPStatusCode": status,
+            "HTTPHeaders": {},
+            "RetryAttempts": 0,
+        }
+        return AWSResponse(params.get("url", ""), status, {}, None), parsed
+
+    def handle(self, operation: str, request: dict) -> dict:
+        """Run one API operation (e.g. "Query") on a parsed request"""
+        handler = _OPERATIONS.get(operation)
+        if handler is None:
+            raise EngineError("UnknownOperationException", f"{operation} is not supported by the in-memory engine")
+        with self._lock:
+            try:
+                return handler(self, request)
+            except ExpressionError as e:
+                raise _validation(str(e))
+
+    def _table(self, name: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise EngineError("ResourceNotFoundException", "Requested resource not found")
+        return table
+
+    @staticmethod
+    def _context(request: dict) -> Context:
+        return Context(request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues"))
+
+    @staticmethod
+    def _check(request: dict, item: Optional[dict], context: Context) -> bool:
+        expression = request.get("ConditionExpression")
+        return not expression or evaluate_condition(parse_condition(expression), item or {}, context)
+
+    @staticmethod
+    def _project(request: dict, item: dict, context: Context) -> dict:
+        expression = request.get("ProjectionExpression")
+        return project(item, parse_projection(expression), context) if expression else dict(item)
+
+    @staticmethod
+    def _capacity(request: dict, table: str, units: float) -> dict:
+        if request.get("ReturnConsumedCapacity", "NONE") == "NONE":
+            return {}
+        return {"ConsumedCapacity": {"TableName": table, "CapacityUnits": units}}
+
+    # tables
+
+    def create_table(self, request: dict) -> dict:
+        with self._lock:
+            if request["TableName"] in self.tables:
+                raise EngineError("ResourceInUseException", f"Table already exists: {request['TableName']}")
+            table = self.tables[request["TableName"]] = MemoryTable(request)
+            return {"TableDescription": table.describe()}
+
+    def delete_table(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        del self.tables[table.name]
+        return {"TableDescription": {**table.describe(), "TableStatus": "DELETING"}}
+
+    def describe_table(self, request: dict) -> dict:
+        return {"Table": self._table(request["TableName"]).describe()}
+
+    def list_tables(self, request: dict) -> dict:
+        return {"TableNames": sorted(self.tables)}
+
+    # items
+
+    def get_item(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        item = table.get(table.key(request["Key"]))
+        response = self._capacity(request, table.name, _read_units(item_size(item), request.get("ConsistentRead")))
+        if item is not None:
+            response["Item"] = self._project(request, item, self._context(request))
+        return response
+
+    def put_item(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        item = request["Item"]
+        old = table.get(table.key(item))
+        if not self._check(request, old, self._context(request)):
+            raise _conditional_check_failed()
+        table.put(item)
+        response = self._capacity(request, table.name, _write_units(old, item))
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            response["Attributes"] = dict(old)
+        return response
+
+    def _updated(self, table: MemoryTable, request: dict, old: Optional[dict], context: Context) -> dict:
+        clauses = parse_update(request["UpdateExpression"]) if request.get("UpdateExpression") else None
+        if not clauses:
+            return old or dict(request["Key"])
+        keys = {table.hash_key, table.range_key}
+        for path, _ in [item for clause in clauses.values() for item in clause]:
+            if context.keys(path)[0] in keys:
+                raise _validation(f"Cannot update attribute {context.keys(path)[0]}. This attribute is part of the key")
+        nested = any(len(path[1]) > 1 for clause in clauses.values() for path, _ in clause)
+        base = old if old is not None else dict(request["Key"])
+        return apply_update(copy.deepcopy(base) if nested else base, clauses, context)
+
+    def update_item(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        old = table.get(table.key(request["Key"]))
+        context = self._context(request)
+        if not self._check(request, old, context):
+            raise _conditional_check_failed()
+        new = self._updated(table, request, old, context)
+        table.put(new)
+
+        response = self._capacity(request, table.name, _write_units(old, new))
+        returned = request.get("ReturnValues", "NONE")
+        if returned == "ALL_NEW":
+            response["Attributes"] = dict(new)
+        elif returned == "ALL_OLD" and old is not None:
+            response["Attributes"] = dict(old)
+        elif returned in ("UPDATED_NEW", "UPDATED_OLD"):
+            source = new if returned == "UPDATED_NEW" else (old or {})
+            changed = {name for name in {*new, *(old or {})} if (old or {}).get(name) != new.get(name)}
+            response["Attributes"] = {name: source[name] for name in changed if name in source}
+        return response
+
+    def delete_item(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        key = table.key(request["Key"])
+        old = table.get(key)
+        if not self._check(request, old, self._context(request)):
+            raise _conditional_check_failed()
+        table.delete(key)
+        response = self._capacity(request, table.name, _write_units(old))
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            response["Attributes"] = dict(old)
+        return response
+
+    # reads
+
+    @staticmethod
+    def _key_condition(node: tuple, index: SortedIndex, context: Context) -> Tuple[Any, Optional[tuple]]:
+        """Hash key value and range key condition (operator, value, upper) of a KeyConditionExpression"""
+        predicates, pending = [], [node]
+        while pending:
+            current = pending.pop()
+            if current[0] == "and":
+                pending += [current[2], current[1]]
+            else:
+                predicates.append(current)
+
+        partition, condition = MISSING, None
+        for predicate in predicates:
+            if predicate[0] == "compare":
+                _, operator, path, value = predicate
+                name, bounds = context.keys(path)[0], (sortable(context.value(value[1])), None)
+            elif predicate[0] == "between":
+                _, path, low, high = predicate
+                name, operator = context.keys(path)[0], "BETWEEN"
+                bounds = sortable(context.value(low[1])), sortable(context.value(high[1]))
+            elif predicate[0] == "function" and predicate[1] == "begins_with":
+                path, value = predicate[2]
+                name, operator, bounds = context.keys(path)[0], "begins_with", (sortable(context.value(value[1])), None)
+            else:
+                raise ExpressionError("Invalid operator used in KeyConditionExpression")
+
+            if name == index.hash_key and operator == "=":
+                partition = bounds[0]
+            elif name == index.range_key:
+                condition = (operator, *bounds)
+            else:
+                raise ExpressionError(f"Query key condition not supported on attribute {name}")
+        if partition is MISSING:
+            raise ExpressionError("Query condition missed key schema element")
+        return partition, condition
+
+    def _read(
+            self,
+            request: dict,
+            table: MemoryTable,
+            index: SortedIndex,
+            entries: Iterator[Tuple[Any, Entry]],
+    ) -> dict:
+        """Page of a Query or Scan over `entries`: Limit, FilterExpression, Select and projection"""
+        context = self._context(request)
+        limit = request.get("Limit")
+        condition = parse_condition(request["FilterExpression"]) if request.get("FilterExpression") else None
+        count_only = request.get("Select") == "COUNT"
+
+        items, count, scanned, size, last, previous = [], 0, 0, 0, None, None
+        for _, entry in entries:
+            if limit is not None and scanned >= limit:
+                last = previous
+                break
+            item = table.project_index(table.items[entry[1:]], index)
+            scanned += 1
+            size += item_size(item)
+            previous = item
+            if condition is not None and not evaluate_condition(condition, item, context):
+                continue
+            count += 1
+            if not count_only:
+                items.append(self._project(request, item, context))
+
+        response = {"Count": count, "ScannedCount": scanned}
+        if not count_only:
+            response["Items"] = items
+        if last is not None:
+            response["LastEvaluatedKey"] = table.key_attributes(last, None if index is table.primary else index)
+        response.update(self._capacity(request, table.name, _read_units(size, request.get("ConsistentRead"))))
+        return response
+
+    @staticmethod
+    def _start_after(request: dict, table: MemoryTable, index: SortedIndex) -> Optional[Tuple[Any, Entry]]:
+        start = request.get("ExclusiveStartKey")
+        if not start:
+            return None
+        located = index.entry(start, table.key(start))
+        if located is None:
+            raise _validation("The provided starting key is invalid")
+        return located
+
+    def query(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        index = table.index(request.get("IndexName"))
+        context = self._context(request)
+        partition, condition = self._key_condition(parse_condition(request["KeyConditionExpression"]), index, context)
+        start = self._start_after(request, table, index)
+        forward = request.get("ScanIndexForward", True)
+        entries = index.range(partition, condition, forward, start[1] if start else None)
+        return self._read(request, table, index, ((partition, entry) for entry in entries))
+
+    def scan(self, request: dict) -> dict:
+        table = self._table(request["TableName"])
+        index = table.index(request.get("IndexName"))
+        segment, total = request.get("Segment", 0), request.get("TotalSegments", 1)
+        if not 0 <= segment < total:
+            raise _validation("The Segment parameter must be lower than TotalSegments")
+        start = self._start_after(request, table, index)
+
+        def entries() -> Iterator[Tuple[Any, Entry]]:
+            # partitions are split between segments by a hash of their key, and read in key order
+            partitions = sorted(
+                partition for partition in index.partitions
+                if zlib.crc32(str(partition).encode()) % total == segment
+                and (start is None or partition >= start[0])
+            )
+            for partition in partitions:
+                after = start[1] if start is not None and partition == start[0] else None
+                for entry in index.range(partition, None, True, after):
+                    yield partition, entry
+
+        return self._read(request, table, index, entries())
+
+    def batch_get_item(self, request: dict) -> dict:
+        requested = request["RequestItems"]
+        if sum(len(keys["Keys"]) for keys in requested.values()) > BATCH_GET_LIMIT:
+            raise _validation("Too many items requested for the BatchGetItem call")
+        responses, capacity = {}, []
+        for name, keys in requested.items():
+            table = self._table(name)
+            context = self._context(keys)
+            found, size = [], 0
+            for key in keys["Keys"]:
+                item = table.get(table.key(key))
+                if item is not None:
+                    found.append(self._project(keys, item, context))
+                    size += item_size(item)
+            responses[name] = found
+            capacity.append({"TableName": name, "CapacityUnits": _read_units(size, keys.get("ConsistentRead"))})
+        response = {"Responses": responses, "UnprocessedKeys": {}}
+        if request.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            response["ConsumedCapacity"] = capacity
+        return response
+
+    def transact_get_items(self, request: dict) -> dict:
+        responses = []
+        for action in request["TransactItems"]:
+            get = action["Get"]
+            table = self._table(get["TableName"])
+            item = table.get(table.key(get["Key"]))
+            responses.append({"Item": self._project(get, item, self._context(get))} if item is not None else {})
+        return {"Responses": responses}
+
+    # batched and transactional writes
+
+    def batch_write_item(self, request: dict) -> dict:
+        requested = request["RequestItems"]
+        writes = [(name, write) for name, table_writes in requested.items() for write in table_writes]
+        if len(writes) > BATCH_WRITE_LIMIT:
+            raise _validation("Too many items requested for the BatchWriteItem call")
+
+        seen, capacity = set(), {}
+        for name, write in writes:
+            table = self._table(name)
+            item = write["PutRequest"]["Item"] if "PutRequest" in write else write["DeleteRequest"]["Key"]
+            key = (name, table.key(item))
+            if key in seen:
+                raise _validation("Provided list of item keys contains duplicates")
+            seen.add(key)
+
+        for name, write in writes:
+            table = self._table(name)
+            if "PutRequest" in write:
+                item = write["PutRequest"]["Item"]
+                old = table.put(item)
+            else:
+                item, old = None, table.delete(table.key(write["DeleteRequest"]["Key"]))
+            capacity[name] = capacity.get(name, 0.0) + _write_units(old, item)
+
+        response = {"UnprocessedItems": {}}
+        if request.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            response["ConsumedCapacity"] = [{"TableName": name, "CapacityUnits": units} for name, units in capacity.items()]
+        return response
+
+    def transact_write_items(self, request: dict) -> dict:
+        actions = request["TransactItems"]
+        if len(actions) > TRANSACTION_LIMIT:
+            raise _validation(f"Member must have length less than or equal to {TRANSACTION_LIMIT}")
+
+        # every condition is checked against the state before the transaction, then all writes apply
+        writes, reasons, seen, capacity = [], [], set(), {}
+        for action in actions:
+            (kind, operation), = action.items()
+            table = self._table(operation["TableName"])
+            key = table.key(operation["Item"] if kind == "Put" else operation["Key"])
+            if (table.name, key) in seen:
+                raise _validation("Transaction request cannot include multiple operations on one item")
+            seen.add((table.name, key))
+
+            old = table.get(key)
+            context = self._context(operation)
+            if not self._check(operation, old, context):
+                reasons.append({"Code": "ConditionalCheckFailed", "Message": "The conditional request failed"})
+                continue
+            reasons.append({"Code": "None"})
+            if kind == "Put":
+                new = operation["Item"]
+            elif kind == "Update":
+                new = self._updated(table, operation, old, context)
+            elif kind == "Delete":
+                new = None
+            else:
+                continue
+            writes.append((table, key, new))
+            capacity[table.name] = capacity.get(table.name, 0.0) + 2 * _write_units(old, new)
+
+        if any(reason["Code"] != "None" for reason in reasons):
+            codes = ", ".join(reason["Code"] for reason in reasons)
+            raise EngineError(
+                "TransactionCanceledException",
+                f"Transaction cancelled, please refer cancellation reasons for specific reasons [{codes}]",
+                CancellationReasons=reasons,
+            )
+
+        for table, key, new in writes:
+            if new is None:
+                table.delete(key)
+            else:
+                table.put(new)
+
+        response = {}
+        if request.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            response["ConsumedCapacity"] = [{"TableName": name, "CapacityUnits": units} for name, units in capacity.items()]
+        return response
+
+
+_OPERATIONS = {
+    "CreateTable": MemoryDynamoDB.create_table,
+    "DeleteTable": MemoryDynamoDB.delete_table,
+    "DescribeTable": MemoryDynamoDB.describe_table,
+    "ListTables": MemoryDynamoDB.list_tables,
+    "GetItem": MemoryDynamoDB.get_item,
+    "PutItem": MemoryDynamoDB.put_item,
+    "UpdateItem": MemoryDynamoDB.update_item,
+    "DeleteItem": MemoryDynamoDB.delete_item,
+    "Query": MemoryDynamoDB.query,
+    "Scan": MemoryDynamoDB.scan,
+    "BatchGetItem": MemoryDynamoDB.batch_get_item,
+    "BatchWriteItem": MemoryDynamoDB.batch_write_item,
+    "TransactGetItems": MemoryDynamoDB.transact_get_items,
+    "TransactWriteItems": MemoryDynamoDB.transact_write_items,
+}
+
+
+@lru_cache(maxsize=None)
+def get_memory_engine() -> MemoryDynamoDB:
+    """Engine shared by every client of the process, with the service table already created"""
+    engine = MemoryDynamoDB()
+    if ENV.DYNAMO_TABLE:
+        engine.create_table(table_definition(ENV.DYNAMO_TABLE))
+    return engine
@@ -0,0 +1,476 @@
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Condition, key condition, filter, update and projection expressions of the in-memory engine.
+#
+# Expressions are parsed once into tuples (cached by text) and evaluated against items in
+# wire format ({"S": ...}, {"N": "1.5"}, {"M": {...}}, ...), resolving #names and :values
+# per request, so the same expression with different values is only parsed once.
+
+MISSING = object()
+
+
+class ExpressionError(ValueError):
+    """Invalid expression, reported as a ValidationException"""
+
+
+_TOKEN = re.compile(r"\s*(?:(?P<number>\d+)|(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<alias>#[A-Za-z0-9_]+)|"
+                    r"(?P<value>:[A-Za-z0-9_]+)|(?P<op><>|<=|>=|[=<>(),.\[\]+-]))")
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_CONDITION_FUNCTIONS = {"attribute_exists", "attribute_not_exists", "attribute_type", "begins_with", "contains"}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ExpressionError(f"Invalid expression: syntax error near {expression[position:position + 10]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "name" and text.upper() in _KEYWORDS:
+            kind, text = "keyword", text.upper()
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token[0] is None:
+            raise ExpressionError("Invalid expression: unexpected end of expression")
+        self.position += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> None:
+        if not self.accept(text):
+            raise ExpressionError(f"Invalid expression: expected {text!r}, found {self.peek()[1]!r}")
+
+    def done(self) -> None:
+        if self.peek()[0] is not None:
+            raise ExpressionError(f"Invalid expression: unexpected token {self.peek()[1]!r}")
+
+    # operands
+
+    def path(self) -> tuple:
+        kind, text = self.next()
+        if kind not in ("name", "alias"):
+            raise ExpressionError(f"Invalid expression: expected an attribute name, found {text!r}")
+        parts = [text]
+        while True:
+            if self.accept("."):
+                kind, text = self.next()
+                if kind not in ("name", "alias"):
+                    raise ExpressionError(f"Invalid expression: expected an attribute name, found {text!r}")
+                parts.append(text)
+            elif self.accept("["):
+                kind, text = self.next()
+                if kind != "number":
+                    raise ExpressionError(f"Invalid expression: expected a list index, found {text!r}")
+                parts.append(int(text))
+                self.expect("]")
+            else:
+                return ("path", tuple(parts))
+
+    def operand(self) -> tuple:
+        kind, text = self.peek()
+        if kind == "value":
+            self.next()
+            return ("value", text)
+        if kind == "name" and self.peek(1)[1] == "(":
+            self.next()
+            self.expect("(")
+            arguments = [self.update_value()]
+            while self.accept(","):
+                arguments.append(self.update_value())
+            self.expect(")")
+            return ("call", text, tuple(arguments))
+        return self.path()
+
+    def update_value(self) -> tuple:
+        left = self.operand()
+        if self.peek()[1] in ("+", "-"):
+            operator = self.next()[1]
+            return ("arith", operator, left, self.operand())
+        return left
+
+    # conditions
+
+    def condition(self) -> tuple:
+        node = self.conjunction()
+        while self.accept("OR"):
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self) -> tuple:
+        node = self.negation()
+        while self.accept("AND"):
+            node = ("and", node, self.negation())
+        return node
+
+    def negation(self) -> tuple:
+        if self.accept("NOT"):
+            return ("not", self.negation())
+        return self.predicate()
+
+    def predicate(self) -> tuple:
+        if self.accept("("):
+            node = self.condition()
+            self.expect(")")
+            return node
+
+        kind, text = self.peek()
+        if kind == "name" and text in _CONDITION_FUNCTIONS and self.peek(1)[1] == "(":
+            self.next()
+            self.expect("(")
+            arguments = [self.operand()]
+            while self.accept(","):
+                arguments.append(self.operand())
+            self.expect(")")
+            return ("function", text, tuple(arguments))
+
+        left = self.operand()
+        kind, text = self.peek()
+        if text in _COMPARATORS:
+            self.next()
+            return ("compare", text, left, self.operand())
+        if text == "BETWEEN":
+            self.next()
+            low = self.operand()
+            self.expect("AND")
+            return ("between", left, low, self.operand())
+        if text == "IN":
+            self.next()
+            self.expect("(")
+            options = [self.operand()]
+            while self.accept(","):
+                options.append(self.operand())
+            self.expect(")")
+            return ("in", left, tuple(options))
+        raise ExpressionError(f"Invalid expression: expected a comparison, found {text!r}")
+
+    # update expressions
+
+    def update(self) -> Dict[str, list]:
+        clauses: Dict[str, list] = {"SET": [], "REMOVE": [], "ADD": [], "DELETE": []}
+        while self.peek()[0] is not None:
+            kind, clause = self.next()
+            if clause not in clauses:
+                raise ExpressionError(f"Invalid UpdateExpression: unexpected token {clause!r}")
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self.expect("=")
+                    clauses[clause].append((path, self.update_value()))
+                elif clause == "REMOVE":
+                    clauses[clause].append((path, None))
+                else:
+                    clauses[clause].append((path, self.operand()))
+                if not self.accept(","):
+                    break
+        return clauses
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(expression: str) -> tuple:
+    parser = _Parser(expression)
+    node = parser.condition()
+    parser.done()
+    return node
+
+
+@lru_cache(maxsize=1024)
+def parse_update(expression: str) -> Dict[str, list]:
+    return _Parser(expression).update()
+
+
+@lru_cache(maxsize=1024)
+def parse_projection(expression: str) -> Tuple[tuple, ...]:
+    parser = _Parser(expression)
+    paths = [parser.path()]
+    while parser.accept(","):
+        paths.append(parser.path())
+    parser.done()
+    return tuple(paths)
+
+
+# values
+
+
+def sortable(value: dict) -> Any:
+    """Python value ordering a scalar attribute value like DynamoDB does (numbers numerically, strings by code point)"""
+    (kind, raw), = value.items()
+    if kind == "N":
+        return Decimal(raw)
+    if kind in ("S", "B"):
+        return raw
+    raise ExpressionError(f"Invalid key: {kind} attributes cannot be compared")
+
+
+def _normalized(value: dict) -> Any:
+    (kind, raw), = value.items()
+    if kind == "N":
+        return kind, Decimal(raw)
+    if kind == "NS":
+        return kind, frozenset(Decimal(number) for number in raw)
+    if kind in ("SS", "BS"):
+        return kind, frozenset(raw)
+    if kind == "M":
+        return kind, {name: _normalized(member) for name, member in raw.items()}
+    if kind == "L":
+        return kind, [_normalized(member) for member in raw]
+    return kind, raw
+
+
+def equal(left: Any, right: Any) -> bool:
+    if left is MISSING or right is MISSING:
+        return False
+    return _normalized(left) == _normalized(right)
+
+
+def format_number(number: Decimal) -> str:
+    return format(number.normalize(), "f") if number else "0"
+
+
+class Context:
+    """#name and :value substitutions of one request"""
+
+    def __init__(self, names: Optional[Dict[str, str]] = None, values: Optional[Dict[str, dict]] = None):
+        self.names = names or {}
+        self.values = values or {}
+
+    def name(self, part: Any) -> Any:
+        if isinstance(part, str) and part.startswith("#"):
+            if part not in self.names:
+                raise ExpressionError(f"An expression attribute name used in the document path is not defined: {part}")
+            return self.names[part]
+        return part
+
+    def keys(self, path: tuple) -> List[Any]:
+        return [self.name(part) for part in path[1]]
+
+    def value(self, placeholder: str) -> dict:
+        if placeholder not in self.values:
+            raise ExpressionError(f"An expression attribute value used in expression is not defined: {placeholder}")
+        return self.values[placeholder]
+
+
+def get_path(item: dict, keys: List[Any]) -> Any:
+    current: Any = {"M": item}
+    for key in keys:
+        if isinstance(key, int):
+            members = current.get("L") if isinstance(current, dict) else None
+            if members is None or key >= len(members):
+                return MISSING
+            current = members[key]
+        else:
+            members = current.get("M") if isinstance(current, dict) else None
+            if members is None or key not in members:
+                return MISSING
+            current = members[key]
+    return current
+
+
+def _parent(item: dict, keys: List[Any]) -> Tuple[Any, Any]:
+    parent = get_path(item, keys[:-1]) if len(keys) > 1 else {"M": item}
+    if parent is MISSING:
+        raise ExpressionError("The document path provided in the update expression is invalid for update")
+    container = parent.get("L") if isinstance(keys[-1], int) else parent.get("M")
+    if container is None:
+        raise ExpressionError("The document path provided in the update expression is invalid for update")
+    return container, keys[-1]
+
+
+def set_path(item: dict, keys: List[Any], value: dict) -> None:
+    container, key = _parent(item, keys)
+    if isinstance(key, int):
+        if key < len(container):
+            container[key] = value
+        else:
+            container.append(value)
+    else:
+        container[key] = value
+
+
+def remove_path(item: dict, keys: List[Any]) -> None:
+    try:
+        container, key = _parent(item, keys)
+    except ExpressionError:
+        return
+    if isinstance(key, int):
+        if key < len(container):
+            container.pop(key)
+    else:
+        container.pop(key, None)
+
+
+def evaluate_operand(node: tuple, item: dict, context: Context) -> Any:
+    kind = node[0]
+    if kind == "value":
+        return context.value(node[1])
+    if kind == "path":
+        return get_path(item, context.keys(node))
+    if kind == "arith":
+        _, operator, left, right = node
+        left, right = evaluate_operand(left, item, context), evaluate_operand(right, item, context)
+        if left is MISSING or right is MISSING or "N" not in left or "N" not in right:
+            raise ExpressionError("An operand in the update expression has an incorrect data type")
+        result = Decimal(left["N"]) + Decimal(right["N"]) if operator == "+" else Decimal(left["N"]) - Decimal(right["N"])
+        return {"N": format_number(result)}
+
+    _, function, arguments = node
+    if function == "if_not_exists":
+        current = evaluate_operand(arguments[0], item, context)
+        return evaluate_operand(arguments[1], item, context) if current is MISSING else current
+    if function == "list_append":
+        left, right = (evaluate_operand(argument, item, context) for argument in arguments)
+        if left is MISSING or right is MISSING or "L" not in left or "L" not in right:
+            raise ExpressionError("An operand in the update expression has an incorrect data type")
+        return {"L": [*left["L"], *right["L"]]}
+    if function == "size":
+        value = evaluate_operand(arguments[0], item, context)
+        if value is MISSING:
+            return MISSING
+        (kind, raw), = value.items()
+        size = len(raw.encode()) if kind == "S" else len(raw)
+        return {"N": str(size)}
+    raise ExpressionError(f"Invalid function name; function: {function}")
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    if operator == "=":
+        return equal(left, right)
+    if operator == "<>":
+        return not equal(left, right)
+    if left is MISSING or right is MISSING:
+        return False
+    (left_kind, _), = left.items()
+    (right_kind, _), = right.items()
+    if left_kind != right_kind or left_kind not in ("S", "N", "B"):
+        return False
+    left, right = sortable(left), sortable(right)
+    if operator == "<":
+        return left < right
+    if operator == "<=":
+        return left <= right
+    if operator == ">":
+        return left > right
+    return left >= right
+
+
+def evaluate_condition(node: tuple, item: dict, context: Context) -> bool:
+    kind = node[0]
+    if kind == "and":
+        return evaluate_condition(node[1], item, context) and evaluate_condition(node[2], item, context)
+    if kind == "or":
+        return evaluate_condition(node[1], item, context) or evaluate_condition(node[2], item, context)
+    if kind == "not":
+        return not evaluate_condition(node[1], item, context)
+    if kind == "compare":
+        _, operator, left, right = node
+        return _compare(operator, evaluate_operand(left, item, context), evaluate_operand(right, item, context))
+    if kind == "between":
+        value = evaluate_operand(node[1], item, context)
+        return (_compare(">=", value, evaluate_operand(node[2], item, context))
+                and _compare("<=", value, evaluate_operand(node[3], item, context)))
+    if kind == "in":
+        value = evaluate_operand(node[1], item, context)
+        return any(equal(value, evaluate_operand(option, item, context)) for option in node[2])
+
+    _, function, arguments = node
+    value = evaluate_operand(arguments[0], item, context)
+    if function == "attribute_exists":
+        return value is not MISSING
+    if function == "attribute_not_exists":
+        return value is MISSING
+    if value is MISSING:
+        return False
+    argument = evaluate_operand(arguments[1], item, context)
+    if function == "attribute_type":
+        return argument.get("S") in value
+    if function == "begins_with":
+        (kind, raw), = value.items()
+        return kind in ("S", "B") and kind in argument and raw.startswith(argument[kind])
+    # contains
+    (kind, raw), = value.items()
+    if kind == "S":
+        return "S" in argument and argument["S"] in raw
+    if kind == "L":
+        return any(equal(argument, member) for member in raw)
+    if kind in ("SS", "NS", "BS"):
+        return any(equal(argument, {kind[0]: member}) for member in raw)
+    return False
+
+
+def apply_update(item: dict, clauses: Dict[str, list], context: Context) -> dict:
+    """New item after the update (operands are evaluated against the item as it was before)"""
+    updated = dict(item)
+    changes = [(path, evaluate_operand(value, item, context)) for path, value in clauses["SET"]]
+    for path, value in changes:
+        set_path(updated, context.keys(path), value)
+
+    for path, _ in clauses["REMOVE"]:
+        remove_path(updated, context.keys(path))
+
+    for path, operand in clauses["ADD"]:
+        keys, delta = context.keys(path), evaluate_operand(operand, item, context)
+        current = get_path(updated, keys)
+        (kind, raw), = delta.items()
+        if kind == "N":
+            base = Decimal(current["N"]) if current is not MISSING and "N" in current else Decimal(0)
+            set_path(updated, keys, {"N": format_number(base + Decimal(raw))})
+        elif kind in ("SS", "NS", "BS"):
+            members = current.get(kind, []) if current is not MISSING else []
+            set_path(updated, keys, {kind: [*members, *[member for member in raw if member not in members]]})
+        else:
+            raise ExpressionError("Incorrect operand type for operator or function; operator: ADD")
+
+    for path, operand in clauses["DELETE"]:
+        keys, delta = context.keys(path), evaluate_operand(operand, item, context)
+        current = get_path(updated, keys)
+        (kind, raw), = delta.items()
+        if current is not MISSING and kind in current:
+            remaining = [member for member in current[kind] if member not in raw]
+            if remaining:
+                set_path(updated, keys, {kind: remaining})
+            else:
+                remove_path(updated, keys)
+    return updated
+
+
+def project(item: dict, paths: Tuple[tuple, ...], context: Context) -> dict:
+    """Copy of the item with only the projected attributes"""
+    projected: dict = {}
+    for path in paths:
+        keys = context.keys(path)
+        value = get_path(item, keys)
+        if value is MISSING:
+            continue
+        if len(keys) == 1 or any(isinstance(key, int) for key in keys):
+            # list elements are not picked one by one: the whole top-level attribute is returned
+            projected[keys[0]] = item[keys[0]]
+            continue
+        target = projected
+        for key in keys[:-1]:
+            target = target.setdefault(key, {"M": {}})["M"]
+        target[keys[-1]] = value
+    return projected
@@ -0,0 +1,187 @@
+import bisect
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.database.memory.expressions import ExpressionError, sortable
+
+# An index entry is (range value, table hash value, table range value): sorted by the index range
+# key, ties broken by the table key, so every entry is unique and positions are stable for paging.
+Entry = Tuple[Any, Any, Any]
+ItemKey = Tuple[Any, Any]
+
+# Stand-in range value of indexes without a range key
+_NO_RANGE = 0
+
+
+def _successor(prefix: Any) -> Any:
+    """Smallest value greater than every value starting with `prefix`"""
+    if isinstance(prefix, bytes):
+        return prefix[:-1] + bytes([prefix[-1] + 1]) if prefix and prefix[-1] < 255 else None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else None
+
+
+class SortedIndex:
+    """Items of a table or secondary index grouped by hash key, each group sorted by range key"""
+
+    def __init__(self, name: Optional[str], hash_key: str, range_key: Optional[str], projection: Optional[dict] = None):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.projection = projection or {"ProjectionType": "ALL"}
+        self.partitions: Dict[Any, List[Entry]] = {}
+
+    def entry(self, item: dict, item_key: ItemKey) -> Optional[Tuple[Any, Entry]]:
+        """Partition and entry of the item, or None when it lacks the index keys (sparse index)"""
+        if self.hash_key not in item or (self.range_key and self.range_key not in item):
+            return None
+        range_value = sortable(item[self.range_key]) if self.range_key else _NO_RANGE
+        return sortable(item[self.hash_key]), (range_value, *item_key)
+
+    def add(self, item: dict, item_key: ItemKey) -> None:
+        located = self.entry(item, item_key)
+        if located:
+            partition, entry = located
+            bisect.insort(self.partitions.setdefault(partition, []), entry)
+
+    def remove(self, item: dict, item_key: ItemKey) -> None:
+        located = self.entry(item, item_key)
+        if not located:
+            return
+        partition, entry = located
+        entries = self.partitions.get(partition, [])
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            entries.pop(position)
+            if not entries:
+                del self.partitions[partition]
+
+    def range(
+            self,
+            partition: Any,
+            condition: Optional[Tuple[str, Any, Any]],
+            forward: bool,
+            start_after: Optional[Entry],
+    ) -> Iterator[Entry]:
+        """Entries of the partition matching the range key condition, in order, after `start_after`"""
+        entries = self.partitions.get(partition, [])
+        low, high = 0, len(entries)
+        if condition:
+            operator, value, upper = condition
+            first = lambda bound: bisect.bisect_left(entries, bound, key=lambda entry: entry[0])
+            after = lambda bound: bisect.bisect_right(entries, bound, key=lambda entry: entry[0])
+            if operator == "=":
+                low, high = first(value), after(value)
+            elif operator == "<":
+                high = first(value)
+            elif operator == "<=":
+                high = after(value)
+            elif operator == ">":
+                low = after(value)
+            elif operator == ">=":
+                low = first(value)
+            elif operator == "BETWEEN":
+                low, high = first(value), after(upper)
+            elif operator == "begins_with":
+                successor = _successor(value)
+                low = first(value)
+                high = first(successor) if successor is not None else len(entries)
+        if start_after is not None:
+            if forward:
+                low = max(low, bisect.bisect_right(entries, start_after))
+            else:
+                high = min(high, bisect.bisect_left(entries, start_after))
+        indexes = range(low, high) if forward else range(high - 1, low - 1, -1)
+        return (entries[index] for index in indexes)
+
+
+class MemoryTable:
+    """One table: items by primary key plus a sorted index over the table key and each GSI/LSI"""
+
+    def __init__(self, definition: dict):
+        self.name = definition["TableName"]
+        self.definition = definition
+        self.created_at = datetime.now(tz=timezone.utc)
+        key_schema = {key["KeyType"]: key["AttributeName"] for key in definition["KeySchema"]}
+        self.hash_key, self.range_key = key_schema["HASH"], key_schema.get("RANGE")
+        self.items: Dict[ItemKey, dict] = {}
+        self.primary = SortedIndex(None, self.hash_key, self.range_key)
+        self.indexes: Dict[str, SortedIndex] = {}
+        for index in [*definition.get("GlobalSecondaryIndexes", []), *definition.get("LocalSecondaryIndexes", [])]:
+            schema = {key["KeyType"]: key["AttributeName"] for key in index["KeySchema"]}
+            self.indexes[index["IndexName"]] = SortedIndex(
+                index["IndexName"], schema["HASH"], schema.get("RANGE"), index.get("Projection"),
+            )
+
+    def key(self, item: dict) -> ItemKey:
+        """Primary key of an item (or of a Key map), validated against the key schema"""
+        names = [self.hash_key] + ([self.range_key] if self.range_key else [])
+        for name in names:
+            if name not in item:
+                raise ExpressionError(f"One or more parameter values were invalid: Missing the key {name} in the item")
+        return sortable(item[self.hash_key]), sortable(item[self.range_key]) if self.range_key else _NO_RANGE
+
+    def key_attributes(self, item: dict, index: Optional[SortedIndex] = None) -> dict:
+        names = {self.hash_key, self.range_key}
+        if index is not None:
+            names |= {index.hash_key, index.range_key}
+        return {name: item[name] for name in names if name and name in item}
+
+    def get(self, key: ItemKey) -> Optional[dict]:
+        return self.items.get(key)
+
+    def put(self, item: dict) -> Optional[dict]:
+        """Store the item, replacing any item with the same key; returns the replaced item"""
+        key = self.key(item)
+        old = self.items.get(key)
+        if old is not None:
+            self._unindex(old, key)
+        self.items[key] = item
+        self.primary.add(item, key)
+        for index in self.indexes.values():
+            index.add(item, key)
+        return old
+
+    def delete(self, key: ItemKey) -> Optional[dict]:
+        old = self.items.pop(key, None)
+        if old is not None:
+            self._unindex(old, key)
+        return old
+
+    def _unindex(self, item: dict, key: ItemKey) -> None:
+        self.primary.remove(item, key)
+        for index in self.indexes.values():
+            index.remove(item, key)
+
+    def index(self, name: Optional[str]) -> SortedIndex:
+        if name is None:
+            return self.primary
+        if name not in self.indexes:
+            raise ExpressionError(f"The table does not have the specified index: {name}")
+        return self.indexes[name]
+
+    def project_index(self, item: dict, index: SortedIndex) -> dict:
+        """Item as stored in the index (ALL, KEYS_ONLY or INCLUDE projection)"""
+        projection = index.projection
+        if index is self.primary or projection["ProjectionType"] == "ALL":
+            return item
+        projected = self.key_attributes(item, index)
+        if projection["ProjectionType"] == "INCLUDE":
+            projected.update({
+                name: item[name] for name in projection.get("NonKeyAttributes", []) if name in item
+            })
+        return projected
+
+    def describe(self) -> dict:
+        description = {
+            **{name: value for name, value in self.definition.items() if name != "BillingMode"},
+            "TableStatus": "ACTIVE",
+            "CreationDateTime": self.created_at,
+            "ItemCount": len(self.items),
+            "TableSizeBytes": 0,
+            "TableArn": f"arn:aws:dynamodb:local:000000000000:table/{self.name}",
+        }
+        if "GlobalSecondaryIndexes" in self.definition:
+            description["GlobalSecondaryIndexes"] = [
+                {**index, "IndexStatus": "ACTIVE"} for index in self.definition["GlobalSecondaryIndexes"]
+            ]
+        return description
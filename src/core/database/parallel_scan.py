@@ -0,0 +1,230 @@
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Full-table jobs (clearing a table, rebuilding counters, backfills, exports) scan with
+# ParallelScan instead of one sequential table.scan(): the table is split into Segment /
+# TotalSegments parts read concurrently, every segment is followed through LastEvaluatedKey
+# to the end, and an optional read capacity budget keeps the job from starving the API.
+
+Page = List[dict]
+
+
+@dataclass
+class ScanProgress:
+    """Totals of a scan so far"""
+    total_segments: int
+    segments_done: int = 0
+    pages: int = 0
+    items: int = 0  # returned, after FilterExpression
+    scanned_items: int = 0  # read, before FilterExpression
+    capacity_units: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def items_per_second(self) -> float:
+        return self.scanned_items / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.segments_done}/{self.total_segments} segments, {self.scanned_items} items scanned "
+            f"({self.items} matched), {self.capacity_units:g} RCU, {self.items_per_second:.0f} items/s, "
+            f"{self.elapsed:.1f}s"
+        )
+
+
+class CapacityLimiter:
+    """
+    Token bucket of read capacity units shared by the segment workers.
+
+    DynamoDB only reports what a page cost after reading it, so pages are paid
+    for afterwards and a worker waits before its next page while the bucket is
+    in debt. At most one second of capacity is banked.
+    """
+
+    def __init__(self, units_per_second: float):
+        self.rate = units_per_second
+        self.available = units_per_second
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.rate, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            with self._lock:
+                self._refill()
+                if self.available > 0:
+                    return
+                wait = -self.available / self.rate
+            stop.wait(min(wait, 1.0) or 0.01)
+
+    def consume(self, units: float) -> None:
+        with self._lock:
+            self._refill()
+            self.available -= units
+
+
+class ParallelScan:
+    """
+    Parallel segmented scan of a table (a boto3 Table resource).
+
+    Iterate it to get the items as a stream, consumed on the calling thread while
+    the segments are read concurrently (pages are buffered up to `buffer_pages`),
+    or call `run(callback)` to handle every page on the worker that read it.
+    `scan_kwargs` (FilterExpression, ProjectionExpression, IndexName, ...) go to
+    every Scan call. With `max_read_units` the scan consumes at most that many
+    read capacity units per second overall; `progress` is called with a
+    ScanProgress every `progress_interval` seconds and once at the end.
+    """
+
+    def __init__(
+            self,
+            table,
+            segments: int = 8,
+            max_read_units: Optional[float] = None,
+            page_size: Optional[int] = None,
+            progress: Optional[Callable[[ScanProgress], None]] = None,
+            progress_interval: float = 10.0,
+            buffer_pages: int = 32,
+            **scan_kwargs: Any,
+    ):
+        if segments < 1:
+            raise ValueError("segments must be at least 1")
+        self.table = table
+        self.segments = segments
+        self.limiter = CapacityLimiter(max_read_units) if max_read_units else None
+        self.page_size = page_size
+        self.progress_callback = progress
+        self.progress_interval = progress_interval
+        self.buffer_pages = buffer_pages
+        self.scan_kwargs = scan_kwargs
+        self.progress = ScanProgress(total_segments=segments)
+        self._lock = threading.Lock()
+        self._reported = 0.0
+
+    def _report(self, force: bool = False) -> None:
+        if not self.progress_callback:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._reported < self.progress_interval:
+                return
+            self._reported = now
+            self.progress_callback(self.progress)
+
+    def _scan_segment(self, segment: int, handle: Callable[[Page], None], stop: threading.Event) -> None:
+        kwargs: Dict[str, Any] = {
+            **self.scan_kwargs,
+            "Segment": segment,
+            "TotalSegments": self.segments,
+            "ReturnConsumedCapacity": "TOTAL",
+        }
+        if self.page_size:
+            kwargs["Limit"] = self.page_size
+
+        while True:
+            if stop.is_set():
+                return
+            if self.limiter:
+                self.limiter.acquire(stop)
+            response = self.table.scan(**kwargs)
+            units = response.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0)
+            if self.limiter:
+                self.limiter.consume(units)
+
+            items = response.get("Items", [])
+            with self._lock:
+                self.progress.pages += 1
+                self.progress.items += len(items)
+                self.progress.scanned_items += response.get("ScannedCount", len(items))
+                self.progress.capacity_units += units
+            if items:
+                handle(items)
+            self._report()
+
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        with self._lock:
+            self.progress.segments_done += 1
+
+    def run(self, callback: Callable[[Page], None]) -> ScanProgress:
+        """Scan the whole table calling `callback` with each page, on the worker threads (it must be thread-safe)"""
+        stop = threading.Event()
+
+        def worker(segment: int) -> None:
+            try:
+                self._scan_segment(segment, callback, stop)
+            except BaseException:
+                stop.set()  # fail fast: the other segments stop after their current page
+                raise
+
+        with ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="scan") as executor:
+            futures = [executor.submit(worker, segment) for segment in range(self.segments)]
+            for future in futures:
+                future.result()
+        self._report(force=True)
+        return self.progress
+
+    def pages(self) -> Iterator[Page]:
+        """Pages as they are read, from every segment"""
+        pages: "queue.Queue[Optional[Page]]" = queue.Queue(maxsize=self.buffer_pages)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def put(page: Optional[Page]) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker(segment: int) -> None:
+            try:
+                self._scan_segment(segment, put, stop)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                put(None)
+
+        executor = ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="scan")
+        for segment in range(self.segments):
+            executor.submit(worker, segment)
+        try:
+            running = self.segments
+            while running:
+                try:
+                    page = pages.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():  # a segment failed
+                        break
+                    continue
+                if page is None:
+                    running -= 1
+                else:
+                    yield page
+            if errors:
+                raise errors[0]
+            self._report(force=True)
+        finally:
+            # Also reached when the consumer stops early: release workers blocked on a full buffer
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def __iter__(self) -> Iterator[dict]:
+        for page in self.pages():
+            yield from page
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pytz import UTC
+
+from core.config.env import ENV
+from core.database.keys import EXAM_COUNTER_PK, EXAM_COUNTER_SK, EXAM_DAY_COUNTER_PK
+
+COUNTER_FIELDS = ("total", "approved", "pending")
+
+
+def day_bucket(moment: datetime) -> int:
+    """Sort key of the day counter holding `moment` (UTC), e.g. 20240131"""
+    return int(moment.astimezone(UTC).strftime("%Y%m%d"))
+
+
+def counter_keys(made_at: datetime) -> List[Dict[str, object]]:
+    """Keys of the counter items an exam made at `made_at` contributes to"""
+    return [
+        {"PK": EXAM_COUNTER_PK, "SK": EXAM_COUNTER_SK},
+        {"PK": EXAM_DAY_COUNTER_PK, "SK": day_bucket(made_at)},
+    ]
+
+
+def counter_update(key: Dict[str, object], total: int = 0, approved: int = 0, pending: int = 0) -> dict:
+    """`UpdateItem` arguments atomically adding the deltas to one counter item"""
+    deltas = {"total": total, "approved": approved, "pending": pending}
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    return {
+        "TableName": ENV.DYNAMO_TABLE,
+        "Key": key,
+        "UpdateExpression": "ADD " + ", ".join(f"#{field} :{field}" for field in deltas),
+        "ExpressionAttributeNames": {f"#{field}": field for field in deltas},
+        "ExpressionAttributeValues": {f":{field}": delta for field, delta in deltas.items()},
+    }
+
+
+def counter_updates(made_at: datetime, total: int = 0, approved: int = 0, pending: int = 0) -> List[dict]:
+    """`TransactWriteItems` entries atomically adding the deltas to the global and day counters"""
+    return [
+        {"Update": counter_update(key, total=total, approved=approved, pending=pending)}
+        for key in counter_keys(made_at)
+    ]
+
+
+def sum_counters(items: List[dict]) -> Dict[str, int]:
+    totals = {field: 0 for field in COUNTER_FIELDS}
+    for item in items:
+        for field in COUNTER_FIELDS:
+            totals[field] += int(item.get(field, 0))
+    return totals
+
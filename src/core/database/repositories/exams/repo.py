@@ -1,135 +1,571 @@
+import logging
+from datetime import datetime
 from typing import Optional, Tuple, Literal, List
 
+from pytz import UTC
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr, Key
+
+from core.config.env import ENV
 from core.database.database import Database
+from core.database.decoder import decode_exam, decode_exam_summary
+from core.database.batch import batch_get_items
+from core.entities import EcgExam, EcgExamSummary, EcgReport, EcgReportStatus
+from core.database.keys import (
+    exam_pk,
+    exam_index,
+    exam_status_pk,
+    sibling_sk,
+    REPORT_ENTITY,
+    APPROVAL_ENTITY,
+    EXAM_HEADER_SK,
+    EXAM_COUNTER_PK,
+    EXAM_COUNTER_SK,
+    EXAM_DAY_COUNTER_PK,
+)
+from core.helpers.pagination import encode_cursor, decode_cursor
+from core.database.retry import is_conflict, is_transaction_conflict, failed_conditions, backoff, version_condition
+from core.helpers.transform import date_range_to_timestamps, number_to_decimal
 from core.database.repositories.exams.repo_interface import IExamRepo
-from core.entities import EcgExam, EcgReport
+from core.database.repositories.exams.counters import counter_updates, day_bucket, sum_counters
+from core.infra.storage import FileStorage
+from core.infra.metrics import timed_repository
+
+logger = logging.getLogger(__name__)
 
 
+@timed_repository
 class ExamRepo(IExamRepo):
     def __init__(self, db: Database):
         self.db = db
-        self.dynamo = db.dynamodb
-
-    def get_exam_by_id(self, exam_id: str) -> Optional[EcgExam]:
-        """Get exam by ID"""
-        exam = self.dynamo.get_item({"exam_id": exam_id})
-        if exam:
-            exam = self.db.deserialize(exam)
-            return EcgExam.from_dynamo(exam)
+        self.table = db.table
+
+    @staticmethod
+    def _listing_query(
+            approved: Optional[bool],
+            date_range: Optional[Tuple[str, str]],
+            summary: bool = False,
+    ) -> Tuple[dict, str]:
+        """Query arguments selecting exams by approval state and `made_at` range, plus the listing scope"""
+        index_name, (pk_name, pk_value), sk_name = exam_index(approved, summary)
+        key_condition = f"{pk_name} = :pk"
+        values = {":pk": pk_value}
+        if date_range:
+            key_condition += f" AND {sk_name} BETWEEN :start_at AND :end_at"
+            values[":start_at"], values[":end_at"] = date_range_to_timestamps(date_range)
+
+        scope = f"{index_name}:{pk_value}:{date_range[0] if date_range else ''}:{date_range[1] if date_range else ''}"
+        return {
+            "TableName": ENV.DYNAMO_TABLE,
+            "IndexName": index_name,
+            "KeyConditionExpression": key_condition,
+            "ExpressionAttributeValues": Database.serialize(values),
+        }, scope
+
+    @staticmethod
+    def _key(exam_id: str) -> dict:
+        return {"PK": exam_pk(exam_id), "SK": EXAM_HEADER_SK}
+
+    def _get_exam_state(self, exam_id: str) -> Optional[dict]:
+        """made_at, approval state, version and principal report date of an exam, without reading its reports"""
+        return self.table.get_item(
+            Key=self._key(exam_id),
+            ProjectionExpression="made_at, approved, #version, principal_report.created_at",
+            ExpressionAttributeNames={"#version": "version"},
+            ConsistentRead=True,
+        ).get("Item")
+
+    @staticmethod
+    def _with_geometry(reports: List[EcgReport]) -> List[EcgReport]:
+        """Replace client-supplied bbox/area with values computed from the polygons, rejecting invalid ones"""
+        segmented = [report for report in reports if report and report.report_segmentation]
+        if not segmented:
+            return reports
+
+        # numpy is only needed by writes with segmentations, so reads do not pay for importing it
+        from core.helpers.geometry import segmentation_metrics
+
+        metrics = segmentation_metrics([report.report_segmentation.segmentation for report in segmented])
+        if not metrics.valid.all():
+            raise ValueError("Invalid segmentation polygon")
+
+        computed = {}
+        for report, bbox, area in zip(segmented, metrics.bbox.tolist(), metrics.area.tolist()):
+            segmentation = report.report_segmentation.model_copy(update={"bbox": bbox, "area": area})
+            computed[id(report)] = report.model_copy(update={"report_segmentation": segmentation})
+        return [computed.get(id(report), report) for report in reports]
+
+    @staticmethod
+    def _put_new(items: List[dict]) -> List[dict]:
+        """`TransactWriteItems` entries creating sibling items, refusing to overwrite"""
+        return [
+            {"Put": {"TableName": ENV.DYNAMO_TABLE, "Item": item, "ConditionExpression": "attribute_not_exists(SK)"}}
+            for item in items
+        ]
+
+    @staticmethod
+    def _put_sibling(item: dict) -> dict:
+        """`TransactWriteItems` entry upserting a report or approval, refusing to overwrite another sibling"""
+        # Only the same report (same author) or an approval of the same report may share the sort key
+        same = "created_by.email" if item["entity"] == REPORT_ENTITY else "report_sk"
+        value = item["created_by"]["email"] if item["entity"] == REPORT_ENTITY else item["report_sk"]
+        return {
+            "Put": {
+                "TableName": ENV.DYNAMO_TABLE,
+                "Item": item,
+                "ConditionExpression": f"attribute_not_exists(SK) OR (entity = :entity AND {same} = :same)",
+                "ExpressionAttributeValues": {":entity": item["entity"], ":same": value},
+            }
+        }
+
+    def _report_approvals(self, exam_id: str, report_sk: int) -> List[EcgReportStatus]:
+        """Approvals stored as siblings of one report"""
+        query = {
+            "KeyConditionExpression": Key("PK").eq(exam_pk(exam_id)) & Key("SK").gt(EXAM_HEADER_SK),
+            "FilterExpression": Attr("entity").eq(APPROVAL_ENTITY) & Attr("report_sk").eq(report_sk),
+            "ConsistentRead": True,
+        }
+        approves = []
+        while True:
+            response = self.table.query(**query)
+            approves += [EcgReportStatus.from_dynamo(item) for item in response.get("Items", [])]
+            if "LastEvaluatedKey" not in response:
+                return approves
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_exam_by_id(self, exam_id: str, full: bool = False) -> Optional[EcgExam]:
+        """Get exam by ID (header and principal report only, unless `full` also loads the report history)"""
+        if not full:
+            exam = self.db.wire_client.get_item(
+                TableName=ENV.DYNAMO_TABLE,
+                Key=self.db.serialize(self._key(exam_id)),
+            ).get("Item")
+            if exam:
+                return decode_exam(exam)
+            return None
+
+        query = {
+            "TableName": ENV.DYNAMO_TABLE,
+            "KeyConditionExpression": "PK = :pk",
+            "ExpressionAttributeValues": {":pk": {"S": exam_pk(exam_id)}},
+        }
+        items = []
+        while True:
+            response = self.db.wire_client.query(**query)
+            items += response.get("Items", [])
+            if "LastEvaluatedKey" not in response:
+                break
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        if items:
+            return decode_exam(items)
         return None
 
+    def get_exams_by_ids(
+            self,
+            exam_ids: List[str],
+            projection: Optional[List[str]] = None,
+    ) -> List[Optional[EcgExam]]:
+        """Get many exams at once, in the order of `exam_ids` (None where missing; only `id` and `projection` set)"""
+        unique_ids = list(dict.fromkeys(exam_ids))  # BatchGetItem rejects duplicated keys
+        keys = [self.db.serialize(self._key(exam_id)) for exam_id in unique_ids]
+        if projection:
+            projection = list(dict.fromkeys(["PK", *projection]))
+
+        # Errors propagate: answering "missing" for exams that could not be read would turn them into 404s
+        items = batch_get_items(self.db.wire_client, ENV.DYNAMO_TABLE, keys, projection)
+        found = {exam.id: exam for exam in map(decode_exam, items)}
+        return [found.get(exam_id) for exam_id in exam_ids]
+
     def create_exam(self, exam: EcgExam) -> bool:
         """Create a new exam"""
         try:
-            exam = self.db.serialize(exam.to_dynamo())
-            self.dynamo.put_item(exam)
-            return True
+            principal_report, *reports = self._with_geometry([exam.principal_report, *exam.reports])
+            exam = exam.model_copy(update={"principal_report": principal_report, "reports": reports})
+            header, *siblings = exam.to_dynamo_items()
+            transaction = [
+                {
+                    "Put": {
+                        "TableName": ENV.DYNAMO_TABLE,
+                        "Item": header,
+                        "ConditionExpression": "attribute_not_exists(PK)",
+                    }
+                },
+                *self._put_new(siblings),
+                *counter_updates(exam.made_at, total=1, approved=int(exam.approved), pending=int(not exam.approved)),
+            ]
+            for attempt in range(ENV.DYNAMO_CONFLICT_RETRIES + 1):
+                try:
+                    self.db.client.transact_write_items(TransactItems=transaction)
+                    return True
+                except ClientError as e:
+                    # Every create also writes the shared counter items, so concurrent creates cancel each other
+                    if not is_transaction_conflict(e):
+                        raise
+                    backoff(attempt)
+            return False
         except Exception as e:
-            print(f"Error creating exam: {e}")
+            logger.error(f"Error creating exam: {e}")
             return False
 
     def update_exam(self, exam: EcgExam) -> bool:
-        """Update an existing exam"""
+        """Update the file and patient data of an exam (made_at, approval state and reports are not changed here)"""
         try:
-            self.dynamo.update_item(
-                key={"exam_id": exam.exam_id},
-                update_expression="SET #status = :status",
-                expression_attribute_names={"#status": "status"},
-                expression_attribute_values={":status": exam.status}
+            # Only the attributes owned by this method: a whole-header put would race approvals and report writes,
+            # and made_at cannot move once the counters are bucketed by it
+            values = {
+                ":file_path": exam.file_path,
+                ":gender": exam.gender.value,
+                ":birth_date": exam.birth_date,
+                ":amplitude": exam.amplitude,
+                ":speed": exam.speed,
+                ":one": 1,
+            }
+            if exam.version:
+                values[":version"] = exam.version
+            self.table.update_item(
+                Key=self._key(exam.id),
+                UpdateExpression=(
+                    "SET file_path = :file_path, gender = :gender, birth_date = :birth_date, "
+                    "amplitude = :amplitude, speed = :speed ADD #version :one"
+                ),
+                ConditionExpression=f"attribute_exists(PK) AND {version_condition(exam.version)}",
+                ExpressionAttributeNames={"#version": "version"},
+                ExpressionAttributeValues=values,
             )
+            exam.version += 1
             return True
         except Exception as e:
-            print(f"Error updating exam: {e}")
+            logger.error(f"Error updating exam: {e}")
             return False
 
     def delete_exam(self, exam_id: str) -> bool:
         """Delete an exam by ID"""
         try:
-            self.dynamo.delete_item({"exam_id": exam_id})
+            key = self._key(exam_id)
+            for attempt in range(ENV.DYNAMO_CONFLICT_RETRIES + 1):
+                exam = self._get_exam_state(exam_id)
+                if not exam:
+                    return False
+
+                approved = bool(exam["approved"])
+                made_at = datetime.fromtimestamp(float(exam["made_at"]), tz=UTC)
+                try:
+                    self.db.client.transact_write_items(TransactItems=[
+                        {
+                            "Delete": {
+                                "TableName": ENV.DYNAMO_TABLE,
+                                "Key": key,
+                                "ConditionExpression": "approved = :approved",
+                                "ExpressionAttributeValues": {":approved": approved},
+                            }
+                        },
+                        *counter_updates(made_at, total=-1, approved=-int(approved), pending=-int(not approved)),
+                    ])
+                    break
+                except ClientError as e:
+                    # Approved since it was read, or raced another write of the counter items
+                    if not is_conflict(e):
+                        raise
+                    backoff(attempt)
+            else:
+                return False
+            # Download URLs issued for the exam must not outlive it
+            FileStorage.url_cache.invalidate(exam_id)
+
+            # Reports and approvals are only reachable through the header, so they go after it
+            query = {
+                "KeyConditionExpression": Key("PK").eq(key["PK"]) & Key("SK").gt(EXAM_HEADER_SK),
+                "ProjectionExpression": "PK, SK",
+            }
+            with self.table.batch_writer() as batch:
+                while True:
+                    response = self.table.query(**query)
+                    for item in response.get("Items", []):
+                        batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
             return True
         except Exception as e:
-            print(f"Error deleting exam: {e}")
+            logger.error(f"Error deleting exam: {e}")
             return False
 
     def check_if_exam_is_approved(self, exam_id: str) -> bool:
         """Check if an exam is approved"""
         try:
-            exam = self.get_exam_by_id(exam_id)
-            return exam.approved if exam else False
+            exam = self._get_exam_state(exam_id)
+            return bool(exam["approved"]) if exam else False
         except Exception as e:
-            print(f"Error checking if exam is approved: {e}")
+            logger.error(f"Error checking if exam is approved: {e}")
             return False
 
-    def approve_exam(self, exam_id: str, report: EcgReport) -> bool:
-        """Approve an exam"""
+    def _write_approval(self, exam_id: str, report: EcgReport, state: dict, merge: bool) -> None:
+        report_items = report.to_dynamo_items(exam_id)
+        if merge:
+            # The header copy of the principal report must list the approvals already stored for it
+            report_sk = sibling_sk(REPORT_ENTITY, report.created_at)
+            known = {sibling_sk(APPROVAL_ENTITY, approve.created_at) for approve in report.approves}
+            stored = [
+                approve for approve in self._report_approvals(exam_id, report_sk)
+                if sibling_sk(APPROVAL_ENTITY, approve.created_at) not in known
+            ]
+            if stored:
+                approves = sorted([*report.approves, *stored], key=lambda approve: approve.created_at)
+                report = report.model_copy(update={"approves": approves})
+            # The approved report may already exist as a sibling (created earlier), so it is upserted
+            siblings = list(map(self._put_sibling, report_items))
+        else:
+            # A report stored only now cannot have approvals yet: nothing to merge, but it must really be new
+            siblings = self._put_new(report_items)
+
+        approved = bool(state["approved"])
+        version = state["version"]
+        values = {
+            ":approved": True,
+            ":was_approved": approved,
+            ":made_at": state["made_at"],
+            ":approved_at": number_to_decimal(report.created_at.timestamp()),
+            ":report": number_to_decimal(report.to_dynamo()),
+            ":diagnosis": report.report.value,
+            ":status_pk": exam_status_pk(True),
+            ":one": 1,
+        }
+        # made_at picks the day counter and the approval state whether the counters move, so both are checked
+        condition = "attribute_exists(PK) AND made_at = :made_at AND approved = :was_approved"
+        if version is not None:
+            condition += f" AND {version_condition(version)}"
+            if version:
+                values[":version"] = version
+        update = {
+            "TableName": ENV.DYNAMO_TABLE,
+            "Key": self._key(exam_id),
+            "UpdateExpression": (
+                "SET approved = :approved, approved_at = :approved_at, principal_report = :report, "
+                "principal_diagnosis = :diagnosis, GSI1PK = :status_pk ADD #version :one"
+            ),
+            "ConditionExpression": condition,
+            "ExpressionAttributeNames": {"#version": "version"},
+            "ExpressionAttributeValues": values,
+        }
+
+        transaction = [{"Update": update}, *siblings]
+        if not approved:
+            # The approval condition guarantees the exam is still pending, so the counters move exactly once
+            made_at = datetime.fromtimestamp(float(state["made_at"]), tz=UTC)
+            transaction += counter_updates(made_at, approved=1, pending=-1)
+        self.db.client.transact_write_items(TransactItems=transaction)
+
+    def approve_exam(
+            self,
+            exam_id: str,
+            report: EcgReport,
+            expected_version: Optional[int] = None,
+            made_at: Optional[datetime] = None,
+    ) -> bool:
+        """Approve an exam (in a single write when the caller knows its `made_at` and the report is new)"""
         try:
-            exam = self.get_exam_by_id(exam_id)
-            if exam:
-                exam.approved = True
-                exam.principal_report = report
-                exam.reports.append(report)
-                exam.approved_at = report.created_at
-                self.update_exam(exam)
-                return True
+            report = self._with_geometry([report])[0]
+            # The review hot path approves a pending exam with a new report: assume so and let the conditions check it
+            state = None
+            if made_at is not None:
+                state = {
+                    "made_at": number_to_decimal(made_at.timestamp()),
+                    "approved": False,
+                    "version": expected_version,
+                }
+            merge = False
+            for attempt in range(ENV.DYNAMO_CONFLICT_RETRIES + 1):
+                assumed = state is not None
+                if not assumed:
+                    state = self._get_exam_state(exam_id)
+                    if not state:
+                        return False
+                    state["version"] = int(state.get("version", 0))
+                    if expected_version is not None and state["version"] != expected_version:
+                        return False
+
+                try:
+                    self._write_approval(exam_id, report, state, merge)
+                    return True
+                except ClientError as e:
+                    if not is_conflict(e):
+                        raise
+                    failed = failed_conditions(e)
+                    # The header (first item) failed its condition: the exam is not in the state read or assumed
+                    if 0 in failed and expected_version is not None and not assumed:
+                        return False
+                    # The report was already stored: its approvals must be merged into the header copy
+                    merge = merge or bool(failed - {0})
+                    state = None
+                    if not assumed:
+                        backoff(attempt)
             return False
         except Exception as e:
-            print(f"Error approving exam: {e}")
+            logger.error(f"Error approving exam: {e}")
             return False
 
     def get_all_exams(
             self,
             limit: int = 10,
-            offset: int = 0,
+            cursor: Optional[str] = None,
             approved: Optional[bool] = None,
-            order_by: Literal["asc", "desc"] = "asc"
-    ) -> List[EcgExam]:
-        """Get all exams with pagination"""
+            order_by: Literal["asc", "desc"] = "asc",
+            date_range: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[EcgExam], Optional[str]]:
+        """Get a page of exams ordered by made_at and the cursor of the next page"""
+        query, scope = self._listing_query(approved, date_range)
+        scope = f"{scope}:{order_by}"
+        start_key = decode_cursor(cursor, scope)
+        if start_key:
+            query["ExclusiveStartKey"] = self.db.serialize(start_key)
+
         try:
-            exams = self.dynamo.scan(
-                limit=limit,
-                exclusive_start_key=offset,
-                filter_expression="approved = :approved" if approved else None,
-                expression_attribute_values={":approved": approved} if approved else None
-            )
-            return [EcgExam.from_dynamo(exam) for exam in exams]
+            response = self.db.wire_client.query(**query, ScanIndexForward=order_by == "asc", Limit=limit)
+            exams = [decode_exam(exam) for exam in response.get("Items", [])]
+            last_key = response.get("LastEvaluatedKey")
+            return exams, encode_cursor(self.db.deserialize(last_key) if last_key else None, scope)
         except Exception as e:
-            print(f"Error getting all exams: {e}")
-            return []
+            logger.error(f"Error getting all exams: {e}")
+            return [], None
 
-    def count_exams(self, approved: Optional[bool] = None, date_range: Optional[Tuple[str, str]] = None) -> int:
-        """Count the number of exams"""
-        try:
-            filter_expression = None
-            expression_attribute_values = {}
+    def list_exam_summaries(
+            self,
+            limit: int = 10,
+            cursor: Optional[str] = None,
+            approved: Optional[bool] = None,
+            order_by: Literal["asc", "desc"] = "asc",
+            date_range: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[EcgExamSummary], Optional[str]]:
+        """Get a page of exam summaries ordered by made_at (from the summary indexes) and the next page cursor"""
+        query, scope = self._listing_query(approved, date_range, summary=True)
+        scope = f"{scope}:{order_by}"
+        start_key = decode_cursor(cursor, scope)
+        if start_key:
+            query["ExclusiveStartKey"] = self.db.serialize(start_key)
 
-            if approved is not None:
-                filter_expression = "approved = :approved"
-                expression_attribute_values[":approved"] = approved
+        try:
+            response = self.db.wire_client.query(**query, ScanIndexForward=order_by == "asc", Limit=limit)
+            summaries = [decode_exam_summary(item) for item in response.get("Items", [])]
+            last_key = response.get("LastEvaluatedKey")
+            return summaries, encode_cursor(self.db.deserialize(last_key) if last_key else None, scope)
+        except Exception as e:
+            logger.error(f"Error listing exam summaries: {e}")
+            return [], None
 
+    def count_exams(self, approved: Optional[bool] = None, date_range: Optional[Tuple[str, str]] = None) -> int:
+        """Count the number of exams (date ranges are resolved to whole UTC days)"""
+        try:
             if date_range:
-                start_date, end_date = date_range
-                filter_expression += " AND made_at BETWEEN :start_date AND :end_date"
-                expression_attribute_values[":start_date"] = start_date
-                expression_attribute_values[":end_date"] = end_date
-
-            count = self.dynamo.scan(
-                filter_expression=filter_expression,
-                expression_attribute_values=expression_attribute_values
-            )
-            return count
+                start_at, end_at = date_range_to_timestamps(date_range)
+                query = {
+                    "KeyConditionExpression": Key("PK").eq(EXAM_DAY_COUNTER_PK) & Key("SK").between(
+                        day_bucket(datetime.fromtimestamp(float(start_at), tz=UTC)),
+                        day_bucket(datetime.fromtimestamp(float(end_at), tz=UTC)),
+                    )
+                }
+                items = []
+                while True:
+                    response = self.table.query(**query)
+                    items += response.get("Items", [])
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            else:
+                item = self.table.get_item(Key={"PK": EXAM_COUNTER_PK, "SK": EXAM_COUNTER_SK}).get("Item")
+                items = [item] if item else []
+
+            counters = sum_counters(items)
+            if approved is None:
+                return counters["total"]
+            return counters["approved"] if approved else counters["pending"]
         except Exception as e:
-            print(f"Error counting exams: {e}")
+            logger.error(f"Error counting exams: {e}")
             return 0
 
-    def create_exam_report(self, exam_id: str, report: EcgReport) -> bool:
+    def create_exam_report(self, exam_id: str, report: EcgReport, expected_version: Optional[int] = None) -> bool:
         """Create a new exam report"""
         try:
-            exam = self.get_exam_by_id(exam_id)
-            if exam:
-                exam.reports.append(report)
-                self.update_exam(exam)
-                return True
+            report = self._with_geometry([report])[0]
+            condition = {
+                "TableName": ENV.DYNAMO_TABLE,
+                "Key": self._key(exam_id),
+                "ConditionExpression": "attribute_exists(PK)",
+            }
+            if expected_version is not None:
+                condition["ConditionExpression"] += f" AND {version_condition(expected_version)}"
+                condition["ExpressionAttributeNames"] = {"#version": "version"}
+                if expected_version:
+                    condition["ExpressionAttributeValues"] = {":version": expected_version}
+
+            self.db.client.transact_write_items(TransactItems=[
+                {"ConditionCheck": condition},
+                *self._put_new(report.to_dynamo_items(exam_id)),
+            ])
+            return True
+        except Exception as e:
+            logger.error(f"Error creating exam report: {e}")
+            return False
+
+    def _write_report_approval(
+            self,
+            exam_id: str,
+            report_created_at: datetime,
+            status: EcgReportStatus,
+            state: dict,
+    ) -> None:
+        report_sk = sibling_sk(REPORT_ENTITY, report_created_at)
+        version = int(state.get("version", 0))
+        values = {":one": 1}
+        if version:
+            values[":version"] = version
+        # Bumping the version makes a concurrent approve_exam re-read the approvals of its report
+        update = {
+            "TableName": ENV.DYNAMO_TABLE,
+            "Key": self._key(exam_id),
+            "UpdateExpression": "ADD #version :one",
+            "ConditionExpression": f"attribute_exists(PK) AND {version_condition(version)}",
+            "ExpressionAttributeNames": {"#version": "version"},
+            "ExpressionAttributeValues": values,
+        }
+        principal = state.get("principal_report")
+        principal_created_at = datetime.fromtimestamp(float(principal["created_at"]), tz=UTC) if principal else None
+        if principal_created_at and sibling_sk(REPORT_ENTITY, principal_created_at) == report_sk:
+            # The header embeds the principal report, approvals included
+            update["UpdateExpression"] = (
+                "SET principal_report.approves = list_append(if_not_exists(principal_report.approves, :empty), :approve) "
+                + update["UpdateExpression"]
+            )
+            values[":empty"] = []
+            values[":approve"] = [number_to_decimal(status.to_dynamo())]
+
+        self.db.client.transact_write_items(TransactItems=[
+            {"Update": update},
+            {
+                "ConditionCheck": {
+                    "TableName": ENV.DYNAMO_TABLE,
+                    "Key": {"PK": exam_pk(exam_id), "SK": report_sk},
+                    "ConditionExpression": "entity = :report",
+                    "ExpressionAttributeValues": {":report": REPORT_ENTITY},
+                }
+            },
+            *self._put_new([status.to_dynamo_item(exam_id, report_created_at)]),
+        ])
+
+    def add_report_approval(self, exam_id: str, report_created_at: datetime, status: EcgReportStatus) -> bool:
+        """Record a doctor's approval (or rejection) of one of the exam reports"""
+        try:
+            for attempt in range(ENV.DYNAMO_CONFLICT_RETRIES + 1):
+                state = self._get_exam_state(exam_id)
+                if not state:
+                    return False
+                try:
+                    self._write_report_approval(exam_id, report_created_at, status, state)
+                    return True
+                except ClientError as e:
+                    if not is_conflict(e):
+                        raise
+                    backoff(attempt)
             return False
         except Exception as e:
-            print(f"Error creating exam report: {e}")
+            logger.error(f"Error adding report approval: {e}")
             return False
@@ -1,13 +1,23 @@
 from abc import abstractmethod
-from typing import Optional, Tuple, List
+from datetime import datetime
+from typing import Optional, Tuple, Literal, List
 
-from core.entities import EcgExam, EcgReport
+from core.entities import EcgExam, EcgExamSummary, EcgReport, EcgReportStatus
 
 
 class IExamRepo:
     @abstractmethod
-    def get_exam_by_id(self, exam_id: str) -> Optional[EcgExam]:
-        """Get exam by ID"""
+    def get_exam_by_id(self, exam_id: str, full: bool = False) -> Optional[EcgExam]:
+        """Get exam by ID (header and principal report only, unless `full` also loads the report history)"""
+        pass
+
+    @abstractmethod
+    def get_exams_by_ids(
+            self,
+            exam_ids: List[str],
+            projection: Optional[List[str]] = None,
+    ) -> List[Optional[EcgExam]]:
+        """Get many exams at once, in the order of `exam_ids` (None where missing; only `id` and `projection` set)"""
         pass
 
     @abstractmethod
@@ -17,7 +27,7 @@ class IExamRepo:
 
     @abstractmethod
     def update_exam(self, exam: EcgExam) -> bool:
-        """Update an existing exam"""
+        """Update the file and patient data of an exam (made_at, approval state and reports are not changed here)"""
         pass
 
     @abstractmethod
@@ -31,21 +41,51 @@ class IExamRepo:
         pass
 
     @abstractmethod
-    def approve_exam(self, exam_id: str, report: EcgReport) -> bool:
-        """Approve an exam"""
+    def approve_exam(
+            self,
+            exam_id: str,
+            report: EcgReport,
+            expected_version: Optional[int] = None,
+            made_at: Optional[datetime] = None,
+    ) -> bool:
+        """Approve an exam (in a single write when the caller knows its `made_at` and the report is new)"""
         pass
 
     @abstractmethod
-    def create_exam_report(self, exam_id: str, report: EcgReport) -> bool:
+    def create_exam_report(self, exam_id: str, report: EcgReport, expected_version: Optional[int] = None) -> bool:
         """Create a new exam report"""
         pass
 
+    @abstractmethod
+    def add_report_approval(self, exam_id: str, report_created_at: datetime, status: EcgReportStatus) -> bool:
+        """Record a doctor's approval (or rejection) of one of the exam reports"""
+        pass
+
     @abstractmethod
     def count_exams(self, approved: Optional[bool] = None, date_range: Optional[Tuple[str, str]] = None) -> int:
         """Count the number of exams"""
         pass
 
     @abstractmethod
-    def get_all_exams(self, limit: int = 10, offset: int = 0, approved: Optional[bool] = None) -> List[EcgExam]:
-        """Get all exams with pagination"""
+    def get_all_exams(
+            self,
+            limit: int = 10,
+            cursor: Optional[str] = None,
+            approved: Optional[bool] = None,
+            order_by: Literal["asc", "desc"] = "asc",
+            date_range: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[EcgExam], Optional[str]]:
+        """Get a page of exams ordered by made_at and the cursor of the next page"""
+        pass
+
+    @abstractmethod
+    def list_exam_summaries(
+            self,
+            limit: int = 10,
+            cursor: Optional[str] = None,
+            approved: Optional[bool] = None,
+            order_by: Literal["asc", "desc"] = "asc",
+            date_range: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[EcgExamSummary], Optional[str]]:
+        """Get a page of exam summaries ordered by made_at and the cursor of the next page"""
         pass
@@ -0,0 +1,154 @@
+import uuid
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from core.entities import User
+from core.config.env import ENV
+from core.helpers.serialization import loads
+from core.database.database import Database
+from core.infra.metrics import timed_repository
+from core.infra.cache import ICacheBackend, get_cache_backend
+from core.database.repositories.user.repo import UserRepo
+from core.database.repositories.user.repo_interface import IUserRepo
+
+# Cached marker of an e-mail known not to belong to any user
+_MISSING = ""
+
+logger = logging.getLogger(__name__)
+
+
+@timed_repository
+class CachedUserRepo(IUserRepo):
+    """
+    User lookups served from a TTL cache in front of another repo.
+
+    Only profiles are cached, never password hashes (the backend may be a shared
+    Redis): get_user_by_email answers without the password, and credential
+    lookups always read the wrapped repo. Unknown e-mails are cached too (for a
+    shorter time), so repeated failed logins don't reach DynamoDB either.
+
+    Entries are keyed by a per-e-mail generation that writes replace, so a
+    lookup that read the user before a write can only cache it under a
+    generation nobody reads anymore.
+    """
+
+    def __init__(
+            self,
+            user_repo: IUserRepo,
+            backend: ICacheBackend,
+            ttl: float = ENV.USER_CACHE_TTL,
+            negative_ttl: float = ENV.USER_CACHE_NEGATIVE_TTL,
+    ):
+        self.user_repo = user_repo
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _generation_key(email: str) -> str:
+        return f"user-generation:{email}"
+
+    def _new_generation(self, email: str) -> str:
+        generation = uuid.uuid4().hex
+        self.backend.set(self._generation_key(email), generation, max(self.ttl, self.negative_ttl))
+        return generation
+
+    def _read(self, email: str) -> Tuple[Optional[str], Optional[str]]:
+        """Cache key of the e-mail's current generation and its cached value (no key when the backend failed)"""
+        try:
+            generation = self.backend.get(self._generation_key(email)) or self._new_generation(email)
+            key = f"user:{email}:{generation}"
+            return key, self.backend.get(key)
+        except Exception as e:
+            # A shared backend being down must not take the login down with it
+            logger.warning(f"Error reading user cache: {e}")
+            return None, None
+
+    def _store(self, key: Optional[str], user: Optional[User]) -> None:
+        if key is None:
+            return
+        try:
+            if user:
+                self.backend.set(key, user.model_dump_json(exclude={"password"}), self.ttl)
+            else:
+                self.backend.set(key, _MISSING, self.negative_ttl)
+        except Exception as e:
+            logger.warning(f"Error writing user cache: {e}")
+
+    def _count(self, cached: Optional[str]) -> None:
+        with self._lock:
+            if cached is None:
+                self._misses += 1
+            elif cached == _MISSING:
+                self._negative_hits += 1
+            else:
+                self._hits += 1
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user by email, without its password"""
+        key, cached = self._read(email)
+        self._count(cached)
+        if cached is not None:
+            return User(**loads(cached), password="") if cached != _MISSING else None
+
+        user = self.user_repo.get_user_by_email(email)
+        self._store(key, user)
+        return user.model_copy(update={"password": ""}) if user else None
+
+    def get_user_credentials(self, email: str) -> Optional[User]:
+        """Get user by email, password hash included (only unknown e-mails are answered from the cache)"""
+        key, cached = self._read(email)
+        if cached == _MISSING:
+            self._count(cached)
+            return None
+
+        self._count(None)
+        user = self.user_repo.get_user_credentials(email)
+        self._store(key, user)
+        return user
+
+    def create_user(self, user: User) -> bool:
+        """Create a new user"""
+        created = self.user_repo.create_user(user)
+        self.invalidate(user.email)
+        return created
+
+    def update_user(self, user: User) -> bool:
+        """Update an existing user"""
+        updated = self.user_repo.update_user(user)
+        self.invalidate(user.email)
+        return updated
+
+    def invalidate(self, email: str) -> None:
+        """Drop the cached user (or negative entry) of an e-mail, and whatever a lookup in flight is about to cache"""
+        try:
+            self._new_generation(email)
+        except Exception as e:
+            logger.warning(f"Error invalidating user cache: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._negative_hits) / lookups, 4) if lookups else 0.0,
+                **self.backend.stats(),
+            }
+
+
+@lru_cache(maxsize=None)
+def get_user_repo() -> IUserRepo:
+    """User repo shared by the process: cached unless USER_CACHE_BACKEND is "none" """
+    user_repo = UserRepo(Database())
+    backend = get_cache_backend(ENV.USER_CACHE_BACKEND, ENV.USER_CACHE_SIZE)
+    if backend is None:
+        return user_repo
+    return CachedUserRepo(user_repo, backend)
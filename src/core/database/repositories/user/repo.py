@@ -1,30 +1,65 @@
+import logging
 from typing import Optional
 
 from core.entities import User
+from core.database.keys import user_pk
 from core.database.database import Database
 from core.database.repositories.user.repo_interface import IUserRepo
+from core.infra.metrics import timed_repository
 
+logger = logging.getLogger(__name__)
 
+
+@timed_repository
 class UserRepo(IUserRepo):
     def __init__(self, db: Database):
         self.table = db.table
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        user = self.table.query(
+        items = self.table.query(
             KeyConditionExpression="PK = :pk",
-            ExpressionAttributeValues={":pk": f"USER#{email}"},
-        ).get("Items", [None])[0]
-        print(user)
-        if user:
-            return User.from_dynamo(user)
+            ExpressionAttributeValues={":pk": user_pk(email)},
+            Limit=1,
+        ).get("Items", [])
+        if items:
+            return User.from_dynamo(items[0])
         return None
 
+    def get_user_credentials(self, email: str) -> Optional[User]:
+        """Get user by email, password hash included"""
+        return self.get_user_by_email(email)
+
     def create_user(self, user: User) -> bool:
         """Create a new user"""
         try:
-            self.table.put_item(user.to_dynamo())
+            self.table.put_item(Item=user.to_dynamo())
+            return True
+        except Exception as e:
+            logger.error(f"Error creating user: {e}")
+            return False
+
+    def update_user(self, user: User) -> bool:
+        """Update the name and password of an existing user"""
+        try:
+            # The sort key is read back rather than rebuilt from created_at, which may not round-trip exactly
+            items = self.table.query(
+                KeyConditionExpression="PK = :pk",
+                ExpressionAttributeValues={":pk": user_pk(user.email)},
+                ProjectionExpression="PK, SK",
+                Limit=1,
+            ).get("Items", [])
+            if not items:
+                return False
+
+            self.table.update_item(
+                Key=items[0],
+                UpdateExpression="SET #name = :name, #password = :password",
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeNames={"#name": "name", "#password": "password"},
+                ExpressionAttributeValues={":name": user.name, ":password": user.password},
+            )
             return True
         except Exception as e:
-            print(f"Error creating user: {e}")
+            logger.error(f"Error updating user: {e}")
             return False
@@ -7,10 +7,20 @@ from core.entities import User
 class IUserRepo:
     @abstractmethod
     def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email"""
+        """Get user by email (its password may be left out: use get_user_credentials to check it)"""
+        pass
+
+    @abstractmethod
+    def get_user_credentials(self, email: str) -> Optional[User]:
+        """Get user by email, password hash included"""
         pass
 
     @abstractmethod
     def create_user(self, user: User) -> bool:
         """Create a new user"""
         pass
+
+    @abstractmethod
+    def update_user(self, user: User) -> bool:
+        """Update an existing user"""
+        pass
@@ -0,0 +1,48 @@
+import time
+import random
+from typing import Set
+
+from botocore.exceptions import ClientError
+
+from core.config.env import ENV
+
+CONFLICT_CODES = {"ConditionalCheckFailed", "TransactionConflict"}
+
+
+def is_conflict(error: Exception) -> bool:
+    """Whether a write failed because another writer got there first"""
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code")
+    if code == "ConditionalCheckFailedException":
+        return True
+    if code == "TransactionCanceledException":
+        reasons = error.response.get("CancellationReasons", [])
+        return any(reason.get("Code") in CONFLICT_CODES for reason in reasons)
+    return False
+
+
+def is_transaction_conflict(error: Exception) -> bool:
+    """Whether a transaction was cancelled only because another one was writing the same items"""
+    if not isinstance(error, ClientError) or error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return False
+    codes = {reason.get("Code") for reason in error.response.get("CancellationReasons", [])}
+    return "TransactionConflict" in codes and "ConditionalCheckFailed" not in codes
+
+
+def failed_conditions(error: Exception) -> Set[int]:
+    """Positions of the items of a cancelled transaction whose condition failed"""
+    if not isinstance(error, ClientError) or error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return set()
+    reasons = error.response.get("CancellationReasons", [])
+    return {position for position, reason in enumerate(reasons) if reason.get("Code") == "ConditionalCheckFailed"}
+
+
+def backoff(attempt: int) -> None:
+    """Sleep with full jitter before retrying a conflicting write"""
+    time.sleep(random.uniform(0, ENV.DYNAMO_CONFLICT_BACKOFF * (2 ** attempt)))
+
+
+def version_condition(version: int) -> str:
+    """Condition matching the version read (items written before versioning have none)"""
+    return "attribute_not_exists(#version)" if not version else "#version = :version"
@@ -0,0 +1,52 @@
+from typing import Any, Dict
+
+from core.database.keys import (
+    EXAMS_BY_STATUS_INDEX,
+    EXAMS_BY_DATE_INDEX,
+    EXAM_SUMMARIES_BY_STATUS_INDEX,
+    EXAM_SUMMARIES_BY_DATE_INDEX,
+    EXAM_SUMMARY_ATTRIBUTES,
+)
+
+# Provisioned capacity of local tables (DynamoDB Local and moto ignore it, but require it)
+LOCAL_THROUGHPUT = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+
+
+def index_definition(index_name: str, key: str, summary: bool = False) -> Dict[str, Any]:
+    """Global secondary index over <key>PK/<key>SK projecting whole items, or only the exam summary"""
+    return {
+        "IndexName": index_name,
+        "KeySchema": [
+            {"AttributeName": f"{key}PK", "KeyType": "HASH"},
+            {"AttributeName": f"{key}SK", "KeyType": "RANGE"},
+        ],
+        "Projection": (
+            {"ProjectionType": "INCLUDE", "NonKeyAttributes": list(EXAM_SUMMARY_ATTRIBUTES)}
+            if summary
+            else {"ProjectionType": "ALL"}
+        ),
+        "ProvisionedThroughput": LOCAL_THROUGHPUT,
+    }
+
+
+def table_definition(table_name: str) -> Dict[str, Any]:
+    """CreateTable arguments of the single table and its indexes (see core.database.keys)"""
+    return {
+        "TableName": table_name,
+        "KeySchema": [{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "N"},
+            {"AttributeName": "GSI1PK", "AttributeType": "S"},
+            {"AttributeName": "GSI1SK", "AttributeType": "N"},
+            {"AttributeName": "GSI2PK", "AttributeType": "S"},
+            {"AttributeName": "GSI2SK", "AttributeType": "N"},
+        ],
+        "GlobalSecondaryIndexes": [
+            index_definition(EXAMS_BY_STATUS_INDEX, "GSI1"),
+            index_definition(EXAMS_BY_DATE_INDEX, "GSI2"),
+            index_definition(EXAM_SUMMARIES_BY_STATUS_INDEX, "GSI1", summary=True),
+            index_definition(EXAM_SUMMARIES_BY_DATE_INDEX, "GSI2", summary=True),
+        ],
+        "ProvisionedThroughput": LOCAL_THROUGHPUT,
+    }
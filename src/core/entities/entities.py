@@ -2,9 +2,22 @@ from pytz import UTC
 from enum import Enum
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Union
 
-from core.helpers.transform import decimal_to_number
+from core.config.env import ENV
+from core.helpers.enum import UserType
+from core.helpers.polygon_codec import encode_polygons, decode_polygons
+from core.helpers.transform import decimal_to_number, number_to_decimal
+from core.database.keys import (
+    exam_pk,
+    exam_id_from_pk,
+    exam_status_pk,
+    sibling_sk,
+    EXAM_ENTITY,
+    REPORT_ENTITY,
+    APPROVAL_ENTITY,
+    EXAM_HEADER_SK,
+)
 
 
 class ReportType(Enum):
@@ -70,16 +83,18 @@ class User(BaseModel):
     name: str
     email: str
     password: str
-    created_at: datetime = datetime.now(UTC)
+    type: UserType = UserType.DOCTOR
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
     def to_dynamo(self):
-        return {
+        return number_to_decimal({
             "PK": f"USER#{self.email}",
             "SK": self.created_at.timestamp(),
             "name": self.name,
             "email": self.email,
             "password": self.password,
-        }
+            "type": self.type.value,
+        })
 
     @classmethod
     def from_dynamo(cls, data: dict) -> "User":
@@ -88,29 +103,52 @@ class User(BaseModel):
             name=data["name"],
             email=data["email"],
             password=data["password"],
+            # Users created before types existed are all doctors
+            type=UserType(data.get("type", UserType.DOCTOR.value)),
             created_at=datetime.fromtimestamp(data["SK"], tz=UTC),
         )
 
+    def to_reference(self):
+        """Author reference embedded in reports and approvals (never carries the password)"""
+        return {"name": self.name, "email": self.email}
+
+    @classmethod
+    def from_reference(cls, data) -> "User":
+        # Older items only stored the author's e-mail
+        if isinstance(data, str):
+            return cls(name=data, email=data, password="")
+        return cls(name=data["name"], email=data["email"], password="")
+
 
 class EcgReportStatus(BaseModel):
     status: bool
-    created_at: datetime = datetime.now(UTC)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     created_by: User
 
     def to_dynamo(self):
         return {
             "status": self.status,
             "created_at": self.created_at.timestamp(),
-            "created_by": self.created_by.email,
+            "created_by": self.created_by.to_reference(),
         }
 
+    def to_dynamo_item(self, exam_id: str, report_created_at: datetime) -> dict:
+        """Approval stored as its own item under the exam partition"""
+        return number_to_decimal({
+            "PK": exam_pk(exam_id),
+            "SK": sibling_sk(APPROVAL_ENTITY, self.created_at),
+            "entity": APPROVAL_ENTITY,
+            "report_sk": sibling_sk(REPORT_ENTITY, report_created_at),
+            **self.to_dynamo(),
+        })
+
     @classmethod
     def from_dynamo(cls, data: dict) -> "EcgReportStatus":
         data = decimal_to_number(data)
         return cls(
             status=data["status"],
             created_at=datetime.fromtimestamp(data["created_at"], tz=UTC),
-            created_by=User.from_dynamo(data["created_by"]),
+            created_by=User.from_reference(data["created_by"]),
         )
 
 
@@ -122,10 +160,17 @@ class EcgReportSegmentation(BaseModel):
     iscrowd: Literal[0, 1] = 0  # se a anotação representa uma multidão (padrão: 0)
     created_at: datetime
 
-    def to_dynamo(self):
+    def to_dynamo(self, encoding: Optional[str] = None):
+        encoding = encoding or ENV.SEGMENTATION_ENCODING
+        if encoding == "list":
+            segmentation = {"segmentation": self.segmentation}
+        else:
+            packed = encode_polygons(self.segmentation, encoding, ENV.SEGMENTATION_SCALE, ENV.SEGMENTATION_DELTA)
+            segmentation = {"segmentation_packed": packed}
+
         return {
             "category": self.category.value,
-            "segmentation": self.segmentation,
+            **segmentation,
             "bbox": self.bbox,
             "area": self.area,
             "iscrowd": self.iscrowd,
@@ -137,7 +182,11 @@ class EcgReportSegmentation(BaseModel):
         data = decimal_to_number(data)
         return cls(
             category=ReportSegmentationType(data["category"]),
-            segmentation=data["segmentation"],
+            segmentation=(
+                decode_polygons(data["segmentation_packed"])
+                if "segmentation_packed" in data
+                else data["segmentation"]
+            ),
             bbox=data["bbox"],
             area=data["area"],
             iscrowd=data["iscrowd"],
@@ -149,7 +198,7 @@ class EcgReport(BaseModel):
     report: ReportType
     report_segmentation: Optional[EcgReportSegmentation] = None
 
-    created_at: datetime = datetime.now(UTC)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     created_by: User
 
     approves: List[EcgReportStatus] = []
@@ -159,12 +208,26 @@ class EcgReport(BaseModel):
             "report": self.report.value,
             "report_segmentation": self.report_segmentation.to_dynamo() if self.report_segmentation else None,
             "created_at": self.created_at.timestamp(),
-            "created_by": self.created_by.email,
+            "created_by": self.created_by.to_reference(),
             "approves": [approve.to_dynamo() for approve in self.approves],
         }
 
+    def to_dynamo_items(self, exam_id: str) -> List[dict]:
+        """Report and its approvals stored as their own items under the exam partition"""
+        report = self.to_dynamo()
+        report.pop("approves")
+        return [
+            number_to_decimal({
+                "PK": exam_pk(exam_id),
+                "SK": sibling_sk(REPORT_ENTITY, self.created_at),
+                "entity": REPORT_ENTITY,
+                **report,
+            }),
+            *[approve.to_dynamo_item(exam_id, self.created_at) for approve in self.approves],
+        ]
+
     @classmethod
-    def from_dynamo(cls, data: dict) -> "EcgReport":
+    def from_dynamo(cls, data: dict, approves: Optional[List[dict]] = None) -> "EcgReport":
         report_segmentation = (
             EcgReportSegmentation.from_dynamo(data["report_segmentation"])
             if data.get("report_segmentation")
@@ -175,8 +238,8 @@ class EcgReport(BaseModel):
             report=ReportType(data["report"]),
             report_segmentation=report_segmentation,
             created_at=datetime.fromtimestamp(data["created_at"], tz=UTC),
-            created_by=User.from_dynamo(data["created_by"]),
-            approves=[EcgReportStatus.from_dynamo(approve) for approve in data["approves"]],
+            created_by=User.from_reference(data["created_by"]),
+            approves=[EcgReportStatus.from_dynamo(approve) for approve in data.get("approves", []) + (approves or [])],
         )
 
 
@@ -195,28 +258,48 @@ class EcgExam(BaseModel):
     principal_report: Optional[EcgReport]
     reports: List[EcgReport] = []
 
+    version: int = 1  # bumped on every write, used for optimistic concurrency
+
     def to_dynamo(self):
-        return {
-            "PK": f"EXAM#{self.id}",
-            "SK": self.made_at.timestamp(),
+        """Exam header: everything but the report history, which lives in sibling items"""
+        made_at = self.made_at.timestamp()
+        return number_to_decimal({
+            "PK": exam_pk(self.id),
+            "SK": EXAM_HEADER_SK,
+            "entity": EXAM_ENTITY,
+            "GSI1PK": exam_status_pk(self.approved),
+            "GSI1SK": made_at,
+            "GSI2PK": EXAM_ENTITY,
+            "GSI2SK": made_at,
             "file_path": self.file_path,
-            "gender": self.gender,
+            "made_at": made_at,
+            "gender": self.gender.value,
             "birth_date": self.birth_date,
             "amplitude": self.amplitude,
             "speed": self.speed,
             "approved": self.approved,
             "approved_at": self.approved_at.timestamp() if self.approved_at else None,
             "principal_report": self.principal_report.to_dynamo() if self.principal_report else None,
-            "reports": [report.to_dynamo() for report in self.reports],
-        }
+            # Copied out of the principal report so the summary indexes can project it
+            "principal_diagnosis": self.principal_report.report.value if self.principal_report else None,
+            "version": self.version,
+        })
+
+    def to_dynamo_items(self) -> List[dict]:
+        """Header plus one item per report and approval"""
+        return [self.to_dynamo(), *[item for report in self.reports for item in report.to_dynamo_items(self.id)]]
 
     @classmethod
-    def from_dynamo(cls, data: dict) -> "EcgExam":
+    def from_dynamo(cls, data: Union[dict, List[dict]]) -> "EcgExam":
+        """Build an exam from its header, or from every item of its partition (one Query)"""
+        if isinstance(data, list):
+            return cls._from_dynamo_items(data)
+
         data = decimal_to_number(data)
         return cls(
-            id=data["PK"].split("#")[1],
+            id=exam_id_from_pk(data["PK"]),
             file_path=data["file_path"],
-            made_at=datetime.fromtimestamp(data["SK"], tz=UTC),
+            made_at=datetime.fromtimestamp(data["made_at"], tz=UTC),
             gender=Gender(data["gender"]),
             birth_date=data["birth_date"],
             amplitude=data["amplitude"],
@@ -225,4 +308,36 @@ class EcgExam(BaseModel):
             approved_at=datetime.fromtimestamp(data["approved_at"], tz=UTC) if data.get("approved_at") else None,
             principal_report=EcgReport.from_dynamo(data["principal_report"]) if data.get("principal_report") else None,
             reports=[EcgReport.from_dynamo(report) for report in data.get("reports", [])],
+            version=data.get("version", 0),
         )
+
+    @classmethod
+    def _from_dynamo_items(cls, items: List[dict]) -> "EcgExam":
+        header, reports, approves = None, {}, {}
+        for item in items:
+            entity = item.get("entity")
+            if entity == REPORT_ENTITY:
+                reports[item["SK"]] = item
+            elif entity == APPROVAL_ENTITY:
+                approves.setdefault(item["report_sk"], []).append(item)
+            else:
+                header = item
+
+        if header is None:
+            raise ValueError("Exam header item not found")
+
+        exam = cls.from_dynamo(header)
+        # Headers written before reports were split out still embed them
+        exam.reports += [EcgReport.from_dynamo(reports[sk], approves.get(sk)) for sk in sorted(reports)]
+        return exam
+
+
+class EcgExamSummary(BaseModel):
+    """What worklists show of an exam: its header without reports, as projected by the summary indexes"""
+    id: str
+    made_at: datetime
+    gender: Gender
+    birth_date: str
+    approved: bool = False
+    approved_at: Optional[datetime] = None
+    principal_diagnosis: Optional[ReportType] = None
@@ -1,24 +1,66 @@
+import json
+import time
 import logging
 from functools import wraps
-from core.schemas.http import HTTPError
+
+from core.config.env import ENV
+from core.schemas.http import HTTPError, compress_response
+from core.infra.cold_start import take_cold_start
+from core.infra.metrics import CURRENT_REQUEST, HTTP_LATENCY, HTTP_REQUESTS, RequestMetrics
 
 logger = logging.getLogger(__name__)
 
+# One JSON line per Lambda invocation, on its own logger so its level does not depend on the root one
+request_logger = logging.getLogger("ecg.requests")
+request_logger.setLevel(ENV.LOG_LEVEL)
+
+
+def _handle(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    except HttpException as e:
+        logger.error(f"HttpException: {e}")
+        return e.to_http_error()
+    except Exception as e:
+        logger.error(f"Unhandled exception: {e}")
+        return HTTPError(
+            status_code=500,
+            details=f"Internal server error"
+        ).to_dict()
+
 
 def error_handler(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
+        event = args[0] if args and isinstance(args[0], dict) else {}
+        route = event.get("resource") or event.get("routeKey") or func.__module__
+        method = event.get("httpMethod") or event.get("requestContext", {}).get("http", {}).get("method", "")
+        cold_start = take_cold_start()
+        request = RequestMetrics(route)
+        token = CURRENT_REQUEST.set(request)
+        started = time.perf_counter()
+        response = None
         try:
-            return func(*args, **kwargs)
-        except HttpException as e:
-            logger.error(f"HttpException: {e}")
-            return e.to_http_error()
-        except Exception as e:
-            logger.error(f"Unhandled exception: {e}")
-            return HTTPError(
-                status_code=500,
-                details=f"Internal server error"
-            ).to_dict()
+            response = _handle(func, *args, **kwargs)
+            if isinstance(response, dict):
+                headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+                response = compress_response(response, headers.get("accept-encoding"))
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            status = response.get("statusCode", 500) if isinstance(response, dict) else 500
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            request.flush(route)
+            CURRENT_REQUEST.reset(token)
+            request_logger.info(json.dumps({
+                "route": route,
+                "method": method,
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 3),
+                "cold_start": cold_start,
+                **request.summary(),
+            }))
 
     return wrapper
 
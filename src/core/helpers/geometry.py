@@ -0,0 +1,94 @@
+from itertools import chain
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+# A segmentation is a list of polygons, each a flat [x1, y1, x2, y2, ...] list (COCO style).
+
+
+@dataclass
+class SegmentationMetrics:
+    """Per-segmentation geometry, row i describing segmentations[i]"""
+    area: np.ndarray  # (n,) summed shoelace area of the polygons
+    bbox: np.ndarray  # (n, 4) [x_min, y_min, width, height]
+    point_count: np.ndarray  # (n,) number of points over all polygons
+    polygon_count: np.ndarray  # (n,)
+    valid: np.ndarray  # (n,) every polygon valid and at least one polygon
+
+    # Per-polygon detail, in the order polygons appear
+    polygon_area: np.ndarray
+    polygon_valid: np.ndarray
+    polygon_owner: np.ndarray  # index of the segmentation each polygon belongs to
+
+
+def segmentation_metrics(segmentations: Sequence[List[List[float]]]) -> SegmentationMetrics:
+    """
+    Compute area, bbox, validity and point counts for a batch of segmentations at once.
+
+    All coordinates are concatenated into one array and every metric is computed with
+    segment reductions, so cost does not depend on Python loops over points.
+    A polygon is valid when it has an even number of values, at least 3 points, only
+    finite coordinates and a non-zero area.
+    """
+    n = len(segmentations)
+    polygons = [polygon for segmentation in segmentations for polygon in segmentation]
+    polygon_owner = np.repeat(np.arange(n), [len(segmentation) for segmentation in segmentations])
+    polygon_count = np.bincount(polygon_owner, minlength=n)
+
+    lengths = np.fromiter((len(polygon) for polygon in polygons), dtype=np.int64, count=len(polygons))
+    well_formed = (lengths % 2 == 0) & (lengths >= 6)
+
+    # Malformed polygons are kept out of the coordinate array so reductions stay aligned
+    kept = [polygon for polygon, ok in zip(polygons, well_formed) if ok]
+    coords = np.fromiter(
+        chain.from_iterable(kept), dtype=np.float64, count=int(lengths[well_formed].sum())
+    ).reshape(-1, 2)
+    points = lengths[well_formed] // 2
+    starts = np.concatenate(([0], np.cumsum(points)[:-1])).astype(np.int64) if len(points) else np.zeros(0, np.int64)
+
+    polygon_area = np.zeros(len(polygons))
+    polygon_finite = np.zeros(len(polygons), dtype=bool)
+    if len(kept):
+        x, y = coords[:, 0], coords[:, 1]
+        following = np.arange(1, len(coords) + 1)
+        following[starts + points - 1] = starts
+        cross = x * y[following] - x[following] * y
+        polygon_area[well_formed] = 0.5 * np.abs(np.add.reduceat(cross, starts))
+        polygon_finite[well_formed] = np.logical_and.reduceat(np.isfinite(coords).all(axis=1), starts)
+
+    polygon_area[~polygon_finite] = 0.0
+    polygon_valid = well_formed & polygon_finite & (polygon_area > 0)
+
+    area = np.bincount(polygon_owner, weights=polygon_area, minlength=n)
+    point_count = np.bincount(polygon_owner, weights=lengths // 2, minlength=n).astype(np.int64)
+    valid = (np.bincount(polygon_owner, weights=~polygon_valid, minlength=n) == 0) & (polygon_count > 0)
+
+    # Points are grouped by segmentation already, so bounds are plain segment reductions
+    bbox = np.full((n, 4), np.nan)
+    if len(kept):
+        counts = np.bincount(np.repeat(polygon_owner[well_formed], points), minlength=n)
+        has_points = counts > 0
+        owner_starts = (np.cumsum(counts) - counts)[has_points]
+        finite = np.isfinite(coords).all(axis=1, keepdims=True)
+        lower = np.minimum.reduceat(np.where(finite, coords, np.inf), owner_starts, axis=0)
+        upper = np.maximum.reduceat(np.where(finite, coords, -np.inf), owner_starts, axis=0)
+        bounds = np.concatenate([lower, upper - lower], axis=1)
+        bounds[~np.isfinite(bounds).all(axis=1)] = np.nan
+        bbox[has_points] = bounds
+
+    return SegmentationMetrics(
+        area=area,
+        bbox=bbox,
+        point_count=point_count,
+        polygon_count=polygon_count,
+        valid=valid,
+        polygon_area=polygon_area,
+        polygon_valid=polygon_valid,
+        polygon_owner=polygon_owner,
+    )
+
+
+def polygon_metrics(segmentation: List[List[float]]) -> SegmentationMetrics:
+    """Metrics of a single segmentation"""
+    return segmentation_metrics([segmentation])
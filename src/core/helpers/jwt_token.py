@@ -1,15 +1,30 @@
 import jwt
+import time
 from pytz import UTC
-from typing import Union
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
 from datetime import datetime, timedelta
 
 from core.config.env import ENV
 
+# Bumped whenever the profile claims change shape; tokens with another version fall back to the database
+CLAIMS_VERSION = 1
+PROFILE_CLAIMS = ("name", "email", "created_at", "type")
+
 
 class JWToken:
     jwt_secret = ENV.JWT_SECRET
     jwt_algorithm = ENV.JWT_ALGORITHM
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _keys(cls):
+        """Signing and verifying keys, parsed once (PEM keys are expensive to load) instead of per token"""
+        algorithm = jwt.get_algorithm_by_name(cls.jwt_algorithm)
+        signing_key = algorithm.prepare_key(cls.jwt_secret)
+        verifying_key = algorithm.prepare_key(ENV.JWT_PUBLIC_KEY) if ENV.JWT_PUBLIC_KEY else signing_key
+        return signing_key, verifying_key
+
     @classmethod
     def encode(
             cls,
@@ -17,18 +32,53 @@ class JWToken:
             exp_days: int = 1,
             exp_hours: int = 0,
             exp_minutes: int = 0,
+            claims: Optional[Dict[str, Any]] = None,
     ) -> str:
         payload = {
+            **(claims or {}),
             'user_id': user_id,
             'exp': datetime.now(tz=UTC) + timedelta(days=exp_days, hours=exp_hours, minutes=exp_minutes)
         }
-        return jwt.encode(payload, cls.jwt_secret, algorithm=cls.jwt_algorithm)
+        return jwt.encode(payload, cls._keys()[0], algorithm=cls.jwt_algorithm)
 
     @classmethod
-    def decode(cls, access_token: str) -> Union[Union[str, dict], bool]:
+    def encode_user(cls, user, **expiration) -> str:
+        """Token carrying the user's profile, so it can be answered without reading the user back"""
+        return cls.encode(user.email, claims={
+            "cv": CLAIMS_VERSION,
+            "name": user.name,
+            "email": user.email,
+            "created_at": user.created_at.timestamp(),
+            "type": user.type.value,
+        }, **expiration)
+
+    @classmethod
+    @lru_cache(maxsize=ENV.JWT_VERIFY_CACHE_SIZE)
+    def _verify(cls, access_token: str) -> Optional[Dict[str, Any]]:
+        # Signature checks are cached per token; expiry is re-checked on every use
         try:
-            return jwt.decode(access_token, cls.jwt_secret, algorithms=[cls.jwt_algorithm])["user_id"]
-        except jwt.ExpiredSignatureError:
-            return False
+            return jwt.decode(access_token, cls._keys()[1], algorithms=[cls.jwt_algorithm])
         except jwt.InvalidTokenError:
+            return None
+
+    @classmethod
+    def decode_claims(cls, access_token: str) -> Optional[Dict[str, Any]]:
+        """Claims of a valid, unexpired token"""
+        if not access_token:
+            return None
+        claims = cls._verify(access_token)
+        if claims is None or claims["exp"] <= time.time():
+            return None
+        return dict(claims)
+
+    @classmethod
+    def decode(cls, access_token: str) -> Union[Union[str, dict], bool]:
+        claims = cls.decode_claims(access_token)
+        if claims is None:
             return False
+        return claims["user_id"]
+
+    @staticmethod
+    def has_profile(claims: Dict[str, Any]) -> bool:
+        """Whether the claims are recent enough to describe the user on their own"""
+        return claims.get("cv") == CLAIMS_VERSION and all(claim in claims for claim in PROFILE_CLAIMS)
@@ -0,0 +1,70 @@
+import hmac
+import json
+import base64
+import hashlib
+from typing import Dict, Any, Optional
+
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+
+from core.config.env import ENV
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token is malformed, tampered with or used on another listing"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _secret() -> bytes:
+    # An empty HMAC key would let anyone forge cursors
+    if not ENV.CURSOR_SECRET:
+        raise RuntimeError("CURSOR_SECRET (or JWT_SECRET) must be set to sign pagination cursors")
+    return ENV.CURSOR_SECRET.encode("utf-8")
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_secret(), payload, hashlib.sha256).digest()
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]], scope: str) -> Optional[str]:
+    """
+    Build an opaque, signed continuation token from a DynamoDB `LastEvaluatedKey`.
+
+    `scope` identifies the listing (index + filters) the key belongs to, so a token
+    issued for one listing cannot be replayed against another.
+    """
+    if not last_evaluated_key:
+        return None
+    key = {name: _serializer.serialize(value) for name, value in last_evaluated_key.items()}
+    payload = json.dumps({"s": scope, "k": key}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: Optional[str], scope: str) -> Optional[Dict[str, Any]]:
+    """Verify a continuation token and return the `ExclusiveStartKey` it carries"""
+    _secret()  # checked on every listing, not only on the ones that happen to carry a cursor
+    if not cursor:
+        return None
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCursor("Invalid cursor signature")
+
+    data = json.loads(payload)
+    if data.get("s") != scope:
+        raise InvalidCursor("Cursor does not belong to this listing")
+    return {name: _deserializer.deserialize(value) for name, value in data["k"].items()}
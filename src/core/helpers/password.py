@@ -0,0 +1,90 @@
+import hmac
+import base64
+import hashlib
+import secrets
+from typing import Optional
+from functools import lru_cache
+
+from core.config.env import ENV
+
+# Stored formats:
+#   scrypt$<n>$<r>$<p>$<salt>$<hash>
+#   pbkdf2_sha256$<iterations>$<salt>$<hash>
+# Anything else is a legacy plaintext password.
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # scrypt needs 128 * n * r bytes per lane; OpenSSL refuses anything above maxmem
+    maxmem = 128 * n * r * (p + 1) + 1024 * 1024
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=HASH_BYTES)
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=HASH_BYTES)
+
+
+def hash_password(
+        password: str,
+        algorithm: Optional[str] = None,
+        n: Optional[int] = None,
+        r: Optional[int] = None,
+        p: Optional[int] = None,
+        iterations: Optional[int] = None,
+) -> str:
+    """Salted hash of the password with the configured (or given) algorithm and cost"""
+    algorithm = algorithm or ENV.PASSWORD_ALGORITHM
+    salt = secrets.token_bytes(SALT_BYTES)
+    if algorithm == "scrypt":
+        n, r, p = n or ENV.PASSWORD_SCRYPT_N, r or ENV.PASSWORD_SCRYPT_R, p or ENV.PASSWORD_SCRYPT_P
+        return f"scrypt${n}${r}${p}${_b64encode(salt)}${_b64encode(_scrypt(password, salt, n, r, p))}"
+    if algorithm == "pbkdf2_sha256":
+        iterations = iterations or ENV.PASSWORD_PBKDF2_ITERATIONS
+        return f"pbkdf2_sha256${iterations}${_b64encode(salt)}${_b64encode(_pbkdf2(password, salt, iterations))}"
+    raise ValueError(f"Unknown password hashing algorithm: {algorithm}")
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Whether the password matches the stored hash (or legacy plaintext), in constant time"""
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            expected = _b64decode(parts[5])
+            return hmac.compare_digest(_scrypt(password, _b64decode(parts[4]), n, r, p), expected)
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = _b64decode(parts[3])
+            return hmac.compare_digest(_pbkdf2(password, _b64decode(parts[2]), int(parts[1])), expected)
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(password.encode(), stored.encode())
+
+
+def needs_rehash(stored: str) -> bool:
+    """Whether the stored password is plaintext or was hashed with another algorithm or cost"""
+    parts = stored.split("$")
+    if parts[0] != ENV.PASSWORD_ALGORITHM:
+        return True
+    if parts[0] == "scrypt":
+        return parts[1:4] != [str(ENV.PASSWORD_SCRYPT_N), str(ENV.PASSWORD_SCRYPT_R), str(ENV.PASSWORD_SCRYPT_P)]
+    return parts[1] != str(ENV.PASSWORD_PBKDF2_ITERATIONS)
+
+
+@lru_cache(maxsize=None)
+def dummy_hash() -> str:
+    """Hash checked when the user does not exist, so unknown e-mails take as long as wrong passwords"""
+    return hash_password(secrets.token_urlsafe(16))
+
+
+def check_password(password: str, stored: Optional[str]) -> bool:
+    """verify_password against the stored hash, or against the dummy hash when there is no user"""
+    return verify_password(password, stored if stored is not None else dummy_hash())
@@ -0,0 +1,98 @@
+import sys
+import struct
+from array import array
+from typing import List
+
+# Packed layout (little-endian):
+#   header   <BBBxfI   version, encoding, flags, scale, polygon count
+#   lengths  <I * n    number of values (x, y interleaved) of each polygon
+#   values   float32 or int16 coordinates, polygons back to back
+#
+# int16 stores round(value * scale); with the delta flag every value but the first
+# point of each polygon is stored relative to the previous point on the same axis,
+# which keeps dense annotations well inside the int16 range.
+
+FORMAT_VERSION = 1
+FLOAT32 = 0
+INT16 = 1
+FLAG_DELTA = 1
+
+ENCODINGS = {"float32": FLOAT32, "int16": INT16}
+
+_HEADER = struct.Struct("<BBBxfI")
+_INT16_MIN, _INT16_MAX = -32768, 32767
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _to_bytes(values: array) -> bytes:
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _quantize(polygon: List[float], scale: float, delta: bool) -> List[int]:
+    quantized = [round(value * scale) for value in polygon]
+    if delta:
+        quantized = quantized[:2] + [quantized[i] - quantized[i - 2] for i in range(2, len(quantized))]
+    return quantized
+
+
+def _dequantize(values: List[int], scale: float, delta: bool) -> List[float]:
+    if delta:
+        values = list(values)
+        for i in range(2, len(values)):
+            values[i] += values[i - 2]
+    return [value / scale for value in values]
+
+
+def encode_polygons(polygons: List[List[float]], encoding: str = "float32", scale: float = 10.0, delta: bool = True) -> bytes:
+    """
+    Pack polygons into a compact binary blob.
+
+    `int16` quantizes coordinates to 1/`scale` units and falls back to `float32` when a
+    value does not fit.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown segmentation encoding: {encoding}")
+
+    lengths = array("I", [len(polygon) for polygon in polygons])
+    if encoding == "int16":
+        quantized = [value for polygon in polygons for value in _quantize(polygon, scale, delta)]
+        if all(_INT16_MIN <= value <= _INT16_MAX for value in quantized):
+            header = _HEADER.pack(FORMAT_VERSION, INT16, FLAG_DELTA if delta else 0, scale, len(polygons))
+            return header + _to_bytes(lengths) + _to_bytes(array("h", quantized))
+
+    values = array("f", [value for polygon in polygons for value in polygon])
+    header = _HEADER.pack(FORMAT_VERSION, FLOAT32, 0, 1.0, len(polygons))
+    return header + _to_bytes(lengths) + _to_bytes(values)
+
+
+def decode_polygons(data: bytes) -> List[List[float]]:
+    """Unpack a blob produced by `encode_polygons`"""
+    data = bytes(data)
+    version, encoding, flags, scale, count = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported segmentation format version: {version}")
+
+    offset = _HEADER.size
+    lengths = _from_bytes("I", data[offset:offset + 4 * count])
+    offset += 4 * count
+
+    values = _from_bytes("h" if encoding == INT16 else "f", data[offset:])
+    polygons, start = [], 0
+    for length in lengths:
+        chunk = values[start:start + length]
+        start += length
+        if encoding == INT16:
+            polygons.append(_dequantize(chunk.tolist(), scale, bool(flags & FLAG_DELTA)))
+        else:
+            polygons.append(chunk.tolist())
+    return polygons
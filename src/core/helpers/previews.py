@@ -0,0 +1,85 @@
+import io
+import math
+import posixpath
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    # Pillow is imported by the rendering worker, not by every handler that only needs the keys
+    from PIL import Image
+
+# Longest side of each rendition, smallest first; the original is always kept as is
+RENDITIONS: Dict[str, int] = {
+    "thumbnail": 256,
+    "screen": 1600,
+    "full": 4096,
+}
+PREVIEW_EXTENSION = "jpg"
+
+
+def previews_prefix(file_path: str) -> str:
+    """Prefix of the previews of a file, next to it: exams/e1.png -> exams/e1.previews/"""
+    return f"{posixpath.splitext(file_path)[0]}.previews/"
+
+
+def _version_prefix(file_path: str, etag: str) -> str:
+    # Each version of the source gets its own renditions, so a render of a replaced file never overwrites newer ones
+    version = etag.strip('"')
+    return f"{previews_prefix(file_path)}{version}/"
+
+
+def rendition_key(file_path: str, etag: str, name: str) -> str:
+    return f"{_version_prefix(file_path, etag)}{name}.{PREVIEW_EXTENSION}"
+
+
+def tile_key(file_path: str, etag: str, column: int, row: int) -> str:
+    return f"{_version_prefix(file_path, etag)}tiles/{column}_{row}.{PREVIEW_EXTENSION}"
+
+
+def manifest_key(file_path: str) -> str:
+    return f"{previews_prefix(file_path)}manifest.json"
+
+
+def _encode(image: "Image.Image", quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def render_previews(
+        source: Union[str, bytes],
+        quality: int = 85,
+        tile_size: Optional[int] = None,
+) -> Tuple[Dict[str, Tuple[bytes, int, int]], Dict[Tuple[int, int], bytes]]:
+    """
+    Renditions (name -> (jpeg, width, height)) and tiles ((column, row) -> jpeg) of an image
+    (a file path, or its bytes).
+
+    CPU bound: meant to run in a worker process. Renditions are downscaled from
+    the next larger one, largest first, so the full-resolution pixels are only
+    resampled once.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    # JPEG sources can be decoded straight at a reduced scale
+    image.draft("RGB", (RENDITIONS["full"], RENDITIONS["full"]))
+    image = image.convert("RGB")
+
+    renditions = {}
+    for name, longest_side in sorted(RENDITIONS.items(), key=lambda rendition: -rendition[1]):
+        if max(image.size) > longest_side:
+            image = image.copy()
+            image.thumbnail((longest_side, longest_side), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        renditions[name] = (_encode(image, quality), image.width, image.height)
+        if name == "full":
+            full = image
+
+    tiles = {}
+    if tile_size:
+        for row in range(math.ceil(full.height / tile_size)):
+            for column in range(math.ceil(full.width / tile_size)):
+                box = (column * tile_size, row * tile_size,
+                       min((column + 1) * tile_size, full.width), min((row + 1) * tile_size, full.height))
+                tiles[(column, row)] = _encode(full.crop(box), quality)
+
+    return renditions, tiles
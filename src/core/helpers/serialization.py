@@ -0,0 +1,64 @@
+import json
+from enum import Enum
+from decimal import Decimal
+from datetime import date, datetime, time
+from typing import Any, Callable
+
+from core.config.env import ENV
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same JSON, only slower
+    orjson = None
+
+# Every value orjson does not encode natively goes through `_default`; the stdlib backend
+# encodes the same types to the same JSON (compact separators, UTF-8, ISO-8601 datetimes).
+
+
+def _default(value: Any) -> Any:
+    """JSON-compatible form of the values neither encoder handles on its own"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value) if value % 1 else int(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars, without importing NumPy
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return _default(value)
+
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_stdlib_default)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return _encoder.encode(value).encode()
+
+
+def _backend() -> str:
+    if ENV.JSON_SERIALIZER == "orjson" and orjson is None:
+        raise ImportError("JSON_SERIALIZER=orjson but orjson is not installed")
+    return "orjson" if ENV.JSON_SERIALIZER != "stdlib" and orjson is not None else "stdlib"
+
+
+BACKEND = _backend()
+
+dumps: Callable[[Any], bytes] = _orjson_dumps if BACKEND == "orjson" else _stdlib_dumps
+loads: Callable[[Any], Any] = orjson.loads if BACKEND == "orjson" else json.loads
+
+
+def dumps_str(value: Any) -> str:
+    """JSON text of the value (Lambda proxy bodies are strings)"""
+    return dumps(value).decode()
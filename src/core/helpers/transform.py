@@ -1,11 +1,15 @@
+from pytz import UTC
 from decimal import Decimal
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
-from fastapi import Request
-from typing import Dict, Any, Optional
+if TYPE_CHECKING:
+    # FastAPI costs most of a Lambda cold start and only the local API calls this
+    from fastapi import Request
 
 
 async def fastapi_request_to_lambda_event(
-        request: Request,
+        request: "Request",
         body_override: str = None,
         token: Optional[str] = None,
 ) -> Dict[str, Any]:
@@ -49,3 +53,33 @@ def decimal_to_number(value: Any) -> Any:
         return {key: decimal_to_number(val) for key, val in value.items()}
     else:
         return value
+
+
+def number_to_decimal(value: Any) -> Any:
+    """Convert floats (boto3 rejects them) to Decimal, recursively"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    elif isinstance(value, list):
+        return [number_to_decimal(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: number_to_decimal(val) for key, val in value.items()}
+    else:
+        return value
+
+
+def date_range_to_timestamps(date_range: Tuple[str, str]) -> Tuple[Decimal, Decimal]:
+    """
+    Convert an ISO-8601 (start, end) range to epoch seconds.
+
+    Naive values are taken as UTC and a date-only end (YYYY-MM-DD) covers the whole day.
+    """
+    start, end = date_range
+    start_at = datetime.fromisoformat(start)
+    end_at = datetime.fromisoformat(end)
+    if len(end) == 10:
+        end_at += timedelta(days=1) - timedelta(microseconds=1)
+    if start_at.tzinfo is None:
+        start_at = start_at.replace(tzinfo=UTC)
+    if end_at.tzinfo is None:
+        end_at = end_at.replace(tzinfo=UTC)
+    return Decimal(str(start_at.timestamp())), Decimal(str(end_at.timestamp()))
@@ -1,27 +1,176 @@
+import threading
+from typing import Any, Callable, Dict, Tuple
+
 import boto3
+from botocore.config import Config
 
 from core.config.env import ENV
+from core.infra.metrics import instrument_client
 
 
 class AWS:
+    """
+    Process-wide registry of boto3 clients and resources.
+
+    Instances are created lazily on first use and then shared by every request
+    handled by the process (and by every warm invocation of a Lambda container),
+    so the underlying HTTP connection pool and its keep-alive connections are
+    reused instead of paying a new session and TLS handshake per request.
+    """
+
+    _lock = threading.Lock()
+    _session = None
+    _instances: Dict[Tuple[str, str], Any] = {}
+    _hits = 0
+    _misses = 0
+
     @staticmethod
-    def get_dynamodb_resource():
-        if ENV.STAGE == "test":
-            return boto3.resource(
-                'dynamodb',
-                region_name='us-east-1',
-                endpoint_url='http://localhost:8000',
-            )
-        return boto3.resource("dynamodb")
+    def get_config() -> Config:
+        """Build the botocore config shared by every client"""
+        return Config(
+            max_pool_connections=ENV.AWS_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=ENV.AWS_TCP_KEEPALIVE,
+            connect_timeout=ENV.AWS_CONNECT_TIMEOUT,
+            read_timeout=ENV.AWS_READ_TIMEOUT,
+            retries={"max_attempts": ENV.AWS_MAX_RETRIES, "mode": ENV.AWS_RETRY_MODE},
+        )
+
+    @classmethod
+    def _get_or_create(cls, key: Tuple[str, str], factory: Callable[[boto3.session.Session], Any]) -> Any:
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    # boto3 sessions are not thread-safe, so they are only touched under the lock
+                    if cls._session is None:
+                        cls._session = boto3.session.Session()
+                    instance = factory(cls._session)
+                    instrument_client(instance.meta.client if key[0] == "resource" else instance)
+                    cls._instances[key] = instance
+                    cls._misses += 1
+                    return instance
+        with cls._lock:
+            cls._hits += 1
+        return instance
 
     @staticmethod
-    def get_s3_client():
-        if ENV.STAGE == "test":
-            return boto3.client(
+    def _dynamodb_arguments() -> Dict[str, Any]:
+        """Endpoint (and placeholder region/credentials) of DynamoDB clients for the configured engine"""
+        if ENV.DYNAMO_ENGINE == "memory":
+            # Never contacted: every call is answered by the in-process engine before it is sent
+            return {
+                "region_name": "us-east-1",
+                "endpoint_url": "http://dynamodb.memory",
+                "aws_access_key_id": "memory",
+                "aws_secret_access_key": "memory",
+            }
+        if ENV.DYNAMO_ENDPOINT:
+            return {"region_name": "us-east-1", "endpoint_url": ENV.DYNAMO_ENDPOINT}
+        return {}
+
+    @staticmethod
+    def _attach_engine(client) -> None:
+        if ENV.DYNAMO_ENGINE == "memory":
+            from core.database.memory.engine import get_memory_engine
+
+            get_memory_engine().attach(client)
+
+    @classmethod
+    def get_dynamodb_resource(cls):
+        def factory(session: boto3.session.Session):
+            resource = session.resource("dynamodb", config=cls.get_config(), **cls._dynamodb_arguments())
+            cls._attach_engine(resource.meta.client)
+            return resource
+
+        return cls._get_or_create(("resource", "dynamodb"), factory)
+
+    @classmethod
+    def get_dynamodb_client(cls):
+        """Low-level client returning raw (wire-format) attribute values"""
+        def factory(session: boto3.session.Session):
+            client = session.client("dynamodb", config=cls.get_config(), **cls._dynamodb_arguments())
+            cls._attach_engine(client)
+            return client
+
+        return cls._get_or_create(("client", "dynamodb"), factory)
+
+    @classmethod
+    def get_s3_client(cls):
+        def factory(session: boto3.session.Session):
+            if ENV.STAGE == "test":
+                return session.client(
+                    "s3",
+                    endpoint_url="http://minio:9000",
+                    aws_access_key_id="minioadmin",
+                    aws_secret_access_key="minioadmin",
+                    region_name="us-east-1",
+                    config=cls.get_config(),
+                )
+            return session.client("s3", config=cls.get_config())
+
+        return cls._get_or_create(("client", "s3"), factory)
+
+    @classmethod
+    def get_s3_presign_client(cls):
+        """
+        S3 client used only to sign URLs handed to browsers.
+
+        The signature covers the host, so when the API reaches object storage
+        through an internal address (e.g. MinIO inside docker) the URLs must be
+        signed for S3_PUBLIC_ENDPOINT instead.
+        """
+        if not ENV.S3_PUBLIC_ENDPOINT:
+            return cls.get_s3_client()
+
+        def factory(session: boto3.session.Session):
+            credentials = {}
+            if ENV.STAGE == "test":
+                credentials = {"aws_access_key_id": "minioadmin", "aws_secret_access_key": "minioadmin"}
+            return session.client(
                 "s3",
-                endpoint_url="http://minio:9000",
-                aws_access_key_id="minioadmin",
-                aws_secret_access_key="minioadmin",
-                region_name="us-east-1",
+                endpoint_url=ENV.S3_PUBLIC_ENDPOINT,
+                region_name="us-east-1" if ENV.STAGE == "test" else None,
+                config=cls.get_config(),
+                **credentials,
             )
-        return boto3.client("s3")
+
+        return cls._get_or_create(("client", "s3_presign"), factory)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Registry hits/misses and, per service, HTTP connections opened vs. requests sent"""
+        pools = {}
+        for (kind, service), instance in list(cls._instances.items()):
+            client = instance.meta.client if kind == "resource" else instance
+            connections, requests = 0, 0
+            manager = getattr(getattr(client, "_endpoint", None), "http_session", None)
+            manager = getattr(manager, "_manager", None)
+            if manager is not None:
+                for pool_key in manager.pools.keys():
+                    pool = manager.pools.get(pool_key)
+                    connections += getattr(pool, "num_connections", 0)
+                    requests += getattr(pool, "num_requests", 0)
+            pools[f"{service}_{kind}"] = {
+                "new_connections": connections,
+                "requests": requests,
+                "reused_connections": max(requests - connections, 0),
+            }
+
+        return {
+            "registry_hits": cls._hits,
+            "registry_misses": cls._misses,
+            "pools": pools,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every cached client, closing their connection pools"""
+        with cls._lock:
+            for (kind, _), instance in cls._instances.items():
+                client = instance.meta.client if kind == "resource" else instance
+                client.close()
+            cls._instances.clear()
+            cls._session = None
+            cls._hits = 0
+            cls._misses = 0
@@ -0,0 +1,97 @@
+import time
+import threading
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from core.config.env import ENV
+
+
+class ICacheBackend:
+    """String key/value store with per-entry expiry"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Value of the key, or None when absent or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store the value for `ttl` seconds"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop the key"""
+        pass
+
+    def stats(self) -> Dict[str, object]:
+        return {}
+
+
+class InMemoryCache(ICacheBackend):
+    """Bounded LRU with per-entry TTL, private to the process"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"backend": "memory", "size": len(self._entries), "evictions": self._evictions}
+
+
+class RedisCache(ICacheBackend):
+    """Redis shared by every worker (and Lambda container); `redis` is only needed when this is used"""
+
+    def __init__(self, url: str, prefix: str = "ecg:"):
+        import redis
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=ENV.AWS_READ_TIMEOUT, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def stats(self) -> Dict[str, object]:
+        return {"backend": "redis"}
+
+
+def get_cache_backend(name: str, max_size: int) -> Optional[ICacheBackend]:
+    """Backend selected by name ("memory", "redis" or "none")"""
+    if name == "memory":
+        return InMemoryCache(max_size)
+    if name == "redis":
+        return RedisCache(ENV.REDIS_URL)
+    return None
@@ -0,0 +1,44 @@
+import time
+import logging
+import threading
+from typing import Any, Callable
+
+from core.config.env import ENV
+from core.infra.metrics import HANDLER_INIT
+
+logger = logging.getLogger(__name__)
+
+# Set when the module is first imported, i.e. once per Lambda execution environment
+PROCESS_STARTED = time.perf_counter()
+
+_lock = threading.Lock()
+_cold = True
+
+
+def take_cold_start() -> bool:
+    """True for the first invocation of the process only"""
+    global _cold
+    with _lock:
+        cold, _cold = _cold, False
+    return cold
+
+
+def prewarm(handler: str, *factories: Callable[[], Any]) -> None:
+    """
+    Build a handler's long-lived resources now when HANDLER_INIT is "eager".
+
+    Called at the bottom of each Lambda module, so with "eager" the boto3 clients,
+    repositories and keys are created during the init phase (full CPU, not billed
+    to the first request) and kept by the factories' caches across invocations.
+    A factory that fails is logged and retried by the first invocation instead of
+    failing the import.
+    """
+    if ENV.HANDLER_INIT != "eager":
+        return
+    started = time.perf_counter()
+    for factory in factories:
+        try:
+            factory()
+        except Exception as e:
+            logger.error(f"Error prewarming {handler}: {e}")
+    HANDLER_INIT.set(time.perf_counter() - started, handler=handler)
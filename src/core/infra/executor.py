@@ -0,0 +1,167 @@
+import asyncio
+import weakref
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+from core.config.env import ENV
+from core.helpers.errors import HttpException
+
+T = TypeVar("T")
+
+
+class IOExecutor:
+    """
+    Bounded thread pool for blocking I/O (boto3 calls) issued from async routes.
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait for
+    a free worker; anything beyond that is rejected with a 503 instead of piling
+    up, so one slow DynamoDB call never stalls the event loop.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "io"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _call(self, context: contextvars.Context, func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with self._lock:
+            self._active += 1
+        try:
+            result = context.run(func, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+        return result
+
+    def _admit(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HttpException(status_code=503, message="Servidor sobrecarregado, tente novamente em instantes.")
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _submit(self, func: Callable[..., T], args: tuple, kwargs: dict) -> "Future[T]":
+        """Admit and queue `func`; its slot is freed when the call itself finishes, not when its caller stops waiting"""
+        self._admit()
+        try:
+            future = self._executor.submit(self._call, contextvars.copy_context(), func, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `func` on the pool and await its result"""
+        return await asyncio.wrap_future(self._submit(func, args, kwargs))
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `func` on the pool from synchronous code (e.g. a use case) and wait for its result"""
+        return self._submit(func, args, kwargs).result()
+
+    def _end_stream(self, close: Optional[Callable[[], Any]]) -> None:
+        try:
+            if close:
+                close()
+        finally:
+            self._release()
+
+    def stream(
+            self,
+            read: Callable[[int], bytes],
+            chunk_size: int,
+            buffer_chunks: int,
+            close: Optional[Callable[[], Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Chunks of a blocking stream (e.g. a boto3 StreamingBody) read on the pool.
+
+        The stream is admitted here, once for its whole life: it holds one slot (at
+        most one of its reads runs at a time), so an overloaded pool answers 503
+        before the response starts instead of cutting a body short. Reading runs
+        ahead of the consumer by at most `buffer_chunks` chunks, so a slow client
+        never makes the process hold more than that per stream. `close` runs when
+        the stream ends or the consumer goes away, after any read still running.
+        """
+        self._admit()
+        reading: Optional[Future] = None
+
+        async def chunks() -> AsyncIterator[bytes]:
+            buffer: asyncio.Queue = asyncio.Queue(maxsize=buffer_chunks)
+
+            async def produce():
+                nonlocal reading
+                try:
+                    while True:
+                        reading = self._executor.submit(self._call, contextvars.copy_context(), read, (chunk_size,), {})
+                        chunk = await asyncio.wrap_future(reading)
+                        await buffer.put(chunk)
+                        if not chunk:
+                            return
+                except Exception as e:
+                    await buffer.put(e)
+
+            producer = asyncio.create_task(produce())
+            try:
+                while True:
+                    chunk = await buffer.get()
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    if not chunk:
+                        return
+                    yield chunk
+            finally:
+                producer.cancel()
+                # A cancelled read may still be running on a worker: close the body once it returns
+                if reading is None:
+                    end()
+                else:
+                    reading.add_done_callback(lambda _: end())
+
+        iterator = chunks()
+        # Runs at most once; also frees the slot of a stream whose response never started iterating it
+        end = weakref.finalize(iterator, self._end_stream, close)
+        return iterator
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size, queue depth and counters"""
+        with self._lock:
+            return {
+                "pool_size": self.max_workers,
+                "max_queue_depth": self.max_queue,
+                "active": self._active,
+                "queued": max(self._in_flight - self._active, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+IO_EXECUTOR = IOExecutor(ENV.IO_POOL_SIZE, ENV.IO_QUEUE_DEPTH)
+
+# Password hashing is CPU bound (hashlib releases the GIL while hashing): its own small pool keeps
+# login bursts from taking every I/O worker, and its short queue turns them away with a 503 early
+PASSWORD_EXECUTOR = IOExecutor(ENV.PASSWORD_POOL_SIZE, ENV.PASSWORD_QUEUE_DEPTH, name="password")
@@ -0,0 +1,281 @@
+import time
+import bisect
+import threading
+import contextvars
+from abc import ABC, abstractmethod
+from functools import wraps
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Process-wide metrics in the Prometheus text format, with no client library needed.
+#
+# Each request (HTTP route or Lambda invocation) also gets a RequestMetrics in a context
+# variable; the botocore hooks and repo timers add to it, so DynamoDB capacity and S3 bytes
+# can be attributed to the route that caused them. IOExecutor copies the context into its
+# threads, so work offloaded from a request still counts towards it.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines of the metric in the Prometheus text format"""
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+        # per label set: [count per bucket (+Inf last)], sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    bucket = 'le="' + str(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bucket)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total[0]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+HTTP_REQUESTS = METRICS.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")))
+HTTP_LATENCY = METRICS.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the last body byte", ("method", "route")))
+HTTP_IN_FLIGHT = METRICS.register(Gauge(
+    "http_requests_in_flight", "HTTP requests being handled", ("method", "route")))
+REPO_CALLS = METRICS.register(Counter(
+    "repository_calls_total", "Repository method calls", ("repository", "method", "outcome")))
+REPO_LATENCY = METRICS.register(Histogram(
+    "repository_call_duration_seconds", "Repository method latency", ("repository", "method")))
+DYNAMO_CAPACITY = METRICS.register(Counter(
+    "dynamodb_consumed_capacity_units_total", "DynamoDB capacity units consumed", ("route", "table", "operation")))
+DYNAMO_CALLS = METRICS.register(Counter(
+    "dynamodb_calls_total", "DynamoDB API calls", ("route", "operation")))
+S3_BYTES = METRICS.register(Counter(
+    "s3_bytes_total", "Bytes sent to (upload) or received from (download) S3", ("route", "direction", "operation")))
+HANDLER_INIT = METRICS.register(Gauge(
+    "handler_init_seconds", "Time spent building a handler's resources before its first invocation", ("handler",)))
+
+
+class RequestMetrics:
+    """What one request consumed, filled in from any thread working on its behalf"""
+
+    def __init__(self, route: str = ""):
+        self.route = route
+        self._lock = threading.Lock()
+        self.capacity: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.dynamo_calls: Dict[str, int] = defaultdict(int)
+        self.s3_bytes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.repo_calls: Dict[str, List[float]] = defaultdict(list)
+
+    def add_capacity(self, table: str, operation: str, units: float) -> None:
+        with self._lock:
+            self.capacity[(table, operation)] += units
+
+    def add_dynamo_call(self, operation: str) -> None:
+        with self._lock:
+            self.dynamo_calls[operation] += 1
+
+    def add_s3_bytes(self, direction: str, operation: str, size: int) -> None:
+        with self._lock:
+            self.s3_bytes[(direction, operation)] += size
+
+    def add_repo_call(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.repo_calls[name].append(seconds)
+
+    def flush(self, route: str) -> None:
+        """Add the request totals to the process metrics under its route"""
+        with self._lock:
+            for (table, operation), units in self.capacity.items():
+                DYNAMO_CAPACITY.inc(units, route=route, table=table, operation=operation)
+            for operation, calls in self.dynamo_calls.items():
+                DYNAMO_CALLS.inc(calls, route=route, operation=operation)
+            for (direction, operation), size in self.s3_bytes.items():
+                S3_BYTES.inc(size, route=route, direction=direction, operation=operation)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals for a structured log line"""
+        with self._lock:
+            return {
+                "dynamodb_capacity_units": round(sum(self.capacity.values()), 4),
+                "dynamodb_calls": dict(self.dynamo_calls),
+                "s3_bytes": {f"{direction}:{operation}": size for (direction, operation), size in self.s3_bytes.items()},
+                "repository_ms": {name: round(sum(calls) * 1000, 3) for name, calls in self.repo_calls.items()},
+            }
+
+
+CURRENT_REQUEST: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "current_request_metrics", default=None,
+)
+
+
+def timed_repository(cls):
+    """Class decorator timing and counting every public method of a repository"""
+    repository = cls.__name__
+
+    def wrap(name: str, method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = method(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                REPO_CALLS.inc(repository=repository, method=name, outcome=outcome)
+                REPO_LATENCY.observe(elapsed, repository=repository, method=name)
+                request = CURRENT_REQUEST.get()
+                if request is not None:
+                    request.add_repo_call(f"{repository}.{name}", elapsed)
+
+        return wrapper
+
+    for name, method in list(vars(cls).items()):
+        if callable(method) and not name.startswith("_") and not isinstance(method, (staticmethod, classmethod)):
+            setattr(cls, name, wrap(name, method))
+    return cls
+
+
+# botocore hooks, registered on every client by the AWS registry
+
+DYNAMO_CAPACITY_OPERATIONS = {
+    "GetItem", "PutItem", "UpdateItem", "DeleteItem", "Query", "Scan",
+    "BatchGetItem", "BatchWriteItem", "TransactGetItems", "TransactWriteItems",
+}
+
+
+def _request_capacity(params: Dict[str, Any], model, **kwargs) -> None:
+    if model.name in DYNAMO_CAPACITY_OPERATIONS:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _record_capacity(parsed: Dict[str, Any], model, **kwargs) -> None:
+    request = CURRENT_REQUEST.get()
+    if request is None:
+        return
+    request.add_dynamo_call(model.name)
+    consumed = parsed.get("ConsumedCapacity")
+    for entry in consumed if isinstance(consumed, list) else [consumed] if consumed else []:
+        request.add_capacity(entry.get("TableName", ""), model.name, float(entry.get("CapacityUnits", 0)))
+
+
+def _record_upload(params: Dict[str, Any], model, **kwargs) -> None:
+    request = CURRENT_REQUEST.get()
+    body = params.get("Body")
+    if request is None or body is None:
+        return
+    try:
+        size = len(body)
+    except TypeError:
+        return
+    request.add_s3_bytes("upload", model.name, size)
+
+
+def _record_download(parsed: Dict[str, Any], model, **kwargs) -> None:
+    request = CURRENT_REQUEST.get()
+    if request is not None and parsed.get("ContentLength"):
+        request.add_s3_bytes("download", model.name, int(parsed["ContentLength"]))
+
+
+def instrument_client(client) -> None:
+    """Register the capacity / transfer hooks on a boto3 client"""
+    service = client.meta.service_model.service_name
+    events = client.meta.events
+    if service == "dynamodb":
+        events.register("provide-client-params.dynamodb.*", _request_capacity)
+        events.register("after-call.dynamodb.*", _record_capacity)
+    elif service == "s3":
+        for operation in ("PutObject", "UploadPart"):
+            events.register(f"provide-client-params.s3.{operation}", _record_upload)
+        events.register("after-call.s3.GetObject", _record_download)
@@ -0,0 +1,74 @@
+import time
+from typing import Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.infra.metrics import (
+    CURRENT_REQUEST,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    RequestMetrics,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _match_route(routes, scope: Scope, prefix: str = "") -> Optional[str]:
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match != Match.FULL:
+            continue
+        # mounts and included routers hold their own routes
+        nested = getattr(route, "routes", None) or getattr(getattr(route, "original_router", None), "routes", None)
+        if nested:
+            return _match_route(nested, {**scope, **child_scope}, prefix + getattr(route, "path", ""))
+        return prefix + getattr(route, "path", UNMATCHED_ROUTE)
+    return None
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route serving the request (e.g. /exams/{exam_id}/file), never the raw path"""
+    routes = getattr(getattr(scope.get("app"), "router", None), "routes", [])
+    return _match_route(routes, scope) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request until its last body byte and attributes what it consumed
+    (DynamoDB capacity, S3 bytes, repository calls) to its route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses are neither
+    buffered nor cut short by the measurement.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, route = scope["method"], route_template(scope)
+        request = RequestMetrics(route)
+        token = CURRENT_REQUEST.set(request)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            request.flush(route)
+            CURRENT_REQUEST.reset(token)
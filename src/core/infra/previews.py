@@ -0,0 +1,156 @@
+import logging
+import json
+import tempfile
+import posixpath
+import threading
+import multiprocessing
+from typing import Any, Dict, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from core.infra.aws import AWS
+from core.config.env import ENV
+from core.helpers.previews import render_previews, rendition_key, tile_key, manifest_key, RENDITIONS
+
+logger = logging.getLogger(__name__)
+
+
+class Previews:
+    """
+    Downscaled renditions (and optional tiles) of the exam files, stored next to them.
+
+    Image decoding and resampling run in a process pool, never on request threads
+    (inline in Lambda, which cannot run multiprocessing pools and serves one
+    request per container anyway). Sources are spooled to a temporary file rather
+    than held in memory. Each file is rendered at most once at a time per process,
+    and the manifest written last tells readers which renditions exist, how large
+    they are and which version (ETag) of the file they were rendered from.
+    """
+
+    _lock = threading.Lock()
+    _processes: Optional[ProcessPoolExecutor] = None
+    _background: Optional[ThreadPoolExecutor] = None
+    _pending: Dict[str, Future] = {}
+
+    @classmethod
+    def _process_pool(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._processes is None:
+                # spawn: forking a process full of threads (boto3, executors) can deadlock the child
+                cls._processes = ProcessPoolExecutor(
+                    max_workers=ENV.PREVIEW_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return cls._processes
+
+    @staticmethod
+    def get_manifest(file_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = AWS.get_s3_client().get_object(Bucket=ENV.BUCKET_NAME, Key=manifest_key(file_path))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return json.loads(response["Body"].read())
+
+    @staticmethod
+    def source_etag(file_path: str) -> str:
+        return AWS.get_s3_client().head_object(Bucket=ENV.BUCKET_NAME, Key=file_path)["ETag"]
+
+    @classmethod
+    def _render(cls, source_path: str) -> tuple:
+        args = (source_path, ENV.PREVIEW_QUALITY, ENV.PREVIEW_TILE_SIZE or None)
+        if ENV.PREVIEW_POOL == "inline":
+            return render_previews(*args)
+        return cls._process_pool().submit(render_previews, *args).result()
+
+    @classmethod
+    def _generate(cls, file_path: str) -> Dict[str, Any]:
+        s3 = AWS.get_s3_client()
+        source = s3.get_object(Bucket=ENV.BUCKET_NAME, Key=file_path)
+        etag = source["ETag"]
+        if source["ContentLength"] > ENV.PREVIEW_MAX_SOURCE_MB * 1024 * 1024:
+            source["Body"].close()
+            raise ValueError(f"{file_path} is too large to preview ({source['ContentLength']} bytes)")
+
+        with tempfile.NamedTemporaryFile(suffix=posixpath.splitext(file_path)[1]) as spool:
+            for chunk in source["Body"].iter_chunks(ENV.FILE_STREAM_CHUNK_KB * 1024):
+                spool.write(chunk)
+            spool.flush()
+            renditions, tiles = cls._render(spool.name)
+
+        manifest = {"source": file_path, "etag": etag, "renditions": {}, "tiles": None}
+        for name, (data, width, height) in renditions.items():
+            key = rendition_key(file_path, etag, name)
+            s3.put_object(Bucket=ENV.BUCKET_NAME, Key=key, Body=data, ContentType="image/jpeg")
+            manifest["renditions"][name] = {"key": key, "width": width, "height": height}
+        for (column, row), data in tiles.items():
+            s3.put_object(Bucket=ENV.BUCKET_NAME, Key=tile_key(file_path, etag, column, row), Body=data,
+                          ContentType="image/jpeg")
+        if tiles:
+            manifest["tiles"] = {
+                "size": ENV.PREVIEW_TILE_SIZE,
+                "columns": max(column for column, _ in tiles) + 1,
+                "rows": max(row for _, row in tiles) + 1,
+            }
+
+        s3.put_object(Bucket=ENV.BUCKET_NAME, Key=manifest_key(file_path), Body=json.dumps(manifest),
+                      ContentType="application/json")
+        return manifest
+
+    @classmethod
+    def generate(cls, file_path: str) -> Dict[str, Any]:
+        """Render and store the previews of a file; concurrent callers share one rendering"""
+        with cls._lock:
+            future = cls._pending.get(file_path)
+            owner = future is None
+            if owner:
+                future = cls._pending[file_path] = Future()
+
+        if not owner:
+            return future.result()
+        try:
+            manifest = cls._generate(file_path)
+            future.set_result(manifest)
+            return manifest
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with cls._lock:
+                cls._pending.pop(file_path, None)
+
+    @classmethod
+    def ensure(cls, file_path: str) -> Dict[str, Any]:
+        """Manifest of the previews of the current file, rendering them on first request or once it is replaced"""
+        manifest = cls.get_manifest(file_path)
+        if manifest and manifest.get("etag") == cls.source_etag(file_path):
+            return manifest
+        return cls.generate(file_path)
+
+    @classmethod
+    def schedule(cls, file_path: str) -> None:
+        """Render the previews in the background (e.g. right after an upload), replacing older ones"""
+        with cls._lock:
+            if cls._background is None:
+                cls._background = ThreadPoolExecutor(max_workers=ENV.PREVIEW_WORKERS, thread_name_prefix="preview")
+            background = cls._background
+
+        def run():
+            try:
+                cls.generate(file_path)
+            except Exception as e:
+                logger.error(f"Error generating previews of {file_path}: {e}")
+
+        background.submit(run)
+
+    @staticmethod
+    def pick(manifest: Dict[str, Any], width: Optional[int] = None, height: Optional[int] = None) -> str:
+        """Smallest rendition covering the requested display size (the largest one if none does)"""
+        renditions = sorted(RENDITIONS, key=RENDITIONS.get)
+        for name in renditions:
+            rendition = manifest["renditions"][name]
+            if rendition["width"] >= (width or 0) and rendition["height"] >= (height or 0):
+                return name
+        return renditions[-1]
@@ -0,0 +1,32 @@
+from typing import Any
+
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from core.helpers.serialization import dumps
+
+# Media types never worth gzipping: already compressed, or exam files streamed as they are stored
+UNCOMPRESSED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/pdf",
+    "application/octet-stream",
+    "image/*",
+    "audio/*",
+    "video/*",
+    "text/event-stream",
+)
+
+
+class JSONResponse(StarletteJSONResponse):
+    """
+    JSON response encoded in one pass by core.helpers.serialization (orjson when installed).
+
+    Encodes pydantic models, datetimes, enums, Decimals and NumPy arrays as they
+    are. Routes with a response_model should keep FastAPI's default response
+    class: FastAPI then serializes them straight to bytes with pydantic's own
+    encoder, which setting any response class turns off.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,167 @@
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.infra.aws import AWS
+from core.config.env import ENV
+
+MB = 1024 * 1024
+MIN_PART_SIZE = 5 * MB  # S3 rejects smaller parts (but the last one)
+MAX_PARTS = 10000
+
+
+class PresignedUrlCache:
+    """
+    LRU of presigned GET URLs per exam.
+
+    A URL is handed out again for `reuse` seconds after it was issued (never once
+    less than half of its lifetime is left), so a viewer reloading the same exam
+    gets the same URL (and the browser cache hit) without re-signing, and nobody
+    ever gets a URL about to expire. The cache is per process: invalidating an
+    entry does not reach the other workers, so `reuse` bounds how long they may
+    keep handing out a URL of a deleted exam.
+    """
+
+    def __init__(self, max_size: int, ttl: int, reuse: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.reuse = min(reuse, ttl / 2)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, exam_id: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            # URLs were issued ttl seconds before they expire
+            if entry and time.time() <= entry[1] - self.ttl + self.reuse:
+                self._entries.move_to_end(exam_id)
+                self._hits += 1
+                return entry
+            self._misses += 1
+            return None
+
+    def put(self, exam_id: str, url: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[exam_id] = (url, expires_at)
+            self._entries.move_to_end(exam_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, exam_id: str) -> None:
+        with self._lock:
+            self._entries.pop(exam_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+class FileStorage:
+    """Presigned access to the exam files, so their bytes never go through the API"""
+
+    url_cache = PresignedUrlCache(
+        ENV.PRESIGNED_URL_CACHE_SIZE, ENV.PRESIGNED_URL_TTL, ENV.PRESIGNED_URL_REUSE_SECONDS
+    )
+
+    @staticmethod
+    def part_size(size: int) -> int:
+        """Part size of a multipart upload of `size` bytes (configured size, grown to fit S3's part limit)"""
+        part_size = max(ENV.MULTIPART_PART_SIZE_MB * MB, MIN_PART_SIZE)
+        return max(part_size, math.ceil(size / MAX_PARTS))
+
+    @staticmethod
+    def is_multipart(size: int) -> bool:
+        return size > ENV.MULTIPART_THRESHOLD_MB * MB
+
+    @classmethod
+    def cached_download_url(cls, exam_id: str) -> Optional[Tuple[str, float]]:
+        """Download URL issued earlier for the exam, while it is fresh enough to hand out again"""
+        return cls.url_cache.get(exam_id)
+
+    @classmethod
+    def download_url(cls, exam_id: str, key: str) -> Tuple[str, float]:
+        """Presigned GET URL of the exam file and its expiry (epoch seconds)"""
+        url, expires_at = cls.presign_get(key)
+        cls.url_cache.put(exam_id, url, expires_at)
+        return url, expires_at
+
+    @staticmethod
+    def presign_get(key: str) -> Tuple[str, float]:
+        """Presigned GET URL of any object of the bucket and its expiry (epoch seconds)"""
+        expires_at = time.time() + ENV.PRESIGNED_URL_TTL
+        url = AWS.get_s3_presign_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": ENV.BUCKET_NAME, "Key": key},
+            ExpiresIn=ENV.PRESIGNED_URL_TTL,
+        )
+        return url, expires_at
+
+    @staticmethod
+    def open(key: str, byte_range: Optional[str] = None, if_none_match: Optional[str] = None) -> Dict[str, Any]:
+        """GetObject of the exam file (the body is streamed, not read), optionally a single byte range"""
+        params = {"Bucket": ENV.BUCKET_NAME, "Key": key}
+        if byte_range:
+            params["Range"] = byte_range
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        return AWS.get_s3_client().get_object(**params)
+
+    @staticmethod
+    def upload_url(key: str, content_type: str) -> Tuple[str, float]:
+        """Presigned PUT URL for a single-request upload; the client must send the same Content-Type"""
+        expires_at = time.time() + ENV.PRESIGNED_URL_TTL
+        url = AWS.get_s3_presign_client().generate_presigned_url(
+            "put_object",
+            Params={"Bucket": ENV.BUCKET_NAME, "Key": key, "ContentType": content_type},
+            ExpiresIn=ENV.PRESIGNED_URL_TTL,
+        )
+        return url, expires_at
+
+    @classmethod
+    def start_multipart_upload(cls, key: str, content_type: str, size: int) -> Dict[str, Any]:
+        """Create a multipart upload and presign a PUT URL per part"""
+        upload = AWS.get_s3_client().create_multipart_upload(
+            Bucket=ENV.BUCKET_NAME,
+            Key=key,
+            ContentType=content_type,
+        )
+        part_size = cls.part_size(size)
+        client = AWS.get_s3_presign_client()
+        parts = [
+            {
+                "part_number": part_number,
+                "url": client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": ENV.BUCKET_NAME,
+                        "Key": key,
+                        "UploadId": upload["UploadId"],
+                        "PartNumber": part_number,
+                    },
+                    ExpiresIn=ENV.PRESIGNED_URL_TTL,
+                ),
+            }
+            for part_number in range(1, math.ceil(size / part_size) + 1)
+        ]
+        return {
+            "upload_id": upload["UploadId"],
+            "part_size": part_size,
+            "parts": parts,
+            "expires_at": time.time() + ENV.PRESIGNED_URL_TTL,
+        }
+
+    @staticmethod
+    def complete_multipart_upload(key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        """Assemble the uploaded parts (part number, ETag) into the object"""
+        AWS.get_s3_client().complete_multipart_upload(
+            Bucket=ENV.BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [{"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)],
+            },
+        )
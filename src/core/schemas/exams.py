@@ -0,0 +1,95 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+from core.entities import EcgExamSummary
+
+MAX_EXAMS_PER_REQUEST = 500
+MAX_SUMMARIES_PER_PAGE = 100
+
+# Header attributes that can be requested instead of the whole exam
+ExamField = Literal[
+    "file_path",
+    "made_at",
+    "gender",
+    "birth_date",
+    "amplitude",
+    "speed",
+    "approved",
+    "approved_at",
+    "principal_report",
+    "version",
+]
+
+
+class GetExamsRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_EXAMS_PER_REQUEST)
+    fields: Optional[List[ExamField]] = None
+
+
+class GetExamsResponse(BaseModel):
+    exams: List[Dict[str, Any]]
+    missing: List[str]
+
+
+class ListExamSummariesRequest(BaseModel):
+    limit: int = Field(20, ge=1, le=MAX_SUMMARIES_PER_PAGE)
+    cursor: Optional[str] = None
+    approved: Optional[bool] = None
+    order_by: Literal["asc", "desc"] = "asc"
+    start_date: Optional[str] = None  # ISO-8601, both or neither
+    end_date: Optional[str] = None
+
+
+class ListExamSummariesResponse(BaseModel):
+    exams: List[EcgExamSummary]
+    cursor: Optional[str] = None
+
+
+class FileUploadRequest(BaseModel):
+    content_type: str = "application/octet-stream"
+    size: int = Field(..., gt=0)
+
+
+class PresignedPart(BaseModel):
+    part_number: int
+    url: str
+
+
+class FileUploadResponse(BaseModel):
+    """Either a single PUT `url`, or an `upload_id` with one PUT URL per `part_size` bytes"""
+    url: Optional[str] = None
+    headers: Dict[str, str] = {}
+    upload_id: Optional[str] = None
+    part_size: Optional[int] = None
+    parts: List[PresignedPart] = []
+    expires_at: str
+
+
+class UploadedPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+
+class CompleteFileUploadRequest(BaseModel):
+    upload_id: str
+    parts: List[UploadedPart] = Field(..., min_length=1)
+
+
+class FileDownloadResponse(BaseModel):
+    url: str
+    expires_at: str
+
+
+class PreviewTiles(BaseModel):
+    size: int
+    columns: int
+    rows: int
+
+
+class PreviewResponse(BaseModel):
+    rendition: str
+    width: int
+    height: int
+    url: str
+    expires_at: str
+    tiles: Optional[PreviewTiles] = None
@@ -1,20 +1,25 @@
-import json
+import gzip
+import base64
 from datetime import datetime
 
 from pydantic import ValidationError
 from typing import Optional, Dict, Any, Union
 
+from core.config.env import ENV
 from core.entities import User
+from core.helpers.serialization import dumps_str, loads
 
 
 class HTTPRequest:
     body: Optional[Dict[str, str]]
     parms: Optional[Dict[str, str]]
+    path: Optional[Dict[str, str]]
     headers: Optional[Dict[str, str]]
 
     def __init__(self, event: dict, requested_user: Optional[User] = None):
         self.parms = event.get("queryStringParameters")
-        self.body = json.loads(event.get("body")) if event.get("body") else None
+        self.path = event.get("pathParameters") or {}
+        self.body = loads(event.get("body")) if event.get("body") else None
         self.headers = event.get("headers")
         if self.headers and self.headers.get("Authorization"):
             self.headers["Authorization"] = self.headers.get("Authorization").replace("Bearer ", "")
@@ -41,7 +46,7 @@ class HTTPResponse:
         self.body["message"] = self.message
         return {
             "statusCode": self.status_code,
-            "body": json.dumps(self.body) if self.body else None,
+            "body": dumps_str(self.body) if self.body else None,
             "headers": self.headers
         }
 
@@ -78,3 +83,24 @@ class HTTPError(HTTPResponse):
 
     def __repr__(self):
         return str(self)
+
+
+def compress_response(response: dict, accept_encoding: Optional[str]) -> dict:
+    """Gzip a Lambda proxy response body of at least COMPRESSION_MIN_BYTES when the client accepts it"""
+    body = response.get("body")
+    if (
+            not ENV.COMPRESSION_MIN_BYTES
+            or not isinstance(body, str)
+            or response.get("isBase64Encoded")
+            or "gzip" not in (accept_encoding or "")
+    ):
+        return response
+    raw = body.encode()
+    if len(raw) < ENV.COMPRESSION_MIN_BYTES:
+        return response
+    return {
+        **response,
+        "body": base64.b64encode(gzip.compress(raw, compresslevel=ENV.COMPRESSION_LEVEL, mtime=0)).decode(),
+        "isBase64Encoded": True,
+        "headers": {**(response.get("headers") or {}), "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+    }
@@ -1,9 +1,38 @@
-from fastapi import FastAPI
+import inspect
+
+from fastapi import FastAPI, Request
+from starlette.middleware.gzip import GZipMiddleware
+
+from core.config.env import ENV
+from core.helpers.errors import HttpException
+from core.infra.middleware import MetricsMiddleware
+from core.infra.responses import JSONResponse, UNCOMPRESSED_CONTENT_TYPES
 from modules.routers.auth_router import auth_router
+from modules.routers.exams_router import exams_router
+from modules.routers.system_router import system_router
+from modules.routers.metrics_router import metrics_router
 
 app = FastAPI(title="ECG Mss", version="1.0.0", description="ECG Mss API", root_path="/api")
 
 app.include_router(auth_router)
+app.include_router(exams_router)
+app.include_router(system_router)
+app.include_router(metrics_router)
+
+if ENV.COMPRESSION_MIN_BYTES:
+    gzip_options = {"minimum_size": ENV.COMPRESSION_MIN_BYTES, "compresslevel": ENV.COMPRESSION_LEVEL}
+    # Starlette < 1.5 has no exclude_content_types: there everything but event streams gets compressed
+    if "exclude_content_types" in inspect.signature(GZipMiddleware.__init__).parameters:
+        gzip_options["exclude_content_types"] = UNCOMPRESSED_CONTENT_TYPES
+    app.add_middleware(GZipMiddleware, **gzip_options)
+# Added last so it is outermost: latency includes compression
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(HttpException)
+async def http_exception_handler(request: Request, exc: HttpException):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,34 +1,59 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
 from core.helpers.jwt_token import JWToken
-from core.database.database import Database
+from core.infra.executor import PASSWORD_EXECUTOR
+from core.helpers.password import check_password, hash_password, needs_rehash
 from core.schemas.http import HTTPRequest, HTTPResponse
-from core.database.repositories.user.repo import UserRepo
+from core.database.repositories.user.cached_repo import get_user_repo
 from core.schemas.login import LoginRequest, LoginResponse
+from core.infra.cold_start import prewarm
 from core.helpers.errors import HttpException, error_handler
+from core.database.repositories.user.repo_interface import IUserRepo
+
+logger = logging.getLogger(__name__)
 
 
 class UseCase:
-    def __init__(self):
-        database = Database()
-        self.user_repo = UserRepo(database)
+    def __init__(self, user_repo: Optional[IUserRepo] = None):
+        self.user_repo = user_repo if user_repo else get_user_repo()
 
     def __call__(self, login: LoginRequest) -> LoginResponse:
         username = login.username
         password = login.password
 
-        user = self.user_repo.get_user_by_email(username)
-        if not user or user.password != password:
+        user = self.user_repo.get_user_credentials(username)
+        # Unknown e-mails are checked against a dummy hash (built in the pool too) so they cost as much as a wrong password
+        stored = user.password if user else None
+        if not PASSWORD_EXECUTOR.call(check_password, password, stored) or not user:
             raise HttpException(status_code=403, message="E-mail ou Senha estão incorretos, por favor tente novamente!")
 
-        access_token = JWToken.encode(user.email)
+        if needs_rehash(user.password):
+            # Plaintext or outdated hash: store it with the current algorithm and cost now that we know the password
+            upgraded = user.model_copy(update={"password": PASSWORD_EXECUTOR.call(hash_password, password)})
+            if not self.user_repo.update_user(upgraded):
+                logger.warning(f"Error upgrading password hash of {user.email}")
+
+        access_token = JWToken.encode_user(user)
         return LoginResponse(access_token=access_token)
 
 
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
 @error_handler
 def lambda_handler(event, context):
     request = HTTPRequest(event)
     body = LoginRequest(**request.body)
 
-    use_case = UseCase()
+    use_case = get_use_case()
     response = use_case(body)
 
     http_response = HTTPResponse(
@@ -1,38 +1,62 @@
+from pytz import UTC
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
 from core.helpers.jwt_token import JWToken
-from core.database.database import Database
 from core.schemas.http import HTTPRequest, HTTPResponse
-from core.database.repositories.user.repo import UserRepo
-from core.schemas.login import LoginRequest, LoginResponse, MeResponse
+from core.database.repositories.user.cached_repo import get_user_repo
+from core.schemas.login import MeResponse
+from core.infra.cold_start import prewarm
 from core.helpers.errors import HttpException, error_handler
+from core.database.repositories.user.repo_interface import IUserRepo
 
 
 class UseCase:
-    def __init__(self):
-        database = Database()
-        self.user_repo = UserRepo(database)
+    def __init__(self, user_repo: Optional[IUserRepo] = None):
+        self.user_repo = user_repo if user_repo else get_user_repo()
 
     def __call__(self, access_token: str) -> MeResponse:
-        username = JWToken.decode(access_token)
-        if not username:
+        claims = JWToken.decode_claims(access_token)
+        if not claims:
             raise HttpException(status_code=401, message="Token inválido ou expirado!")
 
-        user = self.user_repo.get_user_by_email(username)
+        # Tokens issued with the current claims version describe the user on their own
+        if JWToken.has_profile(claims):
+            return MeResponse(
+                name=claims["name"],
+                email=claims["email"],
+                created_at=datetime.strftime(datetime.fromtimestamp(claims["created_at"], tz=UTC), "%d/%m/%Y %H:%M:%S"),
+                type=claims["type"],
+            )
+
+        user = self.user_repo.get_user_by_email(claims["user_id"])
+        if not user:
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
 
         return MeResponse(
             name=user.name,
             email=user.email,
-            created_at=datetime.strftime(user.created_at, "%d/%m/%Y %H:%M:%S")
+            created_at=datetime.strftime(user.created_at, "%d/%m/%Y %H:%M:%S"),
+            type=user.type.value,
         )
 
 
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
 @error_handler
 def lambda_handler(event, context):
     request = HTTPRequest(event)
     access_token = request.headers.get("Authorization")
 
-    use_case = UseCase()
+    use_case = get_use_case()
     response = use_case(access_token)
 
     http_response = HTTPResponse(
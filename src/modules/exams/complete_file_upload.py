@@ -0,0 +1,69 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from core.infra.previews import Previews
+from core.infra.storage import FileStorage
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.schemas.exams import CompleteFileUploadRequest
+from core.schemas.http import HTTPRequest, HTTPResponse
+from core.infra.cold_start import prewarm
+from core.helpers.errors import HttpException, error_handler
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+logger = logging.getLogger(__name__)
+
+
+class UseCase:
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(self, access_token: str, exam_id: str, request: CompleteFileUploadRequest) -> None:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        exam = self.exam_repo.get_exams_by_ids([exam_id], projection=["file_path"])
+        if not exam or not exam[0]:
+            raise HttpException(status_code=404, message="Exame não encontrado!")
+
+        try:
+            FileStorage.complete_multipart_upload(
+                exam[0].file_path,
+                request.upload_id,
+                [(part.part_number, part.etag) for part in request.parts],
+            )
+        except ClientError as e:
+            logger.error(f"Error completing upload of exam {exam_id}: {e}")
+            raise HttpException(status_code=400, message="Upload inválido ou incompleto, envie as partes novamente!")
+        FileStorage.url_cache.invalidate(exam_id)
+        Previews.schedule(exam[0].file_path)
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
+@error_handler
+def lambda_handler(event, context):
+    request = HTTPRequest(event)
+    access_token = request.headers.get("Authorization")
+    body = CompleteFileUploadRequest(**request.body)
+
+    use_case = get_use_case()
+    use_case(access_token, request.path.get("exam_id"), body)
+
+    http_response = HTTPResponse(
+        status_code=200,
+        message="Upload concluído com sucesso!"
+    )
+
+    return http_response.to_dict()
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Optional
+
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.schemas.http import HTTPRequest, HTTPResponse
+from core.infra.cold_start import prewarm
+from core.helpers.errors import HttpException, error_handler
+from core.schemas.exams import GetExamsRequest, GetExamsResponse
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+# Report authors are embedded as bare references (name and e-mail); the rest is not stored
+_AUTHOR = {"created_by": {"password", "type", "created_at"}}
+_REPORT = {**_AUTHOR, "approves": {"__all__": _AUTHOR}}
+EXAM_EXCLUDE = {"principal_report": _REPORT, "reports": {"__all__": _REPORT}}
+
+
+class UseCase:
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(self, access_token: str, request: GetExamsRequest) -> GetExamsResponse:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        exams = self.exam_repo.get_exams_by_ids(request.ids, projection=request.fields)
+        # Projected exams only carry the requested fields, serialized like the same fields of a whole exam
+        include = {"id", *request.fields} if request.fields else None
+
+        found, missing = [], []
+        for exam_id, exam in zip(request.ids, exams):
+            if exam is None:
+                missing.append(exam_id)
+            else:
+                found.append(exam.model_dump(mode="json", include=include, exclude=EXAM_EXCLUDE))
+
+        return GetExamsResponse(exams=found, missing=missing)
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
+@error_handler
+def lambda_handler(event, context):
+    request = HTTPRequest(event)
+    access_token = request.headers.get("Authorization")
+    body = GetExamsRequest(**request.body)
+
+    use_case = get_use_case()
+    response = use_case(access_token, body)
+
+    http_response = HTTPResponse(
+        status_code=200,
+        body=response.model_dump(),
+        message="Exames encontrados com sucesso!"
+    )
+
+    return http_response.to_dict()
@@ -0,0 +1,79 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from core.infra.storage import FileStorage
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.helpers.errors import HttpException
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+# Single ranges only ("bytes=0-99", "bytes=100-", "bytes=-500"); anything else is ignored, as RFC 9110 allows
+SINGLE_RANGE = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
+
+PASSTHROUGH_HEADERS = {
+    "ContentLength": "Content-Length",
+    "ContentRange": "Content-Range",
+    "ETag": "ETag",
+    "LastModified": "Last-Modified",
+}
+
+
+class UseCase:
+    """
+    Opens the exam file for streaming through the API, for clients that cannot reach
+    object storage. Returns the status, the headers and the (unread) body; there is no
+    Lambda handler since proxy integrations cannot stream.
+    """
+
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(
+            self,
+            access_token: str,
+            exam_id: str,
+            byte_range: Optional[str] = None,
+            if_none_match: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        exam = self.exam_repo.get_exams_by_ids([exam_id], projection=["file_path"])
+        if not exam or not exam[0]:
+            raise HttpException(status_code=404, message="Exame não encontrado!")
+
+        byte_range = byte_range.strip() if byte_range and SINGLE_RANGE.match(byte_range.strip()) else None
+        try:
+            file = FileStorage.open(exam[0].file_path, byte_range, if_none_match)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("304", "NotModified"):
+                return {"status_code": 304, "headers": {"ETag": if_none_match}, "body": None}
+            if code == "InvalidRange":
+                raise HttpException(status_code=416, message="Intervalo solicitado inválido!")
+            if code in ("NoSuchKey", "404"):
+                raise HttpException(status_code=404, message="Arquivo do exame não encontrado!")
+            raise
+
+        headers = {"Accept-Ranges": "bytes", "Cache-Control": "private"}
+        for attribute, header in PASSTHROUGH_HEADERS.items():
+            if file.get(attribute) is not None:
+                value = file[attribute]
+                headers[header] = value.strftime("%a, %d %b %Y %H:%M:%S GMT") if attribute == "LastModified" else str(value)
+
+        return {
+            "status_code": 206 if file.get("ContentRange") else 200,
+            "headers": headers,
+            "content_type": file.get("ContentType") or "application/octet-stream",
+            "body": file["Body"],
+        }
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process"""
+    return UseCase()
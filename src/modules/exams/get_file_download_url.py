@@ -0,0 +1,62 @@
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional
+
+from pytz import UTC
+
+from core.infra.storage import FileStorage
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.schemas.exams import FileDownloadResponse
+from core.schemas.http import HTTPRequest, HTTPResponse
+from core.infra.cold_start import prewarm
+from core.helpers.errors import HttpException, error_handler
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+
+class UseCase:
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(self, access_token: str, exam_id: str) -> FileDownloadResponse:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        # Repeated viewer loads get the URL issued before, without reading the exam again
+        cached = FileStorage.cached_download_url(exam_id)
+        if cached:
+            url, expires_at = cached
+        else:
+            exam = self.exam_repo.get_exams_by_ids([exam_id], projection=["file_path"])
+            if not exam or not exam[0]:
+                raise HttpException(status_code=404, message="Exame não encontrado!")
+            url, expires_at = FileStorage.download_url(exam_id, exam[0].file_path)
+
+        return FileDownloadResponse(url=url, expires_at=datetime.fromtimestamp(expires_at, tz=UTC).isoformat())
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
+@error_handler
+def lambda_handler(event, context):
+    request = HTTPRequest(event)
+    access_token = request.headers.get("Authorization")
+
+    use_case = get_use_case()
+    response = use_case(access_token, request.path.get("exam_id"))
+
+    http_response = HTTPResponse(
+        status_code=200,
+        body=response.model_dump(),
+        message="URL de download gerada com sucesso!"
+    )
+
+    return http_response.to_dict()
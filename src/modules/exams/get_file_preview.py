@@ -0,0 +1,110 @@
+import logging
+import re
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional
+
+from pytz import UTC
+
+from core.infra.previews import Previews
+from core.infra.storage import FileStorage
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.helpers.previews import tile_key
+from core.schemas.http import HTTPRequest, HTTPResponse
+from core.infra.cold_start import prewarm
+from core.helpers.errors import HttpException, error_handler
+from core.schemas.exams import PreviewResponse, PreviewTiles
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+TILE = re.compile(r"^(\d+)_(\d+)$")
+
+logger = logging.getLogger(__name__)
+
+
+class UseCase:
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(
+            self,
+            access_token: str,
+            exam_id: str,
+            width: Optional[int] = None,
+            height: Optional[int] = None,
+            tile: Optional[str] = None,
+    ) -> PreviewResponse:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        exam = self.exam_repo.get_exams_by_ids([exam_id], projection=["file_path"])
+        if not exam or not exam[0]:
+            raise HttpException(status_code=404, message="Exame não encontrado!")
+        file_path = exam[0].file_path
+
+        try:
+            manifest = Previews.ensure(file_path)
+        except Exception as e:
+            logger.error(f"Error generating previews of exam {exam_id}: {e}")
+            raise HttpException(status_code=422, message="Não foi possível gerar a pré-visualização do exame!")
+
+        tiles = PreviewTiles(**manifest["tiles"]) if manifest.get("tiles") else None
+        if tile:
+            match = TILE.match(tile)
+            if not tiles or not match or int(match[1]) >= tiles.columns or int(match[2]) >= tiles.rows:
+                raise HttpException(status_code=404, message="Bloco da pré-visualização não encontrado!")
+            url, expires_at = FileStorage.presign_get(tile_key(file_path, manifest["etag"], int(match[1]), int(match[2])))
+            return PreviewResponse(
+                rendition="tile",
+                width=tiles.size,
+                height=tiles.size,
+                url=url,
+                expires_at=datetime.fromtimestamp(expires_at, tz=UTC).isoformat(),
+                tiles=tiles,
+            )
+
+        name = Previews.pick(manifest, width, height)
+        rendition = manifest["renditions"][name]
+        url, expires_at = FileStorage.presign_get(rendition["key"])
+        return PreviewResponse(
+            rendition=name,
+            width=rendition["width"],
+            height=rendition["height"],
+            url=url,
+            expires_at=datetime.fromtimestamp(expires_at, tz=UTC).isoformat(),
+            tiles=tiles,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
+@error_handler
+def lambda_handler(event, context):
+    request = HTTPRequest(event)
+    access_token = request.headers.get("Authorization")
+    params = request.parms or {}
+
+    use_case = get_use_case()
+    response = use_case(
+        access_token,
+        request.path.get("exam_id"),
+        int(params["width"]) if params.get("width") else None,
+        int(params["height"]) if params.get("height") else None,
+        params.get("tile"),
+    )
+
+    http_response = HTTPResponse(
+        status_code=200,
+        body=response.model_dump(),
+        message="Pré-visualização gerada com sucesso!"
+    )
+
+    return http_response.to_dict()
@@ -0,0 +1,67 @@
+from functools import lru_cache
+from typing import Optional
+
+from core.helpers.jwt_token import JWToken
+from core.database.database import Database
+from core.helpers.pagination import InvalidCursor
+from core.schemas.http import HTTPRequest, HTTPResponse
+from core.infra.cold_start import prewarm
+from core.helpers.errors import HttpException, error_handler
+from core.schemas.exams import ListExamSummariesRequest, ListExamSummariesResponse
+from core.database.repositories.exams.repo import ExamRepo
+from core.database.repositories.exams.repo_interface import IExamRepo
+
+
+class UseCase:
+    def __init__(self, exam_repo: Optional[IExamRepo] = None):
+        self.exam_repo = exam_repo if exam_repo else ExamRepo(Database())
+
+    def __call__(self, access_token: str, request: ListExamSummariesRequest) -> ListExamSummariesResponse:
+        if not JWToken.decode(access_token):
+            raise HttpException(status_code=401, message="Token inválido ou expirado!")
+
+        if bool(request.start_date) != bool(request.end_date):
+            raise HttpException(status_code=400, message="Informe a data inicial e a data final do período!")
+        date_range = (request.start_date, request.end_date) if request.start_date else None
+
+        try:
+            summaries, cursor = self.exam_repo.list_exam_summaries(
+                limit=request.limit,
+                cursor=request.cursor,
+                approved=request.approved,
+                order_by=request.order_by,
+                date_range=date_range,
+            )
+        except InvalidCursor:
+            raise HttpException(status_code=400, message="Cursor de paginação inválido!")
+        except ValueError:
+            raise HttpException(status_code=400, message="Período inválido, use datas no formato AAAA-MM-DD!")
+
+        return ListExamSummariesResponse(exams=summaries, cursor=cursor)
+
+
+@lru_cache(maxsize=None)
+def get_use_case() -> UseCase:
+    """Use case shared by every request of the process and every warm Lambda invocation"""
+    return UseCase()
+
+
+prewarm(__name__, get_use_case)
+
+
+@error_handler
+def lambda_handler(event, context):
+    request = HTTPRequest(event)
+    access_token = request.headers.get("Authorization")
+    body = ListExamSummariesRequest(**(request.parms or {}))
+
+    use_case = get_use_case()
+    response = use_case(access_token, body)
+
+    http_response = HTTPResponse(
+        status_code=200,
+        body=response.model_dump(mode="json"),
+        message="Exames encontrados com sucesso!"
+    )
+
+    return http_response.to_dict()
@@ -1,12 +1,12 @@
-import json
-
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi import APIRouter, Depends
 
-from modules.auth.me import lambda_handler as me_lambda_handler
-from core.helpers.transform import fastapi_request_to_lambda_event
-from modules.auth.login import lambda_handler as login_lambda_handler
+from core.infra.executor import IO_EXECUTOR
+from modules.auth.me import UseCase as MeUseCase
+from modules.auth.login import UseCase as LoginUseCase
+from modules.auth.me import get_use_case as get_me_use_case
 from core.schemas.login import LoginResponse, LoginRequest, MeResponse
+from modules.auth.login import get_use_case as get_login_use_case
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -20,30 +20,14 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
     response_model=LoginResponse
 )
 async def login(
-        request: Request,
-        form_data: OAuth2PasswordRequestForm = Depends()
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        use_case: LoginUseCase = Depends(get_login_use_case)
 ):
     """
     Login endpoint.
     """
-    body_json = json.dumps({
-        "username": form_data.username,
-        "password": form_data.password
-    })
-
-    event = await fastapi_request_to_lambda_event(request, body_override=body_json)
-    response = login_lambda_handler(event, None)
-
-    if response["statusCode"] != 200:
-        raise HTTPException(
-            status_code=response["statusCode"],
-            detail=json.loads(response["body"]).get("details", "An error occurred")
-        )
-
-    body = json.loads(response["body"])
-    login_response = LoginResponse(**body)
-
-    return login_response
+    login_request = LoginRequest(username=form_data.username, password=form_data.password)
+    return await IO_EXECUTOR.run(use_case, login_request)
 
 
 @auth_router.get(
@@ -53,22 +37,10 @@ async def login(
     response_model=MeResponse
 )
 async def get_current_user(
-        request: Request,
-        token: str = Depends(oauth2_scheme)
+        token: str = Depends(oauth2_scheme),
+        use_case: MeUseCase = Depends(get_me_use_case)
 ):
     """
     Get current user endpoint.
     """
-    event = await fastapi_request_to_lambda_event(request, token=token)
-    response = me_lambda_handler(event, None)
-
-    if response["statusCode"] != 200:
-        raise HTTPException(
-            status_code=response["statusCode"],
-            detail=json.loads(response["body"]).get("details", "An error occurred")
-        )
-
-    body = json.loads(response["body"])
-    me_response = MeResponse(**body)
-
-    return me_response
+    return await IO_EXECUTOR.run(use_case, token)
@@ -0,0 +1,190 @@
+from typing import Literal, Optional
+
+from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, Query, Response
+
+from core.config.env import ENV
+
+from core.infra.executor import IO_EXECUTOR
+from core.helpers.errors import HttpException
+from modules.routers.auth_router import oauth2_scheme
+from modules.exams.get_exams import UseCase as GetExamsUseCase
+from modules.exams.get_exams import get_use_case as get_get_exams_use_case
+from modules.exams.list_exam_summaries import UseCase as ListExamSummariesUseCase
+from modules.exams.list_exam_summaries import get_use_case as get_list_exam_summaries_use_case
+from modules.exams.get_file_content import UseCase as GetFileContentUseCase
+from modules.exams.get_file_content import get_use_case as get_file_content_use_case
+from modules.exams.get_file_preview import UseCase as GetFilePreviewUseCase
+from modules.exams.get_file_preview import get_use_case as get_file_preview_use_case
+from modules.exams.get_file_upload_url import UseCase as GetFileUploadUrlUseCase
+from modules.exams.complete_file_upload import UseCase as CompleteFileUploadUseCase
+from modules.exams.get_file_download_url import UseCase as GetFileDownloadUrlUseCase
+from modules.exams.get_file_upload_url import get_use_case as get_file_upload_url_use_case
+from modules.exams.complete_file_upload import get_use_case as get_complete_file_upload_use_case
+from modules.exams.get_file_download_url import get_use_case as get_file_download_url_use_case
+from core.schemas.exams import (
+    GetExamsRequest,
+    GetExamsResponse,
+    ListExamSummariesRequest,
+    ListExamSummariesResponse,
+    MAX_SUMMARIES_PER_PAGE,
+    FileUploadRequest,
+    FileUploadResponse,
+    FileDownloadResponse,
+    PreviewResponse,
+    CompleteFileUploadRequest,
+)
+
+exams_router = APIRouter(prefix="/exams", tags=["exams"])
+
+
+@exams_router.post(
+    "/batch",
+    summary="Get many exams",
+    description="Get many exams by ID in a single request, optionally only some of their fields",
+    response_model=GetExamsResponse
+)
+async def get_exams(
+        request: GetExamsRequest,
+        token: str = Depends(oauth2_scheme),
+        use_case: GetExamsUseCase = Depends(get_get_exams_use_case)
+):
+    """
+    Batch exams endpoint.
+    """
+    return await IO_EXECUTOR.run(use_case, token, request)
+
+
+@exams_router.get(
+    "/summaries",
+    summary="List exam summaries",
+    description="Page of exams for worklists (id, dates, gender, approval state and principal diagnosis only), "
+                "ordered by exam date",
+    response_model=ListExamSummariesResponse
+)
+async def list_exam_summaries(
+        limit: int = Query(20, ge=1, le=MAX_SUMMARIES_PER_PAGE),
+        cursor: Optional[str] = Query(None, description="`cursor` of the previous page"),
+        approved: Optional[bool] = Query(None),
+        order_by: Literal["asc", "desc"] = Query("asc"),
+        start_date: Optional[str] = Query(None, description="ISO-8601 date, together with end_date"),
+        end_date: Optional[str] = Query(None, description="ISO-8601 date, together with start_date"),
+        token: str = Depends(oauth2_scheme),
+        use_case: ListExamSummariesUseCase = Depends(get_list_exam_summaries_use_case)
+):
+    """
+    Exam summaries endpoint.
+    """
+    request = ListExamSummariesRequest(
+        limit=limit, cursor=cursor, approved=approved, order_by=order_by, start_date=start_date, end_date=end_date,
+    )
+    return await IO_EXECUTOR.run(use_case, token, request)
+
+
+@exams_router.get(
+    "/{exam_id}/file",
+    summary="Exam file download URL",
+    description="Short-lived presigned URL to download the exam file straight from object storage",
+    response_model=FileDownloadResponse
+)
+async def get_file_download_url(
+        exam_id: str,
+        token: str = Depends(oauth2_scheme),
+        use_case: GetFileDownloadUrlUseCase = Depends(get_file_download_url_use_case)
+):
+    """
+    Exam file download URL endpoint.
+    """
+    return await IO_EXECUTOR.run(use_case, token, exam_id)
+
+
+@exams_router.get(
+    "/{exam_id}/file/content",
+    summary="Exam file content",
+    description="Stream the exam file through the API (supports Range requests), for clients that cannot reach "
+                "object storage",
+    response_class=StreamingResponse
+)
+async def get_file_content(
+        exam_id: str,
+        range: Optional[str] = Header(None),
+        if_none_match: Optional[str] = Header(None),
+        token: str = Depends(oauth2_scheme),
+        use_case: GetFileContentUseCase = Depends(get_file_content_use_case)
+):
+    """
+    Exam file content endpoint.
+    """
+    file = await IO_EXECUTOR.run(use_case, token, exam_id, range, if_none_match)
+    if file["body"] is None:
+        return Response(status_code=file["status_code"], headers=file["headers"])
+
+    body = file["body"]
+    try:
+        chunks = IO_EXECUTOR.stream(body.read, ENV.FILE_STREAM_CHUNK_KB * 1024, ENV.FILE_STREAM_BUFFER_CHUNKS, body.close)
+    except HttpException:
+        body.close()  # rejected by admission control before the response started
+        raise
+    return StreamingResponse(
+        chunks,
+        status_code=file["status_code"],
+        headers=file["headers"],
+        media_type=file["content_type"],
+    )
+
+
+@exams_router.get(
+    "/{exam_id}/preview",
+    summary="Exam file preview",
+    description="Presigned URL of the smallest preview rendition covering the display size (or of one tile)",
+    response_model=PreviewResponse
+)
+async def get_file_preview(
+        exam_id: str,
+        width: Optional[int] = Query(None, gt=0),
+        height: Optional[int] = Query(None, gt=0),
+        tile: Optional[str] = Query(None, description="<column>_<row> of a tile of the full rendition"),
+        token: str = Depends(oauth2_scheme),
+        use_case: GetFilePreviewUseCase = Depends(get_file_preview_use_case)
+):
+    """
+    Exam file preview endpoint.
+    """
+    return await IO_EXECUTOR.run(use_case, token, exam_id, width, height, tile)
+
+
+@exams_router.post(
+    "/{exam_id}/file/upload",
+    summary="Exam file upload URL",
+    description="Short-lived presigned PUT URL (or one URL per part for large files) to upload the exam file",
+    response_model=FileUploadResponse
+)
+async def get_file_upload_url(
+        exam_id: str,
+        request: FileUploadRequest,
+        token: str = Depends(oauth2_scheme),
+        use_case: GetFileUploadUrlUseCase = Depends(get_file_upload_url_use_case)
+):
+    """
+    Exam file upload URL endpoint.
+    """
+    return await IO_EXECUTOR.run(use_case, token, exam_id, request)
+
+
+@exams_router.post(
+    "/{exam_id}/file/upload/complete",
+    summary="Complete exam file upload",
+    description="Assemble the parts of a multipart exam file upload",
+    status_code=204
+)
+async def complete_file_upload(
+        exam_id: str,
+        request: CompleteFileUploadRequest,
+        token: str = Depends(oauth2_scheme),
+        use_case: CompleteFileUploadUseCase = Depends(get_complete_file_upload_use_case)
+):
+    """
+    Complete exam file upload endpoint.
+    """
+    await IO_EXECUTOR.run(use_case, token, exam_id, request)
+    return Response(status_code=204)
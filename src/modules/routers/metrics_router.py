@@ -0,0 +1,35 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+
+from core.config.env import ENV
+from core.helpers.errors import HttpException
+from core.infra.metrics import METRICS
+
+metrics_router = APIRouter(tags=["system"])
+
+
+def check_scrape_token(authorization: Optional[str] = Header(None)) -> None:
+    """Let only the scraper holding METRICS_TOKEN read the metrics: they expose per-route traffic and capacity"""
+    if not ENV.METRICS_TOKEN:
+        raise HttpException(status_code=403, message="Métricas desabilitadas: METRICS_TOKEN não configurado!")
+    expected = f"Bearer {ENV.METRICS_TOKEN}"
+    if not authorization or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HttpException(status_code=401, message="Token de métricas inválido!")
+
+
+@metrics_router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Request latency, repository calls, DynamoDB consumed capacity and S3 bytes per route "
+                "(requires `Authorization: Bearer <METRICS_TOKEN>`)",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(check_scrape_token)],
+)
+async def get_metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+
+from core.infra.aws import AWS
+from core.infra.responses import JSONResponse
+from core.infra.executor import IO_EXECUTOR, PASSWORD_EXECUTOR
+from core.infra.storage import FileStorage
+from core.database.repositories.user.cached_repo import get_user_repo
+from modules.routers.metrics_router import check_scrape_token
+
+# No response models here, so the routes render their dicts with the faster JSON encoder
+system_router = APIRouter(prefix="/system", tags=["system"], default_response_class=JSONResponse)
+
+
+@system_router.get(
+    "/stats",
+    summary="Runtime stats",
+    description="I/O executor, AWS connection pool, presigned URL and user cache statistics "
+                "(requires `Authorization: Bearer <METRICS_TOKEN>`)",
+    dependencies=[Depends(check_scrape_token)],
+)
+async def get_stats():
+    """
+    Runtime stats endpoint.
+    """
+    user_repo = get_user_repo()
+    return {
+        "executor": IO_EXECUTOR.stats(),
+        "password_executor": PASSWORD_EXECUTOR.stats(),
+        "aws": AWS.stats(),
+        "presigned_urls": FileStorage.url_cache.stats(),
+        "user_cache": user_repo.stats() if hasattr(user_repo, "stats") else None,
+    }